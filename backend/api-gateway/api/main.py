@@ -1,16 +1,60 @@
-from fastapi import FastAPI
+import os
+import sys
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from internal.routers.auth_service_router import router as auth_router 
-from internal.routers.note_service_router import router as note_router
-from internal.routers.chat_service_router import router as chat_router
+from internal.routers.note_service_router import router as note_router, note_singleflight
+from internal.routers.chat_service_router import router as chat_router, chat_singleflight, chat_stream_metrics
+from internal.client.upstream_client import upstreams
+from internal.client.resilience import CircuitOpenError
+from internal.middleware.auth import gateway_auth_middleware, token_cache
+from internal.middleware.rate_limit import RateLimitMiddleware, rate_limiter
+from internal.config.config import config
+from internal.cache.response_cache import note_cache
+from internal.handlers.batch_handler import BatchRequest, BatchResponse, handle_batch
+
+# Servisler arası paylaşılan modüller (backend/shared)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from shared.compression import CompressionMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Backend servisler için paylaşılan bağlantı havuzlarını aç / kapat
+    await upstreams.start_all()
+    yield
+    await upstreams.close_all()
+
 
 app = FastAPI(
     title="Notus API Gateway",
     description="Mikroservis mimarisi için API Gateway - Sadece Yönlendirme Katmanı",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan
 )
 
-# CORS Ayarları
+# Rate limit ve /chat admission control (auth'tan sonra çalışır, user_id hazırdır)
+app.add_middleware(RateLimitMiddleware)
+
+# JWT doğrulama - token gateway'de bir kez doğrulanır
+app.middleware("http")(gateway_auth_middleware)
+
+# Sıkıştırma - upstream'den zaten sıkıştırılmış gelen cevaplar olduğu gibi geçer.
+# /notes ve /chat'e gelen sıkıştırılmış body'ler açılmadan upstream'e aktarılır
+# (upstream açar); sadece gateway'in kendi okuduğu body'ler burada açılır.
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=config.COMPRESSION_MIN_SIZE,
+    gzip_level=config.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=config.COMPRESSION_BROTLI_QUALITY,
+    zstd_level=config.COMPRESSION_ZSTD_LEVEL,
+    max_request_size=config.COMPRESSION_MAX_REQUEST_SIZE,
+    passthrough_request_paths=("/notes", "/chat")
+)
+
+# CORS Ayarları (en dışta çalışsın diye en son eklenir)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
@@ -19,6 +63,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    # Devre açıkken backend'i beklemeden hızlıca 503 dön
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"{exc.service} service unavailable"},
+        headers={"Retry-After": str(max(1, int(exc.retry_after)))}
+    )
+
 # Rotalar iş mantığı barındırmadan ilgili servislere proxy görevi görür.
 app.include_router(auth_router, prefix="/auth", tags=["Auth & User"])
 app.include_router(note_router, prefix="/notes", tags=["Notes"])
@@ -37,4 +90,29 @@ def health():
     return {
         "status": "healthy",
         "service": "api-gateway"
-    }
\ No newline at end of file
+    }
+
+@app.post("/batch", response_model=BatchResponse, tags=["Batch"])
+async def batch(batch_request: BatchRequest, request: Request):
+    """
+    Birden fazla alt isteği tek round trip'te çalıştırır
+    
+    - Token bir kez doğrulanır
+    - Alt istekler note/chat servislerine eşzamanlı gönderilir
+    - Her alt isteğin kendi status'u ve timeout'u vardır
+    """
+    return await handle_batch(batch_request, request)
+
+@app.get("/metrics")
+def metrics():
+    return {
+        "upstreams": upstreams.metrics(),
+        "jwt_cache": token_cache.metrics(),
+        "note_cache": note_cache.metrics(),
+        "rate_limit": rate_limiter.metrics(),
+        "singleflight": {
+            "note": note_singleflight.metrics(),
+            "chat": chat_singleflight.metrics()
+        },
+        "chat_stream": chat_stream_metrics()
+    }
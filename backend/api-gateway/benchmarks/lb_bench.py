@@ -0,0 +1,66 @@
+"""
+Replika sayısına göre throughput (load balancer stratejileri)
+
+    python -m benchmarks.lb_bench [--replicas 1,2,4] [--requests 2000] [--concurrency 32]
+
+Her stub replika sınırlı kapasitelidir: aynı anda --slots istek işler, her
+istek --delay saniye sürer (replika başına en fazla slots / delay istek/s).
+Aynı UpstreamClient üzerinden tüm replikalara yük verilir; throughput
+replika sayısıyla doğrusal artmalı, istekler replikalara dengeli dağılmalıdır.
+Stub'lar ve client aynı makinede çalışır; toplam replika kapasitesi makinenin
+CPU sınırının altında kalmalıdır, yoksa ölçülen şey CPU çekişmesi olur.
+"""
+import argparse
+import asyncio
+
+from benchmarks.stub_upstream import running_stubs
+from benchmarks.timing import report_load, run_load
+from internal.client.load_balancer import STRATEGIES
+from internal.client.upstream_client import UpstreamClient
+from internal.config.config import config
+
+
+async def measure(urls, strategy: str, args) -> None:
+    config.LB_STRATEGY = strategy
+    client = UpstreamClient("bench", ",".join(urls), timeout=30.0)
+    await client.start()
+
+    async def call(_):
+        response = await client.request("GET", "/notes/1")
+        response.raise_for_status()
+
+    try:
+        result = await run_load(call, args.requests, args.concurrency)
+        report_load(f"{strategy}, {len(urls)} replika", result)
+        spread = [replica.total_requests for replica in client.balancer.replicas]
+        print(f"{'':<48} replika başına istek: {spread}")
+    finally:
+        await client.close()
+
+
+async def run(args, urls) -> None:
+    config.HEALTH_CHECK_INTERVAL = 0
+    config.UPSTREAM_MAX_CONNECTIONS = max(config.UPSTREAM_MAX_CONNECTIONS, args.concurrency)
+    config.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS = config.UPSTREAM_MAX_CONNECTIONS
+    for count in args.replicas:
+        for strategy in STRATEGIES:
+            await measure(urls[:count], strategy, args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--replicas", default="1,2,4")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--delay", type=float, default=0.02)
+    parser.add_argument("--slots", type=int, default=2)
+    parser.add_argument("--base-port", type=int, default=9101)
+    args = parser.parse_args()
+    args.replicas = [int(value) for value in args.replicas.split(",")]
+    ports = [args.base_port + number for number in range(max(args.replicas))]
+    with running_stubs(ports, delay=args.delay, concurrency=args.slots) as urls:
+        asyncio.run(run(args, urls))
+
+
+if __name__ == "__main__":
+    main()
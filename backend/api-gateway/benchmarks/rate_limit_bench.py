@@ -0,0 +1,112 @@
+"""
+Rate limiter'ın kendi maliyeti (upstream yok, sadece gateway içi)
+
+    python -m benchmarks.rate_limit_bench [--ops 200000] [--keys 10000]
+
+- InMemoryBackend.consume: sıcak tek anahtar ve --keys kadar dağılmış anahtar
+  (LRU sırası güncellemesi + sınır aşımında eviction)
+- RateLimiter.check: kullanıcı + route bucket'ı (istek başına iki consume)
+- ConcurrencyLimiter acquire/release (boş kuyruk)
+- RateLimitMiddleware: boş ASGI uygulamasına göre istek başına ek süre
+Limitler benchmark sırasında hiç dolmasın diye rate/burst çok yüksek tutulur.
+"""
+import argparse
+import asyncio
+
+from internal.middleware import rate_limit
+from internal.middleware.rate_limit import (
+    ConcurrencyLimiter, InMemoryBackend, RateLimiter, RateLimitMiddleware
+)
+from benchmarks.timing import per_op_async, report
+
+UNLIMITED = (1e12, 1e12)
+
+
+async def _noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+def _scope(user_id: int, method: str, path: str) -> dict:
+    return {
+        "type": "http",
+        "method": method,
+        "path": path,
+        "client": ("127.0.0.1", 1234),
+        "state": {"user_id": user_id}
+    }
+
+
+async def run(args) -> None:
+    backend = InMemoryBackend(max_keys=args.keys)
+    report(
+        "InMemoryBackend.consume (tek anahtar)",
+        await per_op_async(lambda i: backend.consume("user:1", *UNLIMITED), args.ops)
+    )
+    report(
+        f"InMemoryBackend.consume ({args.keys} anahtar)",
+        await per_op_async(lambda i: backend.consume(f"user:{i % args.keys}", *UNLIMITED), args.ops)
+    )
+    evicting = InMemoryBackend(max_keys=args.keys // 10)
+    report(
+        f"InMemoryBackend.consume (eviction, {args.keys // 10} sınır)",
+        await per_op_async(lambda i: evicting.consume(f"user:{i % args.keys}", *UNLIMITED), args.ops)
+    )
+
+    # Modül limitleri config'ten okunur; ölçüm süresince sınırsız yapılır
+    for route in rate_limit.ROUTE_LIMITS:
+        rate_limit.ROUTE_LIMITS[route] = UNLIMITED
+    rate_limit.config.RATE_LIMIT_USER_RPS, rate_limit.config.RATE_LIMIT_USER_BURST = UNLIMITED
+    limiter = RateLimiter(InMemoryBackend(max_keys=args.keys))
+    report(
+        "RateLimiter.check (kullanıcı + route)",
+        await per_op_async(lambda i: limiter.check(str(i % args.keys), "/notes"), args.ops)
+    )
+
+    concurrency = ConcurrencyLimiter(limit=64, max_queue=64, queue_timeout=1.0)
+
+    async def acquire_release(_):
+        await concurrency.acquire()
+        concurrency.release()
+
+    report("ConcurrencyLimiter acquire + release", await per_op_async(acquire_release, args.ops))
+
+    rate_limit.rate_limiter = limiter
+    middleware = RateLimitMiddleware(_noop_app)
+    bare = await per_op_async(
+        lambda i: _noop_app(_scope(i % args.keys, "GET", "/notes/1"), _receive, _send), args.ops
+    )
+    report("boş ASGI uygulaması", bare)
+    report(
+        "RateLimitMiddleware GET /notes/1",
+        await per_op_async(
+            lambda i: middleware(_scope(i % args.keys, "GET", "/notes/1"), _receive, _send), args.ops
+        ),
+        bare
+    )
+    report(
+        "RateLimitMiddleware POST /chat (+ eşzamanlılık)",
+        await per_op_async(
+            lambda i: middleware(_scope(i % args.keys, "POST", "/chat"), _receive, _send), args.ops
+        ),
+        bare
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ops", type=int, default=200_000)
+    parser.add_argument("--keys", type=int, default=10_000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
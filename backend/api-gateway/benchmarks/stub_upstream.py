@@ -0,0 +1,106 @@
+"""
+Benchmark'lar için yerel stub upstream (ayrı süreçte çalışır)
+
+    python -m benchmarks.stub_upstream --ports 9101,9102 [--delay 0.005] [--concurrency 8]
+
+Minimal HTTP/1.1 sunucu: keep-alive destekler, her porta bir replika gibi
+davranır. /health hemen 200 döner; diğer istekler replika başına
+--concurrency kadar eşzamanlı işlenir ve her biri --delay saniye sürer
+(replikanın sınırlı kapasitesi). Cevap küçük bir JSON'dur.
+"""
+import argparse
+import asyncio
+import contextlib
+import socket
+import subprocess
+import sys
+import time
+from typing import Iterator, List
+
+BODY = b'{"ok":true}'
+
+
+def _response(status: bytes, body: bytes) -> bytes:
+    return (
+        b"HTTP/1.1 " + status + b"\r\ncontent-type: application/json\r\n"
+        b"content-length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+
+
+async def _handle(reader, writer, delay: float, slots: asyncio.Semaphore):
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            lines = head.split(b"\r\n")
+            path = lines[0].split(b" ")[1]
+            length = 0
+            for line in lines[1:]:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            if length:
+                await reader.readexactly(length)
+
+            if path != b"/health":
+                async with slots:
+                    await asyncio.sleep(delay)
+            writer.write(_response(b"200 OK", BODY))
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(ports: List[int], delay: float, concurrency: int):
+    servers = []
+    for port in ports:
+        slots = asyncio.Semaphore(concurrency)
+        servers.append(await asyncio.start_server(
+            lambda r, w, slots=slots: _handle(r, w, delay, slots), "127.0.0.1", port, backlog=1024
+        ))
+    await asyncio.gather(*(server.serve_forever() for server in servers))
+
+
+def _wait_for_port(port: int, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+@contextlib.contextmanager
+def running_stubs(ports: List[int], delay: float, concurrency: int) -> Iterator[List[str]]:
+    """Stub'ları alt süreçte başlatır, hazır olunca URL listesini verir"""
+    process = subprocess.Popen([
+        sys.executable, "-m", "benchmarks.stub_upstream",
+        "--ports", ",".join(map(str, ports)),
+        "--delay", str(delay),
+        "--concurrency", str(concurrency)
+    ])
+    try:
+        for port in ports:
+            _wait_for_port(port)
+        yield [f"http://127.0.0.1:{port}" for port in ports]
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ports", default="9101")
+    parser.add_argument("--delay", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    args = parser.parse_args()
+    ports = [int(port) for port in args.ports.split(",")]
+    asyncio.run(serve(ports, args.delay, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark yardımcıları: işlem başına süre, yüzdelikler ve eşzamanlı yük"""
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+async def per_op_async(operation: Callable[[int], Awaitable], ops: int) -> float:
+    """operation(i) ops kez sırayla await edilir; işlem başına mikrosaniye"""
+    start = time.perf_counter()
+    for number in range(ops):
+        await operation(number)
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def per_op(operation: Callable[[int], object], ops: int) -> float:
+    start = time.perf_counter()
+    for number in range(ops):
+        operation(number)
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def report(name: str, micros: float, baseline: float = None) -> None:
+    line = f"{name:<48} {micros:9.2f} us/op"
+    if baseline is not None:
+        line += f"  (+{micros - baseline:.2f} us)"
+    print(line)
+
+
+async def run_load(operation: Callable[[int], Awaitable], total: int, concurrency: int) -> Dict:
+    """
+    operation(i) toplam total kez, en fazla concurrency eşzamanlı çalıştırılır.
+    İstek/saniye ve gecikme yüzdelikleri (ms) döner.
+    """
+    latencies: List[float] = []
+    counter = iter(range(total))
+
+    async def worker():
+        for number in counter:
+            start = time.perf_counter()
+            await operation(number)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {
+        "rps": total / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000
+    }
+
+
+def report_load(name: str, result: Dict) -> None:
+    print(f"{name:<48} {result['rps']:9.0f} req/s  p50 {result['p50']:7.2f} ms  p99 {result['p99']:7.2f} ms")
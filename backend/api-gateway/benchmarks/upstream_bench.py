@@ -0,0 +1,66 @@
+"""
+Paylaşılan upstream client ile istek başına açılan httpx.AsyncClient karşılaştırması
+
+    python -m benchmarks.upstream_bench [--requests 500] [--concurrency 1,10,50] [--http2]
+
+Yerel stub upstream (ayrı süreç, gecikmesiz) üzerinden:
+- istek başına client: eski router'lardaki `async with httpx.AsyncClient()`;
+  her istek yeni TCP bağlantısı ve yeni SSL context'i kurar
+- UpstreamClient: uygulama ömrü boyunca tek client, keep-alive ile bağlantı
+  yeniden kullanımı (--http2 ile h2c çoklama; stub HTTP/1.1 konuştuğu için
+  ALPN'siz h2c anlaşması olmaz, bu durumda HTTP/1.1 ile ölçülür)
+"""
+import argparse
+import asyncio
+
+import httpx
+
+from benchmarks.stub_upstream import running_stubs
+from benchmarks.timing import report_load, run_load
+from internal.client.upstream_client import UpstreamClient
+from internal.config.config import config
+
+
+async def run(args, base_url: str) -> None:
+    config.HEALTH_CHECK_INTERVAL = 0
+    config.UPSTREAM_HTTP2 = args.http2
+    config.UPSTREAM_MAX_CONNECTIONS = max(config.UPSTREAM_MAX_CONNECTIONS, max(args.concurrency))
+    shared = UpstreamClient("bench", base_url, timeout=10.0)
+    await shared.start()
+
+    async def per_request(_):
+        async with httpx.AsyncClient(timeout=10.0) as client:
+            response = await client.get(f"{base_url}/notes/1")
+            response.raise_for_status()
+
+    async def pooled(_):
+        response = await shared.request("GET", "/notes/1")
+        response.raise_for_status()
+
+    try:
+        for concurrency in args.concurrency:
+            report_load(f"istek başına client (eşzamanlı {concurrency})",
+                        await run_load(per_request, args.requests, concurrency))
+            report_load(f"UpstreamClient (eşzamanlı {concurrency})",
+                        await run_load(pooled, args.requests, concurrency))
+        metrics = shared.metrics()
+        print(f"UpstreamClient peak_in_flight={metrics['peak_in_flight']} "
+              f"pool_timeouts={metrics['pool_timeouts']}")
+    finally:
+        await shared.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", default="1,10,50")
+    parser.add_argument("--http2", action="store_true")
+    parser.add_argument("--port", type=int, default=9101)
+    args = parser.parse_args()
+    args.concurrency = [int(value) for value in args.concurrency.split(",")]
+    with running_stubs([args.port], delay=0.0, concurrency=1000) as urls:
+        asyncio.run(run(args, urls[0]))
+
+
+if __name__ == "__main__":
+    main()
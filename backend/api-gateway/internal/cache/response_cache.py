@@ -0,0 +1,135 @@
+"""
+Kullanıcı bazlı response cache
+Note Service GET cevaplarını ETag'leri ile birlikte saklar.
+Toplam boyut byte cinsinden sınırlıdır, dolunca en eski kullanılan kayıt atılır (LRU).
+"""
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from internal.config.config import config
+
+CacheKey = Tuple[str, str, str, str]
+
+
+class CachedResponse:
+    """Cache'lenmiş tek bir upstream cevabı"""
+
+    __slots__ = ("etag", "status_code", "headers", "body", "stored_at")
+
+    def __init__(self, etag: Optional[str], status_code: int, headers: Dict[str, str], body: bytes):
+        self.etag = etag
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.stored_at = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self.body) + sum(len(k) + len(v) for k, v in self.headers.items())
+
+    def touch(self):
+        """Upstream 304 ile doğruladıktan sonra tazelik süresini yeniler"""
+        self.stored_at = time.monotonic()
+
+    def is_fresh(self, max_age: float) -> bool:
+        """max_age içinde ise upstream'e sormadan sunulabilir"""
+        return max_age > 0 and time.monotonic() - self.stored_at < max_age
+
+
+class ResponseCache:
+    """Byte bütçeli, kullanıcı bazında geçersiz kılınabilen LRU cache"""
+
+    def __init__(self, max_bytes: int, max_entry_bytes: int):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[CacheKey, CachedResponse]" = OrderedDict()
+        self._user_keys: Dict[str, Set[CacheKey]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def make_key(user_id, path: str, query: str, accept_encoding: str = "") -> CacheKey:
+        return (str(user_id), path, query, accept_encoding)
+
+    def get(self, key: CacheKey) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: CacheKey, entry: CachedResponse) -> bool:
+        """Kaydı ekler; tek başına bütçeyi aşan cevaplar cache'lenmez"""
+        if entry.size > self.max_entry_bytes or entry.size > self.max_bytes:
+            return False
+
+        self._remove(key)
+        self._entries[key] = entry
+        self._user_keys.setdefault(key[0], set()).add(key)
+        self.size_bytes += entry.size
+
+        while self.size_bytes > self.max_bytes:
+            oldest_key = next(iter(self._entries))
+            self._remove(oldest_key)
+            self.evictions += 1
+        return True
+
+    def discard(self, key: CacheKey):
+        self._remove(key)
+
+    def _remove(self, key: CacheKey):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.size_bytes -= entry.size
+        user_keys = self._user_keys.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._user_keys[key[0]]
+
+    def invalidate_user(self, user_id):
+        """Kullanıcının tüm kayıtlarını siler (yazma işlemlerinden sonra)"""
+        keys = self._user_keys.pop(str(user_id), set())
+        for key in keys:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self.size_bytes -= entry.size
+        if keys:
+            self.invalidations += 1
+
+    def metrics(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "users": len(self._user_keys),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "revalidated": self.revalidated,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match header'ı verilen ETag ile eşleşiyor mu (weak karşılaştırma)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+note_cache = ResponseCache(config.NOTE_CACHE_MAX_BYTES, config.NOTE_CACHE_MAX_ENTRY_BYTES)
@@ -0,0 +1,110 @@
+"""
+İstemci tarafı load balancing
+Bir backend servisin birden fazla replikası arasında istekleri dağıtır.
+- least_outstanding: en az açık isteği olan replika
+- p2c: rastgele iki replikadan açık isteği az olan (power of two choices)
+Sağlıksız replikalar havuzdan çıkarılır, health check geçince geri alınır.
+"""
+import random
+from typing import Dict, Iterable, List
+
+STRATEGIES = ("least_outstanding", "p2c")
+
+
+def parse_urls(value: str) -> List[str]:
+    """'http://a:8002, http://b:8002' -> ['http://a:8002', 'http://b:8002']"""
+    return [url.strip().rstrip("/") for url in value.split(",") if url.strip()]
+
+
+class Replica:
+    """Tek bir upstream replika ve anlık durumu"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0
+        self.healthy = True
+        self.consecutive_failures = 0
+        self.consecutive_successes = 0
+        self.total_requests = 0
+        self.ejections = 0
+
+    def metrics(self) -> Dict:
+        return {
+            "url": self.url,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "total_requests": self.total_requests,
+            "ejections": self.ejections
+        }
+
+
+class LoadBalancer:
+    """Replikalar arasında seçim yapar ve sağlık durumlarını takip eder"""
+
+    def __init__(
+        self,
+        name: str,
+        urls: List[str],
+        strategy: str,
+        unhealthy_threshold: int,
+        healthy_threshold: int
+    ):
+        if not urls:
+            raise ValueError(f"{name} için en az bir upstream URL gerekli")
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Bilinmeyen load balancing stratejisi: {strategy}")
+
+        self.name = name
+        self.replicas = [Replica(url) for url in urls]
+        self.strategy = strategy
+        self.unhealthy_threshold = unhealthy_threshold
+        self.healthy_threshold = healthy_threshold
+
+    def _candidates(self, exclude: Iterable[Replica]) -> List[Replica]:
+        """Sağlıklı replikalar; hiç yoksa hepsi (fail-open)"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        candidates = healthy or self.replicas
+        remaining = [replica for replica in candidates if replica not in exclude]
+        return remaining or candidates
+
+    def pick(self, exclude: Iterable[Replica] = ()) -> Replica:
+        """Strateji ile bir replika seçer; exclude'dakiler mümkünse atlanır (retry için)"""
+        candidates = self._candidates(exclude)
+        if len(candidates) == 1:
+            return candidates[0]
+
+        if self.strategy == "p2c":
+            first, second = random.sample(candidates, 2)
+            return first if first.outstanding <= second.outstanding else second
+
+        lowest = min(replica.outstanding for replica in candidates)
+        return random.choice([replica for replica in candidates if replica.outstanding == lowest])
+
+    def record_success(self, replica: Replica):
+        replica.consecutive_failures = 0
+
+    def record_failure(self, replica: Replica):
+        """Pasif sağlık takibi: ardışık bağlantı hataları replikayı çıkarır"""
+        replica.consecutive_failures += 1
+        replica.consecutive_successes = 0
+        if replica.healthy and replica.consecutive_failures >= self.unhealthy_threshold:
+            replica.healthy = False
+            replica.ejections += 1
+
+    def record_health(self, replica: Replica, ok: bool):
+        """Aktif /health kontrolünün sonucu"""
+        if not ok:
+            self.record_failure(replica)
+            return
+
+        replica.consecutive_failures = 0
+        replica.consecutive_successes += 1
+        if not replica.healthy and replica.consecutive_successes >= self.healthy_threshold:
+            replica.healthy = True
+
+    def metrics(self) -> Dict:
+        return {
+            "strategy": self.strategy,
+            "healthy": sum(1 for replica in self.replicas if replica.healthy),
+            "replicas": [replica.metrics() for replica in self.replicas]
+        }
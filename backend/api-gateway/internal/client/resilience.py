@@ -0,0 +1,136 @@
+"""
+Upstream dayanıklılık bileşenleri
+- CircuitBreaker: backend çökmüşken istekleri beklemeden reddeder, half-open ile yoklar
+- RetryBudget: tekrar denemeleri toplam trafiğin bir oranıyla sınırlar (retry fırtınasını önler)
+- LatencyTracker: hedged request gecikmesi için son gecikmelerden yüzdelik hesaplar
+"""
+import time
+from collections import deque
+from typing import Dict, Optional
+
+
+class CircuitOpenError(Exception):
+    """Devre açıkken gönderilmeye çalışılan istek"""
+
+    def __init__(self, service: str, retry_after: float):
+        self.service = service
+        self.retry_after = retry_after
+        super().__init__(f"Circuit open for {service}, retry after {retry_after:.1f}s")
+
+
+class CircuitBreaker:
+    """closed -> (ardışık hatalar) -> open -> (reset_timeout) -> half_open -> closed/open"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, reset_timeout: float, half_open_max_probes: int):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_probes = half_open_max_probes
+
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probes_in_flight = 0
+
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_request(self):
+        """İstek gönderilebilir mi? Değilse CircuitOpenError fırlatır"""
+        if self.state == self.OPEN:
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout - elapsed)
+            self.state = self.HALF_OPEN
+            self.probes_in_flight = 0
+
+        if self.state == self.HALF_OPEN:
+            if self.probes_in_flight >= self.half_open_max_probes:
+                self.rejected += 1
+                raise CircuitOpenError(self.name, self.reset_timeout)
+            self.probes_in_flight += 1
+
+    def record_success(self):
+        if self.state == self.HALF_OPEN:
+            self.state = self.CLOSED
+            self.probes_in_flight = 0
+        self.consecutive_failures = 0
+
+    def record_cancelled(self):
+        """Sonuçlanmadan iptal edilen istek half-open deneme hakkını geri verir"""
+        if self.state == self.HALF_OPEN and self.probes_in_flight > 0:
+            self.probes_in_flight -= 1
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open()
+
+    def _open(self):
+        if self.state != self.OPEN:
+            self.times_opened += 1
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.probes_in_flight = 0
+
+    def metrics(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected
+        }
+
+
+class RetryBudget:
+    """
+    Her istek `ratio` kadar jeton biriktirir, her tekrar deneme bir jeton harcar.
+    Böylece tekrar denemeler uzun vadede trafiğin en fazla `ratio` kadarı olur.
+    """
+
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+        self.exhausted = 0
+
+    def deposit(self):
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.exhausted += 1
+        return False
+
+    def metrics(self) -> Dict:
+        return {
+            "tokens": round(self.tokens, 2),
+            "ratio": self.ratio,
+            "exhausted": self.exhausted
+        }
+
+
+class LatencyTracker:
+    """Son N başarılı isteğin gecikmesinden yüzdelik hesaplar"""
+
+    def __init__(self, window: int, min_samples: int):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, quantile: float) -> Optional[float]:
+        """Yeterli örnek yoksa None"""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        return ordered[index]
@@ -0,0 +1,58 @@
+"""
+Singleflight (request coalescing)
+Aynı anahtarla eşzamanlı gelen çağrılardan sadece biri (leader) upstream'e gider,
+diğerleri leader'ın sonucunu (ya da hatasını) paylaşır.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class LeaderCancelledError(Exception):
+    """Leader sonuç üretmeden iptal edildi; bekleyenler kendi çağrılarını yapar"""
+
+
+class SingleFlight:
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is not None:
+            self.coalesced += 1
+            try:
+                # shield: bekleyenin iptali ortak sonucu iptal etmez
+                return await asyncio.shield(future)
+            except LeaderCancelledError:
+                return await fn()
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.leaders += 1
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.set_exception(LeaderCancelledError())
+            future.exception()  # bekleyen yoksa "never retrieved" uyarısını bastır
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def metrics(self) -> Dict:
+        total = self.leaders + self.coalesced
+        return {
+            "in_flight": len(self._calls),
+            "upstream_calls": self.leaders,
+            "coalesced": self.coalesced,
+            "coalescing_ratio": round(self.coalesced / total, 3) if total else 0.0
+        }
@@ -0,0 +1,397 @@
+"""
+Upstream HTTP client havuzu
+Her backend servis için uygulama ömrü boyunca yaşayan tek bir httpx.AsyncClient tutar.
+Bağlantılar keep-alive ile yeniden kullanılır, istenirse HTTP/2 ile çoklanır.
+Servisin birden fazla replikası varsa istekler load balancer ile dağıtılır.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Dict, Optional
+
+import httpx
+
+from internal.client.load_balancer import LoadBalancer, Replica, parse_urls
+from internal.client.resilience import CircuitBreaker, CircuitOpenError, LatencyTracker, RetryBudget
+from internal.config.config import config
+
+logger = logging.getLogger("api-gateway-upstream")
+
+# Proxy'de bir sonraki hop'a taşınmaması gereken header'lar (RFC 7230 6.1)
+HOP_BY_HOP_HEADERS = {
+    "connection",
+    "keep-alive",
+    "proxy-authenticate",
+    "proxy-authorization",
+    "proxy-connection",
+    "te",
+    "trailer",
+    "trailers",
+    "transfer-encoding",
+    "upgrade",
+    "host"
+}
+
+
+def strip_hop_by_hop(headers) -> Dict[str, str]:
+    """Hop-by-hop ve Connection header'ında listelenen header'ları çıkarır"""
+    connection_tokens = {
+        token.strip().lower()
+        for token in headers.get("connection", "").split(",")
+        if token.strip()
+    }
+    return {
+        key: value
+        for key, value in headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS and key.lower() not in connection_tokens
+    }
+
+
+# Tekrar denenebilir (idempotent) metodlar ve upstream durum kodları
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS"}
+RETRYABLE_STATUS_CODES = {502, 503, 504}
+
+
+def _is_replayable(content) -> bool:
+    """Body yoksa ya da bellekteyse istek tekrar gönderilebilir (stream body tek kullanımlık)"""
+    return content is None or isinstance(content, (bytes, str))
+
+
+def _http2_available() -> bool:
+    """HTTP/2 için gerekli 'h2' paketi kurulu mu?"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class UpstreamClient:
+    """Tek bir backend servis için paylaşılan, havuzlu client"""
+
+    def __init__(self, name: str, base_urls: str, timeout: float):
+        self.name = name
+        self.timeout = timeout
+        self.max_connections = config.UPSTREAM_MAX_CONNECTIONS
+        self.client: Optional[httpx.AsyncClient] = None
+        self.balancer = LoadBalancer(
+            name,
+            parse_urls(base_urls),
+            strategy=config.LB_STRATEGY,
+            unhealthy_threshold=config.HEALTH_UNHEALTHY_THRESHOLD,
+            healthy_threshold=config.HEALTH_HEALTHY_THRESHOLD
+        )
+        self._health_task: Optional[asyncio.Task] = None
+        # Açık stream'lerin hangi replikaya ait olduğu (close_stream için)
+        self._stream_replicas: Dict[int, Replica] = {}
+
+        # Havuz doluluk metrikleri
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.pool_timeouts = 0
+
+        # Dayanıklılık: replika URL'i başına circuit breaker (tek replikanın çökmesi
+        # diğerlerini kesmesin), servis başına retry bütçesi ve gecikme takibi
+        self.breakers: Dict[str, CircuitBreaker] = {
+            replica.url: CircuitBreaker(
+                name,
+                failure_threshold=config.CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=config.CIRCUIT_RESET_TIMEOUT,
+                half_open_max_probes=config.CIRCUIT_HALF_OPEN_MAX_PROBES
+            )
+            for replica in self.balancer.replicas
+        }
+        self.retry_budget = RetryBudget(config.RETRY_BUDGET_RATIO, config.RETRY_BUDGET_MAX_TOKENS)
+        self.latency = LatencyTracker(config.LATENCY_WINDOW, config.HEDGE_MIN_SAMPLES)
+        self.retries = 0
+        self.hedges_fired = 0
+        self.hedge_wins = 0
+
+    async def start(self):
+        """Client'ı oluşturur (lifespan başlangıcında çağrılır)"""
+        if self.client is not None:
+            return
+
+        http2 = config.UPSTREAM_HTTP2
+        if http2 and not _http2_available():
+            logger.warning(f"[{self.name}] HTTP/2 istendi fakat 'h2' kurulu değil, HTTP/1.1 kullanılıyor")
+            http2 = False
+
+        self.client = httpx.AsyncClient(
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=config.UPSTREAM_MAX_CONNECTIONS,
+                max_keepalive_connections=config.UPSTREAM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=config.UPSTREAM_KEEPALIVE_EXPIRY
+            ),
+            timeout=httpx.Timeout(self.timeout, pool=config.UPSTREAM_POOL_TIMEOUT)
+        )
+        urls = [replica.url for replica in self.balancer.replicas]
+        logger.info(f"[{self.name}] upstream client hazır: {urls} (http2={http2})")
+
+        if config.HEALTH_CHECK_INTERVAL > 0:
+            self._health_task = asyncio.create_task(self._health_loop())
+
+    async def close(self):
+        """Açık bağlantıları kapatır (lifespan sonunda çağrılır)"""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        if self.client is not None:
+            await self.client.aclose()
+            self.client = None
+
+    async def _health_loop(self):
+        """
+        Her replikanın /health route'unu periyodik olarak yoklar.
+        Beklenmeyen bir hata döngüyü bitirmez; loglanıp bir sonraki turda devam edilir.
+        """
+        while True:
+            await asyncio.sleep(config.HEALTH_CHECK_INTERVAL)
+            try:
+                await asyncio.gather(*(self._check_health(replica) for replica in self.balancer.replicas))
+            except Exception:
+                logger.exception(f"[{self.name}] health check turu başarısız")
+
+    async def _check_health(self, replica: Replica):
+        was_healthy = replica.healthy
+        try:
+            response = await self.client.get(
+                f"{replica.url}{config.HEALTH_CHECK_PATH}",
+                timeout=config.HEALTH_CHECK_TIMEOUT
+            )
+            ok = response.status_code == 200
+        except httpx.HTTPError:
+            ok = False
+
+        self.balancer.record_health(replica, ok)
+        if was_healthy != replica.healthy:
+            state = "geri alındı" if replica.healthy else "havuzdan çıkarıldı"
+            logger.warning(f"[{self.name}] replika {replica.url} {state}")
+
+    def _acquire(self, replica: Replica):
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        replica.outstanding += 1
+        replica.total_requests += 1
+
+    def _release(self, replica: Replica):
+        self.in_flight -= 1
+        replica.outstanding -= 1
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Havuzdaki bir bağlantı üzerinden istek atar"""
+        return await self._dispatch(method, url, kwargs, stream=False)
+
+    async def send_stream(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        İsteği stream modunda gönderir, body'yi belleğe almaz.
+        Dönen response işi bitince close_stream ile kapatılmalıdır.
+        """
+        return await self._dispatch(method, url, kwargs, stream=True)
+
+    async def _dispatch(self, method: str, url: str, kwargs: Dict, stream: bool) -> httpx.Response:
+        """Circuit breaker, retry bütçesi ve (opsiyonel) hedging ile isteği gönderir"""
+        if self.client is None:
+            await self.start()
+
+        self.retry_budget.deposit()
+
+        # Sadece body'si tekrar gönderilebilen idempotent istekler tekrar denenir
+        retryable = method.upper() in IDEMPOTENT_METHODS and _is_replayable(kwargs.get("content"))
+        attempt = 0
+        tried = set()
+        while True:
+            try:
+                if retryable and config.HEDGE_ENABLED:
+                    response = await self._hedged(method, url, kwargs, stream, tried)
+                else:
+                    response = await self._attempt(method, url, kwargs, stream, tried)
+            except httpx.TransportError:
+                if not self._can_retry(retryable, attempt):
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or not self._can_retry(retryable, attempt):
+                    return response
+                await self._discard(response, stream)
+
+            attempt += 1
+            self.retries += 1
+            await asyncio.sleep(config.UPSTREAM_RETRY_BACKOFF * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+
+    def _can_retry(self, retryable: bool, attempt: int) -> bool:
+        return retryable and attempt < config.UPSTREAM_MAX_RETRIES and self.retry_budget.try_withdraw()
+
+    def _pick(self, tried: set) -> Replica:
+        """
+        Devresi açık olmayan bir replika seçer (önceden denenenler mümkünse atlanır).
+        Seçilebilecek her replikanın devresi açıksa CircuitOpenError fırlatır.
+        """
+        rejected = set()
+        while True:
+            replica = self.balancer.pick(exclude=tried | rejected)
+            if replica in rejected:
+                replica = self.balancer.pick(exclude=rejected)
+                if replica in rejected:
+                    raise error
+            try:
+                self.breakers[replica.url].before_request()
+                return replica
+            except CircuitOpenError as e:
+                error = e
+                rejected.add(replica)
+
+    async def _attempt(self, method: str, url: str, kwargs: Dict, stream: bool, tried: set) -> httpx.Response:
+        """
+        Tek bir deneme; replikayı load balancer seçer.
+        Sonuç replikanın breaker'ına, sağlığına ve gecikme takibine işlenir.
+        """
+        replica = self._pick(tried)
+        breaker = self.breakers[replica.url]
+        tried.add(replica)
+        request = self.client.build_request(method, f"{replica.url}{url}", **kwargs)
+        self._acquire(replica)
+        started_at = time.monotonic()
+        try:
+            response = await self.client.send(request, stream=stream)
+        except httpx.PoolTimeout:
+            # Havuz gateway tarafında dolu; replikanın hatası sayılmaz
+            self.pool_timeouts += 1
+            breaker.record_cancelled()
+            self._release(replica)
+            raise
+        except httpx.TransportError:
+            breaker.record_failure()
+            self.balancer.record_failure(replica)
+            self._release(replica)
+            raise
+        except BaseException:
+            # İptal (hedge kaybeden) veya beklenmeyen hata - hata olarak sayılmaz
+            breaker.record_cancelled()
+            self._release(replica)
+            raise
+
+        if stream:
+            self._stream_replicas[id(response)] = replica
+        else:
+            self._release(replica)
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+            self.balancer.record_success(replica)
+            self.latency.record(time.monotonic() - started_at)
+        return response
+
+    async def _hedged(self, method: str, url: str, kwargs: Dict, stream: bool, tried: set) -> httpx.Response:
+        """
+        İlk deneme gözlenen p95 gecikmeyi aşarsa ikinci bir deneme başlatır,
+        önce tamamlanan kazanır, diğeri iptal edilir
+        """
+        delay = self.latency.percentile(config.HEDGE_QUANTILE)
+        if delay is None:
+            return await self._attempt(method, url, kwargs, stream, tried)
+
+        primary = asyncio.create_task(self._attempt(method, url, kwargs, stream, tried))
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done or not self.retry_budget.try_withdraw():
+            return await primary
+
+        self.hedges_fired += 1
+        hedge = asyncio.create_task(self._attempt(method, url, kwargs, stream, tried))
+        pending = {primary, hedge}
+        error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        winner = task.result()
+                        # Aynı anda biten diğer cevabı kapat
+                        for other in done - {task}:
+                            if other.exception() is None:
+                                await self._discard(other.result(), stream)
+                        return winner
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                task.add_done_callback(lambda t: self._close_late(t, stream))
+
+    def _close_late(self, task: asyncio.Task, stream: bool):
+        """İptal edilemeden tamamlanmış kaybeden denemenin stream'ini kapatır"""
+        if stream and not task.cancelled() and task.exception() is None:
+            asyncio.ensure_future(self.close_stream(task.result()))
+
+    async def _discard(self, response: httpx.Response, stream: bool):
+        """Kullanılmayacak cevabı kapatır"""
+        if stream:
+            await self.close_stream(response)
+
+    async def close_stream(self, response: httpx.Response):
+        """Stream response'u kapatıp bağlantıyı havuza geri verir"""
+        try:
+            await response.aclose()
+        finally:
+            replica = self._stream_replicas.pop(id(response), None)
+            if replica is not None:
+                self._release(replica)
+
+    def metrics(self) -> Dict:
+        """Havuz doluluk metrikleri"""
+        return {
+            "load_balancer": self.balancer.metrics(),
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "max_connections": self.max_connections,
+            "saturation": round(self.in_flight / self.max_connections, 3) if self.max_connections else 0.0,
+            "total_requests": self.total_requests,
+            "pool_timeouts": self.pool_timeouts,
+            "circuits": {url: breaker.metrics() for url, breaker in self.breakers.items()},
+            "retries": self.retries,
+            "retry_budget": self.retry_budget.metrics(),
+            "hedges_fired": self.hedges_fired,
+            "hedge_wins": self.hedge_wins,
+            "hedge_win_rate": round(self.hedge_wins / self.hedges_fired, 3) if self.hedges_fired else 0.0,
+            "p95_latency": self.latency.percentile(0.95)
+        }
+
+
+class UpstreamRegistry:
+    """Servis adı -> UpstreamClient eşlemesi"""
+
+    def __init__(self):
+        self.clients: Dict[str, UpstreamClient] = {}
+
+    def register(self, name: str, base_urls: str, timeout: float) -> UpstreamClient:
+        """base_urls virgülle ayrılmış bir ya da daha fazla replika URL'i olabilir"""
+        client = UpstreamClient(name, base_urls, timeout)
+        self.clients[name] = client
+        return client
+
+    def get(self, name: str) -> UpstreamClient:
+        return self.clients[name]
+
+    async def start_all(self):
+        for client in self.clients.values():
+            await client.start()
+
+    async def close_all(self):
+        for client in self.clients.values():
+            await client.close()
+
+    def metrics(self) -> Dict:
+        return {name: client.metrics() for name, client in self.clients.items()}
+
+
+upstreams = UpstreamRegistry()
+upstreams.register("auth", config.AUTH_SERVICE_URL, config.REQUEST_TIMEOUT)
+upstreams.register("note", config.NOTE_SERVICE_URL, config.REQUEST_TIMEOUT)
+upstreams.register("chat", config.CHAT_SERVICE_URL, config.CHAT_REQUEST_TIMEOUT)
@@ -3,6 +3,8 @@ from pydantic_settings import BaseSettings
 
 class Config(BaseSettings):
     # Service URLs -  User ve Auth servisleri birleşti
+    # Birden fazla replika için virgülle ayrılmış liste verilebilir:
+    # NOTE_SERVICE_URL=http://note-service-1:8002,http://note-service-2:8002
     AUTH_SERVICE_URL: str = os.getenv("AUTH_SERVICE_URL", "http://auth-service:8001")
     NOTE_SERVICE_URL: str = os.getenv("NOTE_SERVICE_URL", "http://note-service:8002")
     CHAT_SERVICE_URL: str = os.getenv("CHAT_SERVICE_URL", "http://chat-service:8003")
@@ -11,8 +13,86 @@ class Config(BaseSettings):
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-secure-secret-key")
     ALGORITHM: str = os.getenv("ALGORITHM", "HS256")
     
+    # Doğrulanmış token cache'i (token hash -> claims, exp'e kadar geçerli)
+    JWT_CACHE_SIZE: int = int(os.getenv("JWT_CACHE_SIZE", "10000"))
+    JWT_CACHE_TTL: float = float(os.getenv("JWT_CACHE_TTL", "300"))
+    
+    # Backend servislerin gateway'den gelen kimlik header'larına güvenmesi için ortak anahtar
+    INTERNAL_TOKEN: str = os.getenv("INTERNAL_TOKEN", "")
+    
     # Timeouts - Yönlendirme (Proxy) sırasında kullanılacak zaman aşımı
     REQUEST_TIMEOUT: float = 10.0
+    CHAT_REQUEST_TIMEOUT: float = 30.0
+    
+    # Upstream bağlantı havuzu - her backend servis için tek, paylaşılan client
+    UPSTREAM_MAX_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "100"))
+    UPSTREAM_MAX_KEEPALIVE_CONNECTIONS: int = int(os.getenv("UPSTREAM_MAX_KEEPALIVE_CONNECTIONS", "20"))
+    UPSTREAM_KEEPALIVE_EXPIRY: float = float(os.getenv("UPSTREAM_KEEPALIVE_EXPIRY", "30.0"))
+    UPSTREAM_POOL_TIMEOUT: float = float(os.getenv("UPSTREAM_POOL_TIMEOUT", "5.0"))
+    UPSTREAM_HTTP2: bool = os.getenv("UPSTREAM_HTTP2", "false").lower() == "true"
+    
+    # Circuit breaker (replika başına) - ardışık hatalardan sonra replika bir süre hızlıca reddedilir
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT: float = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "10.0"))
+    CIRCUIT_HALF_OPEN_MAX_PROBES: int = int(os.getenv("CIRCUIT_HALF_OPEN_MAX_PROBES", "1"))
+    
+    # Idempotent (GET) istekler için tekrar deneme ve bütçe
+    UPSTREAM_MAX_RETRIES: int = int(os.getenv("UPSTREAM_MAX_RETRIES", "2"))
+    UPSTREAM_RETRY_BACKOFF: float = float(os.getenv("UPSTREAM_RETRY_BACKOFF", "0.05"))
+    RETRY_BUDGET_RATIO: float = float(os.getenv("RETRY_BUDGET_RATIO", "0.2"))
+    RETRY_BUDGET_MAX_TOKENS: float = float(os.getenv("RETRY_BUDGET_MAX_TOKENS", "10"))
+    
+    # Hedged request - p95 gecikme aşılırsa ikinci deneme gönderilir
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_QUANTILE: float = float(os.getenv("HEDGE_QUANTILE", "0.95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    LATENCY_WINDOW: int = int(os.getenv("LATENCY_WINDOW", "500"))
+    
+    # Replikalar arası load balancing ve health check
+    LB_STRATEGY: str = os.getenv("LB_STRATEGY", "least_outstanding")  # least_outstanding | p2c
+    HEALTH_CHECK_PATH: str = os.getenv("HEALTH_CHECK_PATH", "/health")
+    HEALTH_CHECK_INTERVAL: float = float(os.getenv("HEALTH_CHECK_INTERVAL", "5.0"))  # 0 ise kapalı
+    HEALTH_CHECK_TIMEOUT: float = float(os.getenv("HEALTH_CHECK_TIMEOUT", "1.0"))
+    HEALTH_UNHEALTHY_THRESHOLD: int = int(os.getenv("HEALTH_UNHEALTHY_THRESHOLD", "2"))
+    HEALTH_HEALTHY_THRESHOLD: int = int(os.getenv("HEALTH_HEALTHY_THRESHOLD", "2"))
+    
+    # POST /batch - tek round trip'te birden fazla alt istek
+    BATCH_MAX_REQUESTS: int = int(os.getenv("BATCH_MAX_REQUESTS", "20"))
+    BATCH_DEFAULT_TIMEOUT: float = float(os.getenv("BATCH_DEFAULT_TIMEOUT", "10.0"))
+    BATCH_MAX_TIMEOUT: float = float(os.getenv("BATCH_MAX_TIMEOUT", "30.0"))
+    
+    # Rate limiting - token bucket (saniyedeki istek, burst)
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+    RATE_LIMIT_USER_RPS: float = float(os.getenv("RATE_LIMIT_USER_RPS", "20"))
+    RATE_LIMIT_USER_BURST: float = float(os.getenv("RATE_LIMIT_USER_BURST", "40"))
+    RATE_LIMIT_NOTES_RPS: float = float(os.getenv("RATE_LIMIT_NOTES_RPS", "20"))
+    RATE_LIMIT_NOTES_BURST: float = float(os.getenv("RATE_LIMIT_NOTES_BURST", "40"))
+    RATE_LIMIT_CHAT_RPS: float = float(os.getenv("RATE_LIMIT_CHAT_RPS", "0.5"))
+    RATE_LIMIT_CHAT_BURST: float = float(os.getenv("RATE_LIMIT_CHAT_BURST", "5"))
+    RATE_LIMIT_BATCH_RPS: float = float(os.getenv("RATE_LIMIT_BATCH_RPS", "5"))
+    RATE_LIMIT_BATCH_BURST: float = float(os.getenv("RATE_LIMIT_BATCH_BURST", "10"))
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    # Boş değilse bucket state'i replikalar arası Redis'te paylaşılır
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "")
+    
+    # /chat eşzamanlılık sınırı (LLM çağrıları pahalı)
+    CHAT_MAX_CONCURRENCY: int = int(os.getenv("CHAT_MAX_CONCURRENCY", "20"))
+    CHAT_MAX_QUEUE: int = int(os.getenv("CHAT_MAX_QUEUE", "100"))
+    CHAT_QUEUE_TIMEOUT: float = float(os.getenv("CHAT_QUEUE_TIMEOUT", "5.0"))
+    
+    # Response sıkıştırma (gzip / br / zstd)
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+    COMPRESSION_ZSTD_LEVEL: int = int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3"))
+    # Gateway'in kendi okuduğu (/batch, /auth) sıkıştırılmış body'lerin açılmış boyut sınırı
+    COMPRESSION_MAX_REQUEST_SIZE: int = int(os.getenv("COMPRESSION_MAX_REQUEST_SIZE", str(32 * 1024 * 1024)))
+    
+    # Note GET response cache (kullanıcı bazlı, ETag ile doğrulanır)
+    NOTE_CACHE_MAX_BYTES: int = int(os.getenv("NOTE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    NOTE_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("NOTE_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+    # 0 ise her istekte If-None-Match ile upstream'e doğrulatılır
+    NOTE_CACHE_MAX_AGE: float = float(os.getenv("NOTE_CACHE_MAX_AGE", "0"))
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,157 @@
+"""
+Batch handler
+Tek bir round trip içinde birden fazla alt isteği note-service ve chat-service'e
+eşzamanlı olarak gönderir. Token gateway middleware'inde bir kez doğrulanır,
+her alt isteğin kendi status'u ve zaman aşımı vardır.
+Alt istekler tek tek kendi route'larının rate limit bucket'ından (ve LLM
+endpoint'leri /chat eşzamanlılık sınırından) düşülür; sınırı aşan alt istek
+429 ve retry_after (üst seviye 429'daki Retry-After ile aynı saniye) döner,
+diğerleri çalışır.
+"""
+import asyncio
+import logging
+from typing import Any, Dict, List, Literal, Optional
+
+import httpx
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, Field
+
+from internal.cache.response_cache import note_cache
+from internal.client.resilience import CircuitOpenError
+from internal.client.upstream_client import upstreams
+from internal.config.config import config
+from internal.middleware.auth import identity_headers
+from internal.middleware.rate_limit import CHAT_ROUTE, rate_limiter, retry_after_seconds, route_of
+from internal.routers.note_service_router import WRITE_METHODS
+
+logger = logging.getLogger("api-gateway-batch")
+
+
+class SubRequest(BaseModel):
+    id: str
+    service: Literal["note", "chat"]
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., pattern=r"^/")
+    query: Optional[Dict[str, Any]] = None
+    body: Optional[Any] = None
+    timeout: Optional[float] = Field(None, gt=0)
+
+
+class BatchRequest(BaseModel):
+    requests: List[SubRequest]
+
+
+class SubResponse(BaseModel):
+    id: str
+    status: int
+    body: Optional[Any] = None
+    error: Optional[str] = None
+    # 429'da tekrar denemeden önce beklenecek saniye (Retry-After)
+    retry_after: Optional[int] = None
+
+
+class BatchResponse(BaseModel):
+    responses: List[SubResponse]
+
+
+def _decode_body(response: httpx.Response) -> Any:
+    if not response.content:
+        return None
+    try:
+        return response.json()
+    except ValueError:
+        return response.text
+
+
+def _route_of(sub: SubRequest) -> str:
+    """Alt isteğin rate limit route'u (note path'leri note-service'e göredir)"""
+    return route_of(sub.method, sub.path) if sub.service == "chat" else "/notes"
+
+
+def _too_many_requests(sub: SubRequest, retry_after: float) -> SubResponse:
+    return SubResponse(
+        id=sub.id,
+        status=429,
+        error="Too many requests",
+        retry_after=retry_after_seconds(retry_after)
+    )
+
+
+async def _execute_limited(sub: SubRequest, headers: Dict[str, str], user_id: int) -> SubResponse:
+    """Alt isteği gateway'e ayrı gelmiş gibi route bucket'ı ve /chat eşzamanlılık sınırından geçirir"""
+    if not config.RATE_LIMIT_ENABLED:
+        return await _execute(sub, headers, user_id)
+
+    route = _route_of(sub)
+    allowed, retry_after = await rate_limiter.check_route(str(user_id), route)
+    if not allowed:
+        return _too_many_requests(sub, retry_after)
+    if route != CHAT_ROUTE:
+        return await _execute(sub, headers, user_id)
+
+    limiter = rate_limiter.chat_concurrency
+    if not await limiter.acquire():
+        return _too_many_requests(sub, limiter.queue_timeout)
+    try:
+        return await _execute(sub, headers, user_id)
+    finally:
+        limiter.release()
+
+
+async def _execute(sub: SubRequest, headers: Dict[str, str], user_id: int) -> SubResponse:
+    """
+    Tek bir alt isteği kendi zaman aşımı ile çalıştırır, hataları status'a çevirir.
+    Note yazmaları biter bitmez (zaman aşımında da, yazma upstream'de uygulanmış
+    olabilir) kullanıcının note cache'i geçersiz kılınır; batch'teki diğer alt
+    istekler beklenmez.
+    """
+    is_note_write = sub.service == "note" and sub.method in WRITE_METHODS
+    timeout = min(sub.timeout or config.BATCH_DEFAULT_TIMEOUT, config.BATCH_MAX_TIMEOUT)
+    try:
+        response = await asyncio.wait_for(
+            upstreams.get(sub.service).request(
+                sub.method,
+                sub.path,
+                params=sub.query,
+                json=sub.body,
+                headers=headers
+            ),
+            timeout=timeout
+        )
+        return SubResponse(id=sub.id, status=response.status_code, body=_decode_body(response))
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        return SubResponse(id=sub.id, status=504, error=f"{sub.service} service timeout")
+    except (CircuitOpenError, httpx.ConnectError):
+        return SubResponse(id=sub.id, status=503, error=f"{sub.service} service unavailable")
+    except Exception as e:
+        logger.error(f"Batch sub-request error ({sub.id}): {str(e)}")
+        return SubResponse(id=sub.id, status=500, error="Internal gateway error")
+    finally:
+        if is_note_write:
+            note_cache.invalidate_user(user_id)
+
+
+async def handle_batch(batch: BatchRequest, request: Request) -> BatchResponse:
+    """Alt istekleri paylaşılan bağlantı havuzları üzerinden eşzamanlı gönderir"""
+    user_id = getattr(request.state, "user_id", None)
+    if not user_id:
+        raise HTTPException(status_code=401, detail="User not authenticated")
+
+    if len(batch.requests) > config.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"En fazla {config.BATCH_MAX_REQUESTS} alt istek gönderilebilir"
+        )
+
+    ids = [sub.id for sub in batch.requests]
+    if len(ids) != len(set(ids)):
+        raise HTTPException(status_code=400, detail="Alt istek id'leri benzersiz olmalı")
+
+    headers = identity_headers(request)
+    if authorization := request.headers.get("Authorization"):
+        headers["Authorization"] = authorization
+
+    responses = await asyncio.gather(
+        *(_execute_limited(sub, headers, user_id) for sub in batch.requests)
+    )
+    return BatchResponse(responses=list(responses))
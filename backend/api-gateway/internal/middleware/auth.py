@@ -0,0 +1,167 @@
+"""
+Gateway kimlik doğrulama middleware'i
+JWT token'ı gateway'de bir kez doğrular ve doğrulanmış kimliği
+X-User-ID / X-Username / X-Email header'ları ile backend servislere taşır.
+Doğrulanmış token'lar hash'leri ile sınırlı bir LRU cache'te tutulur.
+"""
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import jwt
+from fastapi import Request
+from fastapi.responses import JSONResponse
+
+from internal.config.config import config
+
+logger = logging.getLogger("api-gateway-auth")
+
+# Token gerektirmeyen path'ler
+PUBLIC_PATHS = {"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+PUBLIC_PREFIXES = ("/auth/",)
+
+# Gateway'in backend'lere eklediği kimlik header'ları.
+# İstemciden gelen kopyaları her zaman silinir, sahtelenemez.
+IDENTITY_HEADERS = {"x-user-id", "x-username", "x-email", "x-internal-token"}
+
+
+class TokenCache:
+    """Doğrulanmış JWT claim'leri için exp'e saygılı, sınırlı LRU cache"""
+
+    def __init__(self, max_entries: int, default_ttl: float):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[Dict, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return claims
+
+    def put(self, token: str, claims: Dict):
+        now = time.time()
+        expires_at = now + self.default_ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        if expires_at <= now:
+            return
+
+        key = self._key(token)
+        self._entries[key] = (claims, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def metrics(self) -> Dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
+
+
+token_cache = TokenCache(config.JWT_CACHE_SIZE, config.JWT_CACHE_TTL)
+
+
+def verify_token(token: str) -> Dict:
+    """Token'ı doğrular; cache'te geçerli kaydı varsa HMAC/JSON işlemini atlar"""
+    claims = token_cache.get(token)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, config.SECRET_KEY, algorithms=[config.ALGORITHM])
+    token_cache.put(token, claims)
+    return claims
+
+
+def identity_headers(request: Request) -> Dict[str, str]:
+    """Backend servislere gönderilecek güvenilir kimlik header'ları"""
+    headers = {}
+    user_id = getattr(request.state, "user_id", None)
+    if user_id is None:
+        return headers
+
+    headers["X-User-ID"] = str(user_id)
+    if getattr(request.state, "username", None):
+        headers["X-Username"] = request.state.username
+    if getattr(request.state, "email", None):
+        headers["X-Email"] = request.state.email
+    if config.INTERNAL_TOKEN:
+        headers["X-Internal-Token"] = config.INTERNAL_TOKEN
+    return headers
+
+
+def strip_identity_headers(headers: Dict[str, str]) -> Dict[str, str]:
+    """İstemciden gelen kimlik header'larını temizler"""
+    return {key: value for key, value in headers.items() if key.lower() not in IDENTITY_HEADERS}
+
+
+async def gateway_auth_middleware(request: Request, call_next):
+    """
+    Authorization header'ındaki Bearer token'ı doğrular ve
+    user_id / username / email bilgisini request.state'e kaydeder
+    """
+    path = request.url.path
+    if path in PUBLIC_PATHS or path.startswith(PUBLIC_PREFIXES):
+        return await call_next(request)
+
+    authorization = request.headers.get("Authorization")
+    if not authorization or not authorization.lower().startswith("bearer "):
+        # Token yoksa route kendi 401'ini döner
+        return await call_next(request)
+
+    token = authorization[7:].strip()
+    try:
+        claims = verify_token(token)
+    except jwt.ExpiredSignatureError:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Token has expired. Please login again."},
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    except jwt.InvalidTokenError:
+        logger.warning(f"Invalid token on {path}")
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Invalid token. Please login again."},
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    user_id = claims.get("user_id")
+    if user_id is None:
+        return JSONResponse(
+            status_code=401,
+            content={"detail": "Invalid token payload. User ID not found."},
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+
+    request.state.user_id = user_id
+    if username := claims.get("username") or claims.get("sub"):
+        request.state.username = username
+    if email := claims.get("email"):
+        request.state.email = email
+
+    return await call_next(request)
@@ -0,0 +1,296 @@
+"""
+Rate limiting ve concurrency admission control
+- Kullanıcı başına ve kullanıcı+route başına token bucket (burst ayarlanabilir)
+- LLM çağıran endpoint'ler (POST /chat, POST /chat/stream) için global eşzamanlılık
+  sınırı: fazla istekler deadline'a kadar kuyrukta bekler, sonra 429 + Retry-After
+  ile reddedilir. Geçmiş okuma / silme bu sınırlara girmez.
+- POST /batch alt istekleri de kendi route'larının bucket'ından ve /chat
+  eşzamanlılık sınırından düşülür (batch limitleri aşmanın yolu olmasın)
+Bucket state'i varsayılan olarak bellekte tutulur; RATE_LIMIT_REDIS_URL verilirse
+replikalar arası paylaşılan Redis backend'i kullanılır.
+"""
+import abc
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from fastapi.responses import JSONResponse
+
+from internal.config.config import config
+
+logger = logging.getLogger("api-gateway-rate-limit")
+
+# Route başına limitler: route -> (saniyedeki istek, burst)
+ROUTE_LIMITS: Dict[str, Tuple[float, float]] = {
+    "/chat": (config.RATE_LIMIT_CHAT_RPS, config.RATE_LIMIT_CHAT_BURST),
+    "/notes": (config.RATE_LIMIT_NOTES_RPS, config.RATE_LIMIT_NOTES_BURST),
+    "/batch": (config.RATE_LIMIT_BATCH_RPS, config.RATE_LIMIT_BATCH_BURST)
+}
+
+# LLM çağıran endpoint'ler: /chat bucket'ı ve eşzamanlılık sınırı sadece bunlara uygulanır
+CHAT_ROUTE = "/chat"
+CHAT_LLM_ENDPOINTS = {("POST", "/chat"), ("POST", "/chat/stream")}
+
+EXEMPT_PATHS = {"/", "/health", "/metrics", "/docs", "/redoc", "/openapi.json"}
+
+
+class RateLimitBackend(abc.ABC):
+    """Token bucket state'i için backend arayüzü"""
+
+    @abc.abstractmethod
+    async def consume(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        """(izin verildi mi, kaç saniye sonra tekrar denenebilir)"""
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Tek gateway süreci için bellekte, sınırlı sayıda anahtar tutan backend"""
+
+    def __init__(self, max_keys: int):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    async def consume(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated_at) * rate)
+
+        allowed = tokens >= cost
+        retry_after = 0.0
+        if allowed:
+            tokens -= cost
+        else:
+            retry_after = (cost - tokens) / rate
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return allowed, retry_after
+
+
+# Token bucket'ı Redis'te atomik olarak günceller
+_REDIS_TOKEN_BUCKET = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local cost = tonumber(ARGV[4])
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+local retry_after = 0
+if tokens >= cost then
+    tokens = tokens - cost
+    allowed = 1
+else
+    retry_after = (cost - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return {allowed, tostring(retry_after)}
+"""
+
+
+class RedisBackend(RateLimitBackend):
+    """Birden fazla gateway replikası için paylaşılan backend (opsiyonel 'redis' paketi)"""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis_asyncio
+
+        self.redis = redis_asyncio.from_url(url)
+        self._script = self.redis.register_script(_REDIS_TOKEN_BUCKET)
+
+    async def consume(self, key: str, rate: float, burst: float, cost: float = 1.0) -> Tuple[bool, float]:
+        allowed, retry_after = await self._script(
+            keys=[f"ratelimit:{key}"],
+            args=[rate, burst, time.time(), cost]
+        )
+        return bool(int(allowed)), float(retry_after)
+
+
+def create_backend() -> RateLimitBackend:
+    if config.RATE_LIMIT_REDIS_URL:
+        try:
+            return RedisBackend(config.RATE_LIMIT_REDIS_URL)
+        except ImportError:
+            logger.warning("RATE_LIMIT_REDIS_URL verildi fakat 'redis' kurulu değil, bellek içi backend kullanılıyor")
+    return InMemoryBackend(config.RATE_LIMIT_MAX_KEYS)
+
+
+class ConcurrencyLimiter:
+    """
+    Aynı anda en fazla `limit` istek çalışır; fazlası en fazla `queue_timeout`
+    saniye kuyrukta bekler. Kuyruk doluysa ya da süre dolarsa istek reddedilir.
+    """
+
+    def __init__(self, limit: int, max_queue: int, queue_timeout: float):
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(limit)
+        self.active = 0
+        self.queued = 0
+        self.admitted = 0
+        self.shed = 0
+
+    async def acquire(self) -> bool:
+        if not self._semaphore.locked():
+            # Boş slot varken wait_for'un task maliyeti ödenmez
+            await self._semaphore.acquire()
+        elif not await self._wait():
+            return False
+
+        self.active += 1
+        self.admitted += 1
+        return True
+
+    async def _wait(self) -> bool:
+        if self.queued >= self.max_queue:
+            self.shed += 1
+            return False
+
+        self.queued += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.shed += 1
+            return False
+        finally:
+            self.queued -= 1
+        return True
+
+    def release(self):
+        self.active -= 1
+        self._semaphore.release()
+
+    def metrics(self) -> Dict:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "shed": self.shed
+        }
+
+
+class RateLimiter:
+    """Token bucket kontrolleri ve LLM endpoint'leri için eşzamanlılık sınırı"""
+
+    def __init__(self, backend: RateLimitBackend):
+        self.backend = backend
+        self.chat_concurrency = ConcurrencyLimiter(
+            config.CHAT_MAX_CONCURRENCY,
+            config.CHAT_MAX_QUEUE,
+            config.CHAT_QUEUE_TIMEOUT
+        )
+        self.allowed = 0
+        self.limited = 0
+
+    async def check(self, client_key: str, route: str) -> Tuple[bool, float]:
+        """Önce kullanıcı geneli, sonra route bucket'ı kontrol edilir"""
+        allowed, retry_after = await self.backend.consume(
+            f"user:{client_key}",
+            config.RATE_LIMIT_USER_RPS,
+            config.RATE_LIMIT_USER_BURST
+        )
+        if allowed:
+            return await self.check_route(client_key, route)
+
+        self.limited += 1
+        return allowed, retry_after
+
+    async def check_route(self, client_key: str, route: str) -> Tuple[bool, float]:
+        """
+        Sadece route bucket'ı. Batch alt istekleri bunu kullanır: kullanıcı
+        bucket'ı /batch isteğinin kendisinde bir kez harcanmıştır.
+        """
+        allowed, retry_after = True, 0.0
+        if route in ROUTE_LIMITS:
+            rate, burst = ROUTE_LIMITS[route]
+            allowed, retry_after = await self.backend.consume(f"route:{client_key}:{route}", rate, burst)
+
+        if allowed:
+            self.allowed += 1
+        else:
+            self.limited += 1
+        return allowed, retry_after
+
+    def metrics(self) -> Dict:
+        return {
+            "allowed": self.allowed,
+            "limited": self.limited,
+            "chat_concurrency": self.chat_concurrency.metrics()
+        }
+
+
+rate_limiter = RateLimiter(create_backend())
+
+
+def retry_after_seconds(retry_after: float) -> int:
+    """Retry-After değeri: tam saniye, en az 1"""
+    return max(1, math.ceil(retry_after))
+
+
+def _too_many_requests(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Too many requests"},
+        headers={"Retry-After": str(retry_after_seconds(retry_after))}
+    )
+
+
+def route_of(method: str, path: str) -> str:
+    """
+    Limit route'u: 'POST /chat/stream' -> '/chat', '/notes/5' -> '/notes'.
+    LLM çağırmayan chat endpoint'leri (geçmiş okuma / silme) '/chat/history'
+    olur; ROUTE_LIMITS'te olmadığı için sadece kullanıcı bucket'ından düşer.
+    """
+    path = "/" + path.strip("/")
+    if (method, path) in CHAT_LLM_ENDPOINTS:
+        return CHAT_ROUTE
+    route = "/" + path.strip("/").split("/", 1)[0]
+    return "/chat/history" if route == CHAT_ROUTE else route
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware - auth middleware'inin içinde çalışır (request.state.user_id hazırdır).
+    LLM endpoint'lerinin eşzamanlılık slotu response body'si tamamen gönderilene
+    kadar tutulur.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not config.RATE_LIMIT_ENABLED or scope["path"] in EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        state = scope.get("state", {})
+        user_id = state.get("user_id")
+        client = scope.get("client")
+        client_key = str(user_id) if user_id is not None else f"ip:{client[0] if client else 'unknown'}"
+        route = route_of(scope["method"], scope["path"])
+
+        allowed, retry_after = await rate_limiter.check(client_key, route)
+        if not allowed:
+            await _too_many_requests(retry_after)(scope, receive, send)
+            return
+
+        if route != CHAT_ROUTE:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = rate_limiter.chat_concurrency
+        if not await limiter.acquire():
+            await _too_many_requests(limiter.queue_timeout)(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            limiter.release()
@@ -1,11 +1,27 @@
-from fastapi import APIRouter, Request, Header
+from fastapi import APIRouter, Request, Header, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
-from typing import Optional, List
+from typing import AsyncIterator, Callable, Dict, Optional, List
 import httpx
+import logging
+import time
+from internal.client.resilience import LatencyTracker
+from internal.client.singleflight import SingleFlight
+from internal.client.upstream_client import upstreams, strip_hop_by_hop
 from internal.config.config import config
+from internal.middleware.auth import identity_headers
+
+logger = logging.getLogger("api-gateway-chat-router")
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
+# Aynı kullanıcının eşzamanlı aynı geçmiş istekleri tek upstream çağrısını paylaşır
+chat_singleflight = SingleFlight("chat")
+
+# /chat/stream: istekten upstream'in ilk body byte'ına (ilk token event'i) kadar geçen süre
+chat_stream_ttft = LatencyTracker(config.LATENCY_WINDOW, 1)
+
 class ChatRequest(BaseModel):
     message: str
     room_id: str = "default"
@@ -17,9 +33,81 @@ class ChatResponse(BaseModel):
     room_id: str
     response: str
 
-@router.post("", response_model=ChatResponse)
+# Body gateway'de parse edilmez; şema sadece dokümantasyon için
+CHAT_REQUEST_BODY = {
+    "requestBody": {
+        "required": True,
+        "content": {"application/json": {"schema": ChatRequest.model_json_schema()}}
+    }
+}
+
+def _upstream_headers(raw_request: Request, authorization: str) -> Dict[str, str]:
+    """
+    Body olduğu gibi aktarılır (sıkıştırılmışsa açılmadan, JSON yeniden encode
+    edilmeden); chat-service açar ve doğrular. Cevap da istemcinin kabul ettiği
+    codec ile upstream'de sıkıştırılıp ham byte olarak döner.
+    """
+    headers = {"Authorization": authorization, **identity_headers(raw_request)}
+    for name in ("content-type", "content-encoding"):
+        if name in raw_request.headers:
+            headers[name] = raw_request.headers[name]
+    headers["accept-encoding"] = raw_request.headers.get("accept-encoding", "identity")
+    return headers
+
+async def _send(chat_client, path: str, raw_request: Request, authorization: str) -> httpx.Response:
+    """
+    İsteği stream modunda gönderir; ulaşılamayan / zaman aşımına uğrayan
+    chat-service 503 / 504 olur (açık devre main.py'deki handler'da 503).
+    """
+    try:
+        return await chat_client.send_stream(
+            "POST",
+            path,
+            content=await raw_request.body(),
+            headers=_upstream_headers(raw_request, authorization)
+        )
+    except httpx.ConnectError:
+        logger.error(f"Chat service unreachable: {path}")
+        raise HTTPException(status_code=503, detail="Chat service unavailable")
+    except httpx.TimeoutException:
+        logger.error(f"Chat service timeout: {path}")
+        raise HTTPException(status_code=504, detail="Chat service timeout")
+
+async def _relay(
+    chat_client,
+    proxy_response: httpx.Response,
+    on_chunk: Optional[Callable[[], None]] = None
+) -> AsyncIterator[bytes]:
+    """
+    Upstream byte'larını aktarır. Body ortasında kopan / zaman aşımına uğrayan
+    upstream'de status çoktan gönderilmiştir: hata yükseltilir (istemci bağlantısı
+    kesilir, eksik body tamam gibi görünmez), stream burada kapatılır
+    (hata yükselince StreamingResponse'un background task'ı çalışmaz).
+    """
+    try:
+        async for chunk in proxy_response.aiter_raw():
+            if on_chunk is not None:
+                on_chunk()
+            yield chunk
+    except httpx.TransportError as e:
+        logger.error(f"Chat service stream interrupted: {e!r}")
+        raise
+    finally:
+        await chat_client.close_stream(proxy_response)
+
+def _raw_response(chat_client, proxy_response, on_chunk=None) -> StreamingResponse:
+    """Upstream cevabının ham (decode edilmemiş) byte'ları, Content-Encoding korunur"""
+    return StreamingResponse(
+        _relay(chat_client, proxy_response, on_chunk),
+        status_code=proxy_response.status_code,
+        headers=strip_hop_by_hop(proxy_response.headers),
+        # İstemci body bitmeden koparsa generator kapanır; close_stream tekrar çağrılması zararsız
+        background=BackgroundTask(chat_client.close_stream, proxy_response)
+    )
+
+@router.post("", response_model=ChatResponse, openapi_extra=CHAT_REQUEST_BODY)
 async def chat(
-    request: ChatRequest,
+    raw_request: Request,
     authorization: str = Header(...)
 ):
     """
@@ -28,39 +116,77 @@ async def chat(
     - Hafızalı konuşma (user_id + room_id)
     - RAG desteği
     """
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        response = await client.post(
-            f"{config.CHAT_SERVICE_URL}/chat",
-            json=request.dict(),
-            headers={"Authorization": authorization}
-        )
-        response.raise_for_status()
-        return response.json()
+    chat_client = upstreams.get("chat")
+    proxy_response = await _send(chat_client, "/chat", raw_request, authorization)
+    return _raw_response(chat_client, proxy_response)
+
+@router.post("/stream", openapi_extra=CHAT_REQUEST_BODY)
+async def chat_stream(
+    raw_request: Request,
+    authorization: str = Header(...)
+):
+    """
+    Chat cevabını token token Server-Sent Events olarak aktarır
+    
+    - Upstream byte'ları geldikçe, buffer'lanmadan istemciye iletilir
+    - Timeout toplam süre değil, iki parça arasındaki bekleme için geçerlidir
+    """
+    started_at = time.monotonic()
+    chat_client = upstreams.get("chat")
+    proxy_response = await _send(chat_client, "/chat/stream", raw_request, authorization)
+    
+    if proxy_response.status_code != 200:
+        return _raw_response(chat_client, proxy_response)
+    
+    first_chunk = True
+    
+    def record_ttft():
+        nonlocal first_chunk
+        if first_chunk:
+            chat_stream_ttft.record(time.monotonic() - started_at)
+            first_chunk = False
+    
+    return _raw_response(chat_client, proxy_response, record_ttft)
+
+def chat_stream_metrics() -> Dict:
+    return {
+        "streams": len(chat_stream_ttft.samples),
+        "ttft_p50": chat_stream_ttft.percentile(0.5),
+        "ttft_p95": chat_stream_ttft.percentile(0.95)
+    }
 
 @router.get("/history/{room_id}")
 async def get_chat_history(
     room_id: str,
+    request: Request,
     authorization: str = Header(...)
 ):
     """Chat geçmişini getir"""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.get(
-            f"{config.CHAT_SERVICE_URL}/chat/history/{room_id}",
-            headers={"Authorization": authorization}
+    async def fetch():
+        response = await upstreams.get("chat").request(
+            "GET",
+            f"/chat/history/{room_id}",
+            headers={"Authorization": authorization, **identity_headers(request)},
+            timeout=config.REQUEST_TIMEOUT
         )
         response.raise_for_status()
         return response.json()
+    
+    user_key = getattr(request.state, "user_id", None) or authorization
+    return await chat_singleflight.do((user_key, "GET", f"/chat/history/{room_id}"), fetch)
 
 @router.delete("/history/{room_id}")
 async def clear_chat_history(
     room_id: str,
+    request: Request,
     authorization: str = Header(...)
 ):
     """Chat geçmişini temizle"""
-    async with httpx.AsyncClient(timeout=10.0) as client:
-        response = await client.delete(
-            f"{config.CHAT_SERVICE_URL}/chat/history/{room_id}",
-            headers={"Authorization": authorization}
-        )
-        response.raise_for_status()
-        return response.json()
\ No newline at end of file
+    response = await upstreams.get("chat").request(
+        "DELETE",
+        f"/chat/history/{room_id}",
+        headers={"Authorization": authorization, **identity_headers(request)},
+        timeout=config.REQUEST_TIMEOUT
+    )
+    response.raise_for_status()
+    return response.json()
\ No newline at end of file
@@ -1,18 +1,160 @@
 from fastapi import APIRouter, Request, Response, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from typing import Optional
 import httpx
+from internal.cache.response_cache import CachedResponse, note_cache, etag_matches
+from internal.client.resilience import CircuitOpenError
+from internal.client.singleflight import SingleFlight
+from internal.client.upstream_client import UpstreamClient, upstreams, strip_hop_by_hop
 from internal.config.config import config
+from internal.middleware.auth import identity_headers, strip_identity_headers
 import logging
 
 logger = logging.getLogger("api-gateway-note-router")
 
 router = APIRouter(prefix="/notes", tags=["Notes"])
 
+# Bu metodlar kullanıcının cache'lenmiş note cevaplarını geçersiz kılar
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
-@router.api_route("/{path_name:path}", methods=["GET", "POST", "PUT", "DELETE"])
+# Aynı kullanıcıdan eşzamanlı gelen aynı GET'ler tek upstream çağrısını paylaşır
+note_singleflight = SingleFlight("note")
+
+
+def _is_bufferable(response: httpx.Response) -> bool:
+    """Boyutu bilinen ve sınır altındaki cevaplar belleğe alınıp paylaşılabilir"""
+    try:
+        content_length = int(response.headers.get("content-length", ""))
+    except ValueError:
+        return False
+    return content_length <= note_cache.max_entry_bytes
+
+
+def _is_cacheable(response: httpx.Response) -> bool:
+    """Sadece ETag'li 200 cevapları cache'lenir"""
+    if response.status_code != 200 or "etag" not in response.headers:
+        return False
+    return "no-store" not in response.headers.get("cache-control", "")
+
+
+def _stream_response(note_client: UpstreamClient, proxy_response: httpx.Response) -> StreamingResponse:
+    """Ham (decode edilmemiş) byte'lar aktarılır, Content-Encoding korunur"""
+    return StreamingResponse(
+        proxy_response.aiter_raw(),
+        status_code=proxy_response.status_code,
+        headers=strip_hop_by_hop(proxy_response.headers),
+        background=BackgroundTask(note_client.close_stream, proxy_response)
+    )
+
+
+def _from_cache(cached: CachedResponse, if_none_match: Optional[str]) -> Response:
+    """Buffer'lanmış cevabı döner; istemci aynı ETag'e sahipse body'siz 304"""
+    if cached.status_code == 200 and cached.etag and etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers={"ETag": cached.etag})
+    return Response(
+        content=cached.body,
+        status_code=cached.status_code,
+        headers=cached.headers
+    )
+
+
+async def _proxy_get(request: Request, user_id, url: str, headers: dict) -> Response:
+    """
+    GET istekleri: önce kullanıcı cache'i, sonra singleflight ile tek upstream çağrısı.
+    Cache'te kayıt varsa upstream'e sadece ETag doğrulatılır (If-None-Match).
+    Kayıt yoksa istemcinin If-None-Match'i upstream'e iletilir; 304 sadece o
+    isteğe aittir, bekleyenler kendi koşullu isteklerini yapar. Buffer'lanan
+    cevaplarda istemcinin If-None-Match'i gateway'de değerlendirilir.
+    """
+    note_client = upstreams.get("note")
+    client_etag = headers.pop("if-none-match", None)
+    cache_key = note_cache.make_key(
+        user_id,
+        url,
+        str(request.query_params),
+        request.headers.get("accept-encoding", "")
+    )
+    cached = note_cache.get(cache_key)
+    if cached is not None and cached.is_fresh(config.NOTE_CACHE_MAX_AGE):
+        return _from_cache(cached, client_etag)
+    
+    leader_stream = {}
+    
+    async def fetch() -> Optional[CachedResponse]:
+        upstream_headers = dict(headers)
+        if cached is not None:
+            upstream_headers["if-none-match"] = cached.etag
+        elif client_etag:
+            upstream_headers["if-none-match"] = client_etag
+        
+        proxy_response = await note_client.send_stream(
+            method="GET",
+            url=url,
+            params=request.query_params,
+            headers=upstream_headers
+        )
+        
+        if cached is not None and proxy_response.status_code == 304:
+            await note_client.close_stream(proxy_response)
+            note_cache.revalidated += 1
+            cached.touch()
+            return cached
+        
+        if proxy_response.status_code == 304:
+            # İstemcinin kendi ETag'i eşleşti; paylaşılamaz, leader aktarır
+            leader_stream["response"] = proxy_response
+            return None
+        
+        if not _is_bufferable(proxy_response):
+            note_cache.discard(cache_key)
+            leader_stream["response"] = proxy_response
+            return None
+        
+        try:
+            raw_body = b"".join([chunk async for chunk in proxy_response.aiter_raw()])
+        finally:
+            await note_client.close_stream(proxy_response)
+        
+        entry = CachedResponse(
+            etag=proxy_response.headers.get("etag"),
+            status_code=proxy_response.status_code,
+            headers=strip_hop_by_hop(proxy_response.headers),
+            body=raw_body
+        )
+        if _is_cacheable(proxy_response):
+            note_cache.put(cache_key, entry)
+        else:
+            note_cache.discard(cache_key)
+        return entry
+    
+    result = await note_singleflight.do(cache_key, fetch)
+    if result is not None:
+        return _from_cache(result, client_etag)
+    
+    # Cevap paylaşılamıyor (büyük ya da istemciye özel 304): leader kendi stream'ini
+    # aktarır, bekleyenler kendi If-None-Match'leriyle kendi isteklerini yapar
+    proxy_response = leader_stream.get("response")
+    if proxy_response is None:
+        if client_etag:
+            headers["if-none-match"] = client_etag
+        proxy_response = await note_client.send_stream(
+            method="GET",
+            url=url,
+            params=request.query_params,
+            headers=headers
+        )
+    return _stream_response(note_client, proxy_response)
+
+
+@router.api_route("/{path_name:path}", methods=["GET", "POST", "PUT", "PATCH", "DELETE"])
 async def proxy_notes(request: Request, path_name: str):
     """
     Note Service'e gelen tüm istekleri iletir.
     Auth middleware'den gelen user_id'yi custom header ile note-service'e gönderir.
+    Request ve response body'leri parça parça aktarılır, gateway belleğinde tutulmaz.
+    GET cevapları ETag ile kullanıcı bazlı cache'lenir, yazma işlemleri cache'i temizler.
+    Eşzamanlı aynı GET'ler tek upstream çağrısında birleştirilir (singleflight).
     """
     # Middleware'den user_id'yi al
     user_id = getattr(request.state, "user_id", None)
@@ -23,41 +165,48 @@ async def proxy_notes(request: Request, path_name: str):
             detail="User not authenticated"
         )
     
-    # Note service URL'i oluştur
-    url = f"{config.NOTE_SERVICE_URL}/{path_name}"
+    # Note service path'i (replika URL'ini load balancer ekler)
+    url = f"/{path_name}"
     
-    # Request body ve headers'ı al
-    body = await request.body()
-    headers = dict(request.headers)
-    headers.pop("host", None)
+    # Headers'ı al, body'yi stream olarak ilet (sadece body varsa)
+    headers = strip_identity_headers(strip_hop_by_hop(request.headers))
+    has_body = "content-length" in request.headers or "transfer-encoding" in request.headers
+    body = request.stream() if has_body else None
     
-    # User ID'yi custom header olarak ekle
-    # Note service bu header'ı okuyacak
-    headers["X-User-ID"] = str(user_id)
+    # Doğrulanmış kimliği custom header'lar ile ekle
+    # Note service bu header'ları okuyacak, token'ı tekrar decode etmeyecek
+    headers.update(identity_headers(request))
     
-    # Opsiyonel: Username ve email de gönderilebilir
-    if hasattr(request.state, "username"):
-        headers["X-Username"] = request.state.username
-    if hasattr(request.state, "email"):
-        headers["X-Email"] = request.state.email
+    # Sıkıştırma uçtan uca: note-service istemcinin kabul ettiği codec ile sıkıştırır,
+    # gateway ham byte'ları açmadan aktarır. httpx'in varsayılan Accept-Encoding'i
+    # istemcinin açamayacağı bir codec seçtirmesin diye açıkça belirtilir.
+    headers.setdefault("accept-encoding", "identity")
     
+    note_client = upstreams.get("note")
     try:
-        async with httpx.AsyncClient() as client:
-            proxy_response = await client.request(
-                method=request.method,
-                url=url,
-                params=request.query_params,
-                content=body,
-                headers=headers,
-                timeout=config.REQUEST_TIMEOUT
-            )
-            
-        return Response(
-            content=proxy_response.content,
-            status_code=proxy_response.status_code,
-            headers=dict(proxy_response.headers)
+        if request.method == "GET":
+            return await _proxy_get(request, user_id, url, headers)
+        
+        proxy_response = await note_client.send_stream(
+            method=request.method,
+            url=url,
+            params=request.query_params,
+            content=body,
+            headers=headers
         )
         
+        if request.method in WRITE_METHODS:
+            note_cache.invalidate_user(user_id)
+        
+        return _stream_response(note_client, proxy_response)
+        
+    except CircuitOpenError as e:
+        logger.warning(f"Note service circuit open: {url}")
+        raise HTTPException(
+            status_code=503,
+            detail="Note service unavailable",
+            headers={"Retry-After": str(max(1, int(e.retry_after)))}
+        )
     except httpx.ConnectError:
         logger.error(f"Note service unreachable: {url}")
         raise HTTPException(
@@ -1,12 +1,45 @@
+import os
+import sys
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # Katmanlı mimari için router'ı import ediyoruz
-from internal.router.chat_router import router as chat_router
+from internal.router.chat_router import router as chat_router, handler as chat_handler
+from internal.config.config import settings
+from internal.embeddings.cache import CachedEmbedder
+from internal.embeddings.factory import get_embedder
+from internal.service.stream_metrics import stream_metrics
+
+# Servisler arası paylaşılan modüller (backend/shared)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from shared.compression import CompressionMiddleware
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Embedding backend'inin HTTP bağlantı havuzlarını kapat (hiç oluşturulmadıysa atla)
+    if get_embedder.cache_info().currsize:
+        embedder = get_embedder()
+        embedder.close()
+        await embedder.aclose()
+
 
 app = FastAPI(
     title="Notus Chat Service",
     description="Katmanlı Mimari (Router-Handler-Service-Repository) ile AI Chat Servisi",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
+)
+
+# Sıkıştırma (gzip / br / zstd) - uzun chat geçmişleri için
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+    max_request_size=settings.COMPRESSION_MAX_REQUEST_SIZE
 )
 
 # CORS Ayarları
@@ -30,4 +63,13 @@ def root():
 
 @app.get("/health")
 def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+def metrics():
+    embedder = get_embedder()
+    return {
+        "embedding_cache": embedder.metrics() if isinstance(embedder, CachedEmbedder) else None,
+        "chat_stream": stream_metrics.metrics(),
+        "conversation_memory": chat_handler.service.memory_metrics()
+    }
\ No newline at end of file
@@ -6,9 +6,38 @@ class Settings(BaseSettings):
     DEFAULT_MODEL: str = "openai/gpt-3.5-turbo"
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    INTERNAL_TOKEN: str = ""
     QDRANT_HOST: str = "qdrant"
     QDRANT_PORT: int = 6333
     QDRANT_COLLECTION_NAME: str = "chat_history"
+    # Embedding: "local" (deterministik hashing, CPU) ya da "remote" (OpenAI uyumlu API)
+    EMBEDDING_BACKEND: str = "local"
+    EMBEDDING_DIM: int = 1536  # Qdrant collection vektör boyutu
+    EMBEDDING_BATCH_SIZE: int = 128  # remote: istek başına metin
+    EMBEDDING_CHAR_NGRAM: int = 3  # 0: sadece kelimeler
+    EMBEDDING_BASE_URL: str = "https://api.openai.com/v1"
+    EMBEDDING_API_KEY: str = ""  # boşsa OPENROUTER_API_KEY
+    EMBEDDING_MODEL: str = "text-embedding-3-small"
+    EMBEDDING_TIMEOUT: float = 30.0
+    EMBEDDING_SEND_DIMENSIONS: bool = False
+    EMBEDDING_ENCODING_FORMAT: str = "float"
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # bellek LRU bütçesi (0: cache kapalı)
+    EMBEDDING_CACHE_DIR: str = ""  # boş değilse memory-mapped disk katmanı
+    EMBEDDING_CACHE_DISK_ENTRIES: int = 50_000
+    # Konuşma hafızası: global bütçe (oda + byte), idle TTL, oda başına token penceresi
+    MEMORY_MAX_ROOMS: int = 10_000
+    MEMORY_MAX_BYTES: int = 64 * 1024 * 1024
+    MEMORY_IDLE_TTL: float = 1800.0  # saniye
+    MEMORY_ROOM_MAX_TOKENS: int = 2000
+    MEMORY_REHYDRATE_MESSAGES: int = 10  # atılan oda geri gelince vector store'dan yüklenen mesaj
+    # Yükleme sadece bu kadar geriye bakar ve en fazla bu kadar noktayı tarar (oda boyutundan bağımsız)
+    MEMORY_REHYDRATE_WINDOW: float = 7 * 24 * 3600  # saniye
+    MEMORY_REHYDRATE_MAX_SCAN: int = 2000
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_MAX_REQUEST_SIZE: int = 32 * 1024 * 1024  # açılmış request body sınırı (413)
     
     class Config:
         env_file = ".env"
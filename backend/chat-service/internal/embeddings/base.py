@@ -0,0 +1,47 @@
+"""
+Embedding arayüzü
+Tüm backend'ler metin listesini tek çağrıda alır ve (len(texts), dim) boyutlu,
+L2-normalize edilmiş float32 numpy dizisi döndürür (cosine = nokta çarpımı).
+aembed event loop'u bloklamaz: varsayılan olarak embed'i thread havuzunda
+çalıştırır, ağ üzerinden çalışan backend'ler doğrudan async istemci kullanır.
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Sequence
+
+import numpy as np
+
+
+class Embedder(ABC):
+    """Embedding backend'i"""
+
+    # Vector store'da noktalar bu isimle etiketlenir; farklı modelin vektörleri karışmaz
+    name: str
+    dim: int
+
+    @abstractmethod
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Metinleri toplu embed eder: (len(texts), dim) float32"""
+
+    def embed_one(self, text: str) -> np.ndarray:
+        return self.embed([text])[0]
+
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        return await asyncio.to_thread(self.embed, texts)
+
+    async def aembed_one(self, text: str) -> np.ndarray:
+        return (await self.aembed([text]))[0]
+
+    def close(self) -> None:
+        """Backend kaynaklarını bırakır (HTTP bağlantıları vb.); varsayılan olarak bir şey yapmaz"""
+
+    async def aclose(self) -> None:
+        """close'un async karşılığı (async istemciler burada kapatılır)"""
+
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    """Satırları birim uzunluğa getirir (sıfır vektörler sıfır kalır)"""
+    norms = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))[:, None]
+    np.maximum(norms, 1e-12, out=norms)
+    vectors /= norms
+    return vectors
@@ -0,0 +1,65 @@
+"""
+Embedding throughput ölçümü (metin/sn, farklı batch boyutlarında)
+
+    python -m internal.embeddings.benchmark [--texts 4096] [--batch-sizes 1,8,32,128,512] [--repeat 3]
+
+Varsayılan yerel hashing embedder'ı ölçer; --backend remote ile ayarlardaki
+OpenAI uyumlu API ölçülür (ağ gecikmesi dahil). Her batch boyutu için
+tekrarların en iyisi raporlanır (paylaşımlı CPU gürültüsü).
+"""
+import argparse
+import random
+import time
+from typing import List
+
+from internal.embeddings.base import Embedder
+from internal.embeddings.hashing import HashingEmbedder
+
+_WORDS = (
+    "not toplantı proje rapor fikir görev alışveriş kitap özet plan hafta ödev "
+    "meeting project report idea task notes summary deadline budget review draft "
+    "python fastapi veritabanı sorgu index performans önbellek kullanıcı etiket"
+).split()
+
+
+def sample_texts(count: int, seed: int = 42) -> List[str]:
+    """Chat mesajı uzunluğunda (8-60 kelime) deterministik örnek metinler"""
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(_WORDS, k=rng.randint(8, 60))) for _ in range(count)]
+
+
+def measure(embedder: Embedder, texts: List[str], batch_size: int) -> float:
+    """texts'i batch_size'lık çağrılarla embed eder, metin/sn döndürür"""
+    start = time.perf_counter()
+    for offset in range(0, len(texts), batch_size):
+        embedder.embed(texts[offset:offset + batch_size])
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["local", "remote"], default="local")
+    parser.add_argument("--texts", type=int, default=4096)
+    parser.add_argument("--batch-sizes", default="1,8,32,128,512")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.backend == "remote":
+        from internal.embeddings.factory import get_embedder
+        embedder = get_embedder()
+    else:
+        embedder = HashingEmbedder(dim=args.dim)
+
+    texts = sample_texts(args.texts)
+    embedder.embed(texts[:64])  # ısınma (özellik önbelleği / bağlantı)
+
+    print(f"embedder: {embedder.name}, {len(texts)} metin")
+    print(f"{'batch':>6} {'metin/sn':>12}")
+    for batch_size in (int(b) for b in args.batch_sizes.split(",")):
+        best = max(measure(embedder, texts, batch_size) for _ in range(args.repeat))
+        print(f"{batch_size:>6} {best:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,206 @@
+"""
+Embedding cache (içerik adresli)
+Anahtar: blake2b(embedder adı + metin); aynı metin aynı modelle bir daha
+hesaplanmaz (RAG sorgusu + kayıt, tekrarlanan selamlaşmalar vb.).
+- Bellek katmanı: byte bütçeli LRU, dolunca en eski kullanılan vektör atılır
+- Disk katmanı (opsiyonel): sabit kapasiteli halka, iki memory-mapped dosya
+  (anahtarlar + float32 vektörler); yeniden başlatmada index anahtar
+  dosyasından kurulur, vektörler okunana kadar diskte kalır
+  Disk dizini tek process içindir (her worker'a ayrı EMBEDDING_CACHE_DIR).
+  Paylaşılırsa process'ler birbirinin slot'larının üzerine yazar; okuma
+  slot anahtarını tekrar kontrol ettiği için yanlış vektör dönmez, sadece
+  isabet oranı düşer.
+"""
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from internal.embeddings.base import Embedder
+
+# Anahtar dosyasında slot: 16 byte içerik anahtarı + yazma sırası (0: boş slot)
+_SLOT_DTYPE = np.dtype([("key", "V16"), ("seq", "<u8")])
+
+
+def _open_memmap(path: str, dtype, shape) -> np.memmap:
+    """Dosya beklenen boyuttaysa açar, değilse (yoksa / kapasite değiştiyse) sıfırdan oluşturur"""
+    expected = int(np.prod(shape)) * np.dtype(dtype).itemsize
+    mode = "r+" if os.path.exists(path) and os.path.getsize(path) == expected else "w+"
+    return np.memmap(path, dtype=dtype, mode=mode, shape=shape)
+
+
+class DiskVectorCache:
+    """Memory-mapped, sabit kapasiteli vektör halkası (dolunca en eski slot üzerine yazılır)"""
+
+    def __init__(self, directory: str, name: str, dim: int, capacity: int):
+        os.makedirs(directory, exist_ok=True)
+        base = os.path.join(directory, re.sub(r"[^\w.-]", "_", name))
+        self.dim = dim
+        self.capacity = capacity
+        self.keys = _open_memmap(base + ".keys", _SLOT_DTYPE, (capacity,))
+        self.vectors = _open_memmap(base + ".f32", np.float32, (capacity, dim))
+
+        seqs = self.keys["seq"]
+        used = np.flatnonzero(seqs)
+        self.index: Dict[bytes, int] = {bytes(self.keys["key"][slot]): int(slot) for slot in used}
+        self.seq = int(seqs.max()) if len(used) else 0
+        self.next_slot = (int(seqs.argmax()) + 1) % capacity if len(used) else 0
+
+    def _holds(self, slot: int, key: bytes) -> bool:
+        return bool(self.keys["seq"][slot]) and bytes(self.keys["key"][slot]) == key
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        slot = self.index.get(key)
+        if slot is None:
+            return None
+        vector = np.array(self.vectors[slot])
+        # Slot bu arada (başka process / yarım yazma) başka anahtara geçtiyse kayıt geçersiz
+        if not self._holds(slot, key):
+            self.index.pop(key, None)
+            return None
+        return vector
+
+    def put(self, key: bytes, vector: np.ndarray) -> None:
+        if key in self.index:
+            return
+        slot = self.next_slot
+        if self.keys["seq"][slot]:
+            self.index.pop(bytes(self.keys["key"][slot]), None)
+        # Önce slot boşaltılır, sonra vektör, en son anahtar yazılır: yarım kalan
+        # yazma ne eski ne yeni anahtarın geçerli kaydı gibi görünür
+        self.keys[slot] = (bytes(16), 0)
+        self.vectors[slot] = vector
+        self.seq += 1
+        self.keys[slot] = (key, self.seq)
+        self.index[key] = slot
+        self.next_slot = (slot + 1) % self.capacity
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self.index) * (self.dim * 4 + _SLOT_DTYPE.itemsize)
+
+    def flush(self) -> None:
+        self.keys.flush()
+        self.vectors.flush()
+
+
+class CachedEmbedder(Embedder):
+    """Herhangi bir embedder'ın önüne bellek (+ disk) cache'i koyar"""
+
+    def __init__(
+        self,
+        inner: Embedder,
+        max_bytes: int,
+        disk_dir: Optional[str] = None,
+        disk_entries: int = 50_000
+    ):
+        self.inner = inner
+        self.name = inner.name
+        self.dim = inner.dim
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.disk = DiskVectorCache(disk_dir, inner.name, inner.dim, disk_entries) if disk_dir else None
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _key(self, text: str) -> bytes:
+        return hashlib.blake2b(f"{self.name}\0{text}".encode(), digest_size=16).digest()
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        if vector.nbytes > self.max_bytes:
+            return
+        # Eşzamanlı iki miss aynı anahtarı iki kez yazabilir: eski kaydın byte'ı düşülür
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self.size_bytes -= old.nbytes
+        self._memory[key] = vector
+        self.size_bytes += vector.nbytes
+        while self._memory and self.size_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self.size_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _lookup(self, texts: Sequence[str]) -> Tuple[np.ndarray, Dict[bytes, List[int]]]:
+        """Cache'ten doldurulmuş vektörler + cache'te olmayanlar: anahtar -> metnin geçtiği satırlar"""
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        # Batch içi tekrarlar bir kez hesaplanır
+        missing: Dict[bytes, List[int]] = {}
+
+        with self._lock:
+            for row, text in enumerate(texts):
+                key = self._key(text)
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                elif key in missing:
+                    missing[key].append(row)
+                    self.memory_hits += 1
+                    continue
+                elif self.disk is not None and (vector := self.disk.get(key)) is not None:
+                    self._remember(key, vector)
+                    self.disk_hits += 1
+                else:
+                    missing[key] = [row]
+                    self.misses += 1
+                    continue
+                vectors[row] = vector
+        return vectors, missing
+
+    def _store(self, vectors: np.ndarray, missing: Dict[bytes, List[int]], computed: np.ndarray) -> None:
+        with self._lock:
+            for (key, rows), vector in zip(missing.items(), computed):
+                vectors[rows] = vector
+                vector = vector.copy()  # batch matrisinin tamamı bellekte tutulmasın
+                self._remember(key, vector)
+                if self.disk is not None:
+                    self.disk.put(key, vector)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors, missing = self._lookup(texts)
+        if missing:
+            # Model çağrısı kilit dışında (uzak API'de uzun sürebilir)
+            computed = self.inner.embed([texts[rows[0]] for rows in missing.values()])
+            self._store(vectors, missing, computed)
+        return vectors
+
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors, missing = self._lookup(texts)
+        if missing:
+            computed = await self.inner.aembed([texts[rows[0]] for rows in missing.values()])
+            self._store(vectors, missing, computed)
+        return vectors
+
+    def close(self) -> None:
+        if self.disk is not None:
+            self.disk.flush()
+        self.inner.close()
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+    def metrics(self) -> Dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "embedder": self.name,
+            "entries": len(self._memory),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "disk_entries": len(self.disk.index) if self.disk is not None else 0,
+            "disk_size_bytes": self.disk.size_bytes if self.disk is not None else 0
+        }
@@ -0,0 +1,45 @@
+"""
+Ayarlara göre embedding backend'i seçer (EMBEDDING_BACKEND=local | remote) ve
+önüne embedding cache'ini koyar.
+Süreç başına tek örnek paylaşılır (önbellek / HTTP bağlantı havuzu ortak).
+"""
+from functools import lru_cache
+
+from internal.config.config import settings
+from internal.embeddings.base import Embedder
+from internal.embeddings.cache import CachedEmbedder
+from internal.embeddings.hashing import HashingEmbedder
+from internal.embeddings.remote import RemoteEmbedder
+
+
+@lru_cache(maxsize=1)
+def get_embedder() -> Embedder:
+    embedder = _create_backend()
+    if settings.EMBEDDING_CACHE_MAX_BYTES <= 0:
+        return embedder
+    return CachedEmbedder(
+        embedder,
+        max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+        disk_dir=settings.EMBEDDING_CACHE_DIR or None,
+        disk_entries=settings.EMBEDDING_CACHE_DISK_ENTRIES
+    )
+
+
+def _create_backend() -> Embedder:
+    if settings.EMBEDDING_BACKEND == "local":
+        return HashingEmbedder(
+            dim=settings.EMBEDDING_DIM,
+            char_ngram=settings.EMBEDDING_CHAR_NGRAM
+        )
+    if settings.EMBEDDING_BACKEND == "remote":
+        return RemoteEmbedder(
+            base_url=settings.EMBEDDING_BASE_URL,
+            api_key=settings.EMBEDDING_API_KEY or settings.OPENROUTER_API_KEY,
+            model=settings.EMBEDDING_MODEL,
+            dim=settings.EMBEDDING_DIM,
+            batch_size=settings.EMBEDDING_BATCH_SIZE,
+            timeout=settings.EMBEDDING_TIMEOUT,
+            send_dimensions=settings.EMBEDDING_SEND_DIMENSIONS,
+            encoding_format=settings.EMBEDDING_ENCODING_FORMAT
+        )
+    raise ValueError(f"Bilinmeyen EMBEDDING_BACKEND: {settings.EMBEDDING_BACKEND}")
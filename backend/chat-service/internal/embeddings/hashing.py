@@ -0,0 +1,130 @@
+"""
+Yerel, deterministik embedding (CPU, model dosyası / ağ gerektirmez)
+Feature hashing: kelimeler ve kelime içi karakter n-gram'ları blake2b ile
+dim boyutlu vektöre işaretli olarak dağıtılır, frekanslar log ile
+sönümlenir, satırlar L2-normalize edilir.
+- blake2b süreçten bağımsızdır; hash() gibi PYTHONHASHSEED'e bağlı değildir,
+  aynı metin her yeniden başlatmada aynı vektörü verir
+- Python tarafında sadece tokenizasyon ve kelime başına bir sözlük araması
+  yapılır; token'ların özelliklere açılması ve toplanması (np.bincount)
+  batch başına tek seferde numpy'da yapılır
+- Karakter n-gram'ları Türkçe gibi eklemeli dillerde aynı kökü paylaşan
+  kelimeleri (ör. "not", "notlar", "notlarım") yakınlaştırır
+"""
+import asyncio
+import hashlib
+import re
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+
+from internal.embeddings.base import Embedder, l2_normalize
+
+_TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# Kelime özelliği n-gram'dan daha ayırt edicidir
+WORD_WEIGHT = 1.0
+NGRAM_WEIGHT = 0.5
+
+
+class HashingEmbedder(Embedder):
+
+    def __init__(
+        self,
+        dim: int = 1536,
+        char_ngram: int = 3,
+        batch_size: int = 32,
+        cache_size: int = 200_000
+    ):
+        self.dim = dim
+        self.char_ngram = char_ngram
+        # Büyük çağrılar bu boyutta parçalara bölünür: (batch_size x dim) float64
+        # ara matris CPU önbelleğinde kalır (1536 boyutta 32 metin ~400 KB)
+        self.batch_size = batch_size
+        self.cache_size = cache_size
+        self.name = f"hashing-v1-d{dim}-c{char_ngram}"
+        # kelime -> (kovalar, işaretli ağırlıklar): kelimenin kendisi + n-gram'ları.
+        # Kelime dağarcığı sınırlı olduğu için ısındıktan sonra blake2b neredeyse hiç çağrılmaz
+        self._cache: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def _hash(self, feature: str, weight: float) -> Tuple[int, float]:
+        digest = int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), "little")
+        sign = -1.0 if digest >> 63 else 1.0
+        return digest % self.dim, sign * weight
+
+    def _word_features(self, word: str) -> Tuple[np.ndarray, np.ndarray]:
+        cached = self._cache.get(word)
+        if cached is not None:
+            return cached
+
+        features = [self._hash(word, WORD_WEIGHT)]
+        n = self.char_ngram
+        if n and len(word) > n:
+            padded = f"<{word}>"
+            features.extend(
+                self._hash("#" + padded[start:start + n], NGRAM_WEIGHT)
+                for start in range(len(padded) - n + 1)
+            )
+        buckets, weights = zip(*features)
+        cached = (np.array(buckets, dtype=np.int64), np.array(weights, dtype=np.float64))
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.clear()
+        self._cache[word] = cached
+        return cached
+
+    def _embed_batch(self, texts: Sequence[str]) -> np.ndarray:
+        # Python tarafı: tokenizasyon + kelime başına tek sözlük araması
+        tokens = [_TOKEN_PATTERN.findall(text.lower()) for text in texts]
+        vocabulary: Dict[str, int] = {}
+        word_ids = np.fromiter(
+            (vocabulary.setdefault(word, len(vocabulary)) for words in tokens for word in words),
+            dtype=np.int64
+        )
+        token_rows = np.repeat(
+            np.arange(len(texts), dtype=np.int64),
+            np.fromiter((len(words) for words in tokens), dtype=np.int64, count=len(texts))
+        )
+
+        # Batch'teki tekil kelimelerin özellikleri tek düz diziye (CSR benzeri)
+        features = [self._word_features(word) for word in vocabulary]
+        lengths = np.fromiter((len(b) for b, _ in features), dtype=np.int64, count=len(features))
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1])) if len(features) else lengths
+        all_buckets = np.concatenate([b for b, _ in features]) if features else np.empty(0, np.int64)
+        all_weights = np.concatenate([w for _, w in features]) if features else np.empty(0)
+
+        # Her token'ı özelliklerine aç: token i -> offsets[id] .. offsets[id] + lengths[id]
+        token_lengths = lengths[word_ids]
+        total = int(token_lengths.sum())
+        token_starts = np.cumsum(token_lengths) - token_lengths
+        positions = np.repeat(offsets[word_ids] - token_starts, token_lengths) + np.arange(total)
+        rows = np.repeat(token_rows, token_lengths)
+
+        vectors = np.bincount(
+            rows * self.dim + all_buckets[positions],
+            weights=all_weights[positions],
+            minlength=len(texts) * self.dim
+        ).reshape(len(texts), self.dim)
+
+        # Alt-doğrusal frekans: sign(x) * log(1 + |x|), ara dizi açmadan yerinde
+        magnitudes = np.abs(vectors)
+        np.log1p(magnitudes, out=magnitudes)
+        np.copysign(magnitudes, vectors, out=magnitudes)
+        return l2_normalize(magnitudes.astype(np.float32))
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        if len(texts) <= self.batch_size:
+            return self._embed_batch(texts)
+        return np.concatenate([
+            self._embed_batch(texts[start:start + self.batch_size])
+            for start in range(0, len(texts), self.batch_size)
+        ])
+
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        # Tek batch (chat mesajı, RAG sorgusu) milisaniyenin altında; thread'e
+        # göndermek hesaplamadan pahalı, event loop'ta çalışır
+        if len(texts) <= self.batch_size:
+            return self.embed(texts)
+        return await asyncio.to_thread(self.embed, texts)
@@ -0,0 +1,97 @@
+"""
+OpenAI uyumlu embedding API backend'i (POST {base_url}/embeddings)
+OpenAI, OpenRouter, vLLM, TEI, LocalAI gibi servislerle çalışır.
+Metinler batch_size'lık parçalar halinde gönderilir; HTTP bağlantısı
+(keep-alive) çağrılar arasında yeniden kullanılır. aembed aynı istekleri
+httpx.AsyncClient ile eşzamanlı gönderir.
+"""
+import asyncio
+import base64
+from typing import Sequence
+
+import httpx
+import numpy as np
+
+from internal.embeddings.base import Embedder, l2_normalize
+
+
+class RemoteEmbedder(Embedder):
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        model: str,
+        dim: int,
+        batch_size: int = 128,
+        timeout: float = 30.0,
+        send_dimensions: bool = False,
+        encoding_format: str = "float"
+    ):
+        self.model = model
+        self.dim = dim
+        self.batch_size = batch_size
+        # text-embedding-3-* gibi modeller çıktı boyutunu "dimensions" ile kısaltabilir
+        self.send_dimensions = send_dimensions
+        # "base64": float listesi yerine ham float32 bayt (daha küçük cevap, hızlı çözme)
+        self.encoding_format = encoding_format
+        self.name = f"remote-{model}-d{dim}"
+        client_args = dict(
+            base_url=base_url.rstrip("/"),
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=timeout
+        )
+        self.client = httpx.Client(**client_args)
+        self.async_client = httpx.AsyncClient(**client_args)
+
+    def _decode(self, embedding) -> np.ndarray:
+        if isinstance(embedding, str):
+            return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+        return np.asarray(embedding, dtype=np.float32)
+
+    def _request_body(self, texts: Sequence[str]) -> dict:
+        body = {"model": self.model, "input": list(texts), "encoding_format": self.encoding_format}
+        if self.send_dimensions:
+            body["dimensions"] = self.dim
+        return body
+
+    def _store(self, response: httpx.Response, texts: Sequence[str], out: np.ndarray) -> None:
+        response.raise_for_status()
+        data = response.json()["data"]
+        if len(data) != len(texts):
+            raise ValueError(f"Embedding API {len(texts)} metin için {len(data)} vektör döndürdü")
+
+        for item in data:
+            vector = self._decode(item["embedding"])
+            if vector.shape[0] != self.dim:
+                raise ValueError(
+                    f"Embedding boyutu {vector.shape[0]}, beklenen {self.dim} (EMBEDDING_DIM)"
+                )
+            out[item["index"]] = vector
+
+    def _chunks(self, texts: Sequence[str]):
+        for start in range(0, len(texts), self.batch_size):
+            yield start, texts[start:start + self.batch_size]
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start, chunk in self._chunks(texts):
+            response = self.client.post("/embeddings", json=self._request_body(chunk))
+            self._store(response, chunk, vectors[start:start + len(chunk)])
+        return l2_normalize(vectors)
+
+    async def aembed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.empty((len(texts), self.dim), dtype=np.float32)
+
+        async def embed_chunk(start: int, chunk: Sequence[str]) -> None:
+            response = await self.async_client.post("/embeddings", json=self._request_body(chunk))
+            self._store(response, chunk, vectors[start:start + len(chunk)])
+
+        await asyncio.gather(*(embed_chunk(start, chunk) for start, chunk in self._chunks(texts)))
+        return l2_normalize(vectors)
+
+    def close(self) -> None:
+        self.client.close()
+
+    async def aclose(self) -> None:
+        await self.async_client.aclose()
@@ -1,4 +1,19 @@
+import asyncio
+import json
+import logging
+import time
+from typing import AsyncIterator
+
 from internal.service.chat_service import ChatService
+from internal.service.stream_metrics import stream_metrics
+
+logger = logging.getLogger("chat-handler")
+
+
+def sse_event(event: str, data: dict) -> str:
+    """Server-Sent Events çerçevesi (data tek satır JSON, token'daki satır sonları kaçışlı)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 
 class ChatHandler:
     def __init__(self):
@@ -8,4 +23,37 @@ class ChatHandler:
         # Burada gerekirse ek validation yapılabilir
         return await self.service.process_chat(
             user_id, request.room_id, request.message, request.use_rag, request.system_prompt
-        )
\ No newline at end of file
+        )
+
+    async def handle_chat_stream(self, user_id, request) -> AsyncIterator[str]:
+        """
+        Token'ları SSE olarak verir: "token" event'leri, sonunda "done".
+        Header'lar (200) ilk token'dan önce gönderildiği için sonradan oluşan
+        hata "error" event'i olarak bildirilir.
+        """
+        started = time.perf_counter()
+        ttft = None
+        stream_metrics.started += 1
+        try:
+            async for token in self.service.process_chat_stream(
+                user_id, request.room_id, request.message, request.use_rag, request.system_prompt
+            ):
+                if ttft is None:
+                    ttft = time.perf_counter() - started
+                    stream_metrics.record_ttft(ttft)
+                yield sse_event("token", {"content": token})
+        except (asyncio.CancelledError, GeneratorExit):
+            # İstemci bağlantıyı kapattı
+            stream_metrics.cancelled += 1
+            raise
+        except Exception as e:
+            stream_metrics.errors += 1
+            logger.exception("Streaming chat hatası")
+            yield sse_event("error", {"detail": f"Chat yanıtı üretilirken hata: {str(e)}"})
+            return
+
+        stream_metrics.record_completed(time.perf_counter() - started)
+        yield sse_event("done", {
+            "room_id": request.room_id,
+            "ttft_ms": round(ttft * 1000) if ttft is not None else None
+        })
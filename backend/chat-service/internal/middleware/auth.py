@@ -1,12 +1,45 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
-from config import settings
+from internal.config.config import settings
 
-security = HTTPBearer()
+security = HTTPBearer(auto_error=False)
 
-def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
-    """JWT token'dan user_id çıkar"""
+def get_trusted_user_id(request: Request) -> Optional[int]:
+    """
+    Gateway token'ı zaten doğruladıysa X-User-ID header'ını kullan.
+    Sadece X-Internal-Token ortak anahtarla eşleşirse güvenilir.
+    """
+    if not settings.INTERNAL_TOKEN:
+        return None
+    
+    internal_token = request.headers.get("X-Internal-Token", "")
+    user_id = request.headers.get("X-User-ID")
+    if not user_id or not hmac.compare_digest(internal_token, settings.INTERNAL_TOKEN):
+        return None
+    
+    try:
+        return int(user_id)
+    except ValueError:
+        return None
+
+def get_current_user_id(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
+) -> int:
+    """Gateway kimlik header'larından ya da JWT token'dan user_id çıkar"""
+    user_id = get_trusted_user_id(request)
+    if user_id is not None:
+        return user_id
+    
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated"
+        )
+    
     try:
         token = credentials.credentials
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
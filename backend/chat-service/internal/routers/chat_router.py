@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from internal.handler.chat_handler import ChatHandler
 from schemas import ChatRequest, ChatResponse
 from auth import get_current_user_id
@@ -9,4 +10,14 @@ handler = ChatHandler()
 @router.post("", response_model=ChatResponse)
 async def chat(request: ChatRequest, user_id: int = Depends(get_current_user_id)):
     response = await handler.handle_chat(user_id, request)
-    return ChatResponse(message=request.message, room_id=request.room_id, response=response)
\ No newline at end of file
+    return ChatResponse(message=request.message, room_id=request.room_id, response=response)
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest, user_id: int = Depends(get_current_user_id)):
+    """Cevap token token Server-Sent Events olarak akar (event: token / done / error)"""
+    return StreamingResponse(
+        handler.handle_chat_stream(user_id, request),
+        media_type="text/event-stream",
+        # Ara proxy'ler (nginx vb.) stream'i buffer'lamasın
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
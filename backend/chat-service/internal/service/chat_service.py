@@ -5,9 +5,15 @@ class ChatService:
         self.ai = LangChainManager()
     
     async def process_chat(self, user_id, room_id, message, use_rag, system_prompt):
-        return self.ai.chat(user_id, room_id, message, use_rag, system_prompt)
+        return await self.ai.chat(user_id, room_id, message, use_rag, system_prompt)
+
+    def process_chat_stream(self, user_id, room_id, message, use_rag, system_prompt):
+        return self.ai.chat_stream(user_id, room_id, message, use_rag, system_prompt)
+
+    def memory_metrics(self):
+        return self.ai.memories.metrics()
 
     async def get_summarization(self, text):
-        return self.ai.summarize_text(text)
+        return await self.ai.summarize_text(text)
     
     
\ No newline at end of file
@@ -1,9 +1,10 @@
 from langchain_openai import ChatOpenAI
-from langchain.schema import HumanMessage, AIMessage, SystemMessage
-from langchain.memory import ConversationBufferMemory
-from typing import List, Dict
-from config import settings
+from langchain.schema import HumanMessage, AIMessage, SystemMessage, BaseMessage
+from typing import AsyncIterator, List, Dict, Tuple
+import asyncio
+from internal.config.config import settings
 from vector_store import VectorStore
+from internal.service.memory_store import ConversationMemoryStore, RoomMemory
 
 class LangChainManager:
     
@@ -16,45 +17,60 @@ class LangChainManager:
             max_tokens=1000
         )
         self.vector_store = VectorStore()
-        self.memories = {}  # user_id:room_id -> Memory
+        # user_id:room_id -> son mesajlar (sınırlı; atılan oda vector store'dan yüklenir)
+        self.memories = ConversationMemoryStore(
+            max_rooms=settings.MEMORY_MAX_ROOMS,
+            max_bytes=settings.MEMORY_MAX_BYTES,
+            idle_ttl=settings.MEMORY_IDLE_TTL,
+            room_max_tokens=settings.MEMORY_ROOM_MAX_TOKENS
+        )
     
     def _get_memory_key(self, user_id: int, room_id: str) -> str:
         """Memory key oluştur"""
         return f"{user_id}:{room_id}"
     
-    def _get_or_create_memory(self, user_id: int, room_id: str) -> ConversationBufferMemory:
+    async def _get_or_create_memory(self, user_id: int, room_id: str) -> RoomMemory:
         """Memory al veya oluştur"""
         key = self._get_memory_key(user_id, room_id)
         
-        if key not in self.memories:
-            memory = ConversationBufferMemory(
-                return_messages=True,
-                memory_key="chat_history"
+        memory = self.memories.get(key)
+        if memory is None:
+            # Vector store'dan son mesajları yükle (ilk kullanım ya da atılmış oda)
+            history = await self.vector_store.get_recent_messages(
+                user_id, room_id, limit=settings.MEMORY_REHYDRATE_MESSAGES
             )
-            
-            # Vector store'dan geçmişi yükle
-            history = self.vector_store.get_chat_history(user_id, room_id, limit=10)
+            messages = []
             for msg in history:
                 if msg["role"] == "user":
-                    memory.chat_memory.add_user_message(msg["content"])
+                    messages.append(HumanMessage(content=msg["content"]))
                 elif msg["role"] == "assistant":
-                    memory.chat_memory.add_ai_message(msg["content"])
+                    messages.append(AIMessage(content=msg["content"]))
             
-            self.memories[key] = memory
+            # Aynı oda için eşzamanlı yükleme olduysa ilk kaydedilen kullanılır
+            # (diğer isteğin eklediği mesajlar kaybolmasın)
+            memory = self.memories.setdefault(key, messages)
         
-        return self.memories[key]
+        return memory
+    
+    async def _no_context(self) -> List[Dict]:
+        return []
     
-    def chat(
+    async def _build_messages(
         self,
         user_id: int,
         room_id: str,
         message: str,
-        use_rag: bool = False,
-        system_prompt: str = None
-    ) -> str:
-        """Chat yapılandır"""
-        
-        memory = self._get_or_create_memory(user_id, room_id)
+        use_rag: bool,
+        system_prompt: str
+    ) -> Tuple[RoomMemory, List[BaseMessage]]:
+        """Oda memory'si ve LLM'e gidecek mesaj listesi"""
+        
+        # Memory yükleme ve RAG araması birbirinden bağımsız; Qdrant'a eşzamanlı gider
+        memory, similar_messages = await asyncio.gather(
+            self._get_or_create_memory(user_id, room_id),
+            self.vector_store.search_similar(user_id, room_id, message, limit=3)
+            if use_rag else self._no_context()
+        )
         messages = []
         
         # System prompt
@@ -66,60 +82,96 @@ class LangChainManager:
             ))
         
         # RAG: Benzer geçmiş mesajları ekle
-        if use_rag:
-            similar_messages = self.vector_store.search_similar(
-                user_id, room_id, message, limit=3
-            )
-            if similar_messages:
-                context = "\n".join([
-                    f"Previous context: {msg['content']}"
-                    for msg in similar_messages
-                ])
-                messages.append(SystemMessage(
-                    content=f"Relevant conversation history:\n{context}"
-                ))
-        
-        # Memory'den chat history ekle
-        history = memory.load_memory_variables({})
-        for msg in history.get("chat_history", []):
-            messages.append(msg)
+        if similar_messages:
+            context = "\n".join([
+                f"Previous context: {msg['content']}"
+                for msg in similar_messages
+            ])
+            messages.append(SystemMessage(
+                content=f"Relevant conversation history:\n{context}"
+            ))
+        
+        # Memory'den chat history ekle (oda token penceresi kadar)
+        messages.extend(memory.messages)
         
         # Kullanıcı mesajı ekle
         messages.append(HumanMessage(content=message))
+        return memory, messages
+    
+    async def _save_exchange(
+        self,
+        memory: RoomMemory,
+        user_id: int,
+        room_id: str,
+        message: str,
+        assistant_message: str
+    ):
+        """Kullanıcı mesajı + cevabı memory'ye ve vector store'a yazar"""
+        self.memories.append(memory, HumanMessage(content=message), AIMessage(content=assistant_message))
+        
+        # Vector store'a kaydet (iki mesaj tek embedding batch'i + tek upsert)
+        await self.vector_store.add_messages(
+            user_id, room_id, [("user", message), ("assistant", assistant_message)]
+        )
+    
+    async def chat(
+        self,
+        user_id: int,
+        room_id: str,
+        message: str,
+        use_rag: bool = False,
+        system_prompt: str = None
+    ) -> str:
+        """Chat yapılandır"""
+        memory, messages = await self._build_messages(user_id, room_id, message, use_rag, system_prompt)
         
         # LLM'den yanıt al
-        response = self.llm.invoke(messages)
+        response = await self.llm.ainvoke(messages)
         assistant_message = response.content
         
-        # Memory'yi güncelle
-        memory.chat_memory.add_user_message(message)
-        memory.chat_memory.add_ai_message(assistant_message)
+        await self._save_exchange(memory, user_id, room_id, message, assistant_message)
+        return assistant_message
+    
+    async def chat_stream(
+        self,
+        user_id: int,
+        room_id: str,
+        message: str,
+        use_rag: bool = False,
+        system_prompt: str = None
+    ) -> AsyncIterator[str]:
+        """
+        Cevabı LLM'den geldikçe parça parça verir.
+        Tam cevap stream bittikten sonra memory'ye ve vector store'a yazılır;
+        istemci yarıda koparsa (generator kapatılırsa) hiçbir şey kaydedilmez.
+        """
+        memory, messages = await self._build_messages(user_id, room_id, message, use_rag, system_prompt)
         
-        # Vector store'a kaydet
-        self.vector_store.add_message(user_id, room_id, "user", message)
-        self.vector_store.add_message(user_id, room_id, "assistant", assistant_message)
+        parts = []
+        async for chunk in self.llm.astream(messages):
+            if chunk.content:
+                parts.append(chunk.content)
+                yield chunk.content
         
-        return assistant_message
+        await self._save_exchange(memory, user_id, room_id, message, "".join(parts))
     
-    def get_history(self, user_id: int, room_id: str) -> List[Dict]:
+    async def get_history(self, user_id: int, room_id: str) -> List[Dict]:
         """Chat geçmişini getir"""
-        return self.vector_store.get_chat_history(user_id, room_id)
+        return await self.vector_store.get_chat_history(user_id, room_id)
     
-    def clear_history(self, user_id: int, room_id: str):
+    async def clear_history(self, user_id: int, room_id: str):
         """Chat geçmişini temizle"""
-        key = self._get_memory_key(user_id, room_id)
-        if key in self.memories:
-            del self.memories[key]
+        self.memories.pop(self._get_memory_key(user_id, room_id))
         
-        self.vector_store.clear_room_history(user_id, room_id)
+        await self.vector_store.clear_room_history(user_id, room_id)
     
-    def summarize_text(self, text: str) -> str:
+    async def summarize_text(self, text: str) -> str:
         """Metni özetle"""
         prompt = f"Please summarize the following text concisely:\n\n{text}"
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
         return response.content
     
-    def categorize_text(self, text: str) -> Dict:
+    async def categorize_text(self, text: str) -> Dict:
         """Metni kategorize et"""
         prompt = f"""Categorize the following text into one of these categories:
         - Work
@@ -135,7 +187,7 @@ class LangChainManager:
         Format: Category: <name>, Confidence: <score>
         """
         
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
         result = response.content
         
         # Parse response
@@ -147,7 +199,7 @@ class LangChainManager:
         except:
             return {"category": "General", "confidence": 0.5}
     
-    def generate_tags(self, text: str) -> List[str]:
+    async def generate_tags(self, text: str) -> List[str]:
         """Tag'ler oluştur"""
         prompt = f"""Generate 3-5 relevant tags for the following text.
         Return only the tags separated by commas, lowercase, no hashtags.
@@ -155,7 +207,7 @@ class LangChainManager:
         Text: {text}
         """
         
-        response = self.llm.invoke([HumanMessage(content=prompt)])
+        response = await self.llm.ainvoke([HumanMessage(content=prompt)])
         tags_str = response.content.strip()
         
         # Parse tags
@@ -0,0 +1,98 @@
+"""
+Chat yük testi: çalışan servise eşzamanlı POST /chat istekleri gönderir
+
+    python -m internal.service.load_test [--url http://localhost:5004] [--concurrency 50] [--requests 500] [--rag]
+
+Gateway gibi X-User-ID + X-Internal-Token ile kimlik doğrular (INTERNAL_TOKEN
+ayarı), --token verilirse Bearer JWT kullanılır. Her istek ayrı odaya gider
+(kullanıcılar --users kadar). Yük sürerken /health periyodik çağrılır:
+event loop bir LLM / Qdrant çağrısında bloklanıyorsa /health gecikmesi
+chat süresine yaklaşır.
+"""
+import argparse
+import asyncio
+import time
+from typing import List
+
+import httpx
+
+from internal.config.config import settings
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+async def run(args) -> None:
+    latencies: List[float] = []
+    health_latencies: List[float] = []
+    errors = 0
+    queue: "asyncio.Queue[int]" = asyncio.Queue()
+    for number in range(args.requests):
+        queue.put_nowait(number)
+
+    def headers(user_id: int) -> dict:
+        if args.token:
+            return {"Authorization": f"Bearer {args.token}"}
+        return {"X-User-ID": str(user_id), "X-Internal-Token": settings.INTERNAL_TOKEN}
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout) as client:
+        async def worker() -> None:
+            nonlocal errors
+            while not queue.empty():
+                number = queue.get_nowait()
+                body = {
+                    "message": f"Yük testi mesajı {number}: bu haftaki toplantı notlarını özetle",
+                    "room_id": f"load-{number}",
+                    "use_rag": args.rag
+                }
+                start = time.perf_counter()
+                try:
+                    response = await client.post("/chat", json=body, headers=headers(number % args.users + 1))
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - start)
+                except httpx.HTTPError:
+                    errors += 1
+
+        async def probe_health(stop: asyncio.Event) -> None:
+            while not stop.is_set():
+                start = time.perf_counter()
+                try:
+                    await client.get("/health")
+                    health_latencies.append(time.perf_counter() - start)
+                except httpx.HTTPError:
+                    pass
+                await asyncio.sleep(0.05)
+
+        stop = asyncio.Event()
+        prober = asyncio.create_task(probe_health(stop))
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await prober
+
+    print(f"{args.requests} istek, eşzamanlılık {args.concurrency}, {elapsed:.2f} sn, hata {errors}")
+    print(f"throughput: {len(latencies) / elapsed:.1f} chat/sn")
+    for name, values in (("chat", latencies), ("health", health_latencies)):
+        print(
+            f"{name:>7} ms  p50 {percentile(values, 0.5) * 1000:8.0f}  "
+            f"p95 {percentile(values, 0.95) * 1000:8.0f}  max {max(values, default=0) * 1000:8.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:5004")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--rag", action="store_true")
+    parser.add_argument("--token", default=None)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Sınırlı konuşma hafızası (user_id:room_id -> son mesajlar)
+- Oda başına token penceresi: yeni mesaj eklendikçe pencereyi aşan en eski
+  mesajlar atılır (LLM'e giden geçmiş de bu pencereyle sınırlı kalır)
+- Global bütçe: oda sayısı + yaklaşık byte; aşılınca en uzun süredir
+  kullanılmayan oda atılır (LRU)
+- Idle TTL: süre boyunca erişilmeyen odalar bir sonraki erişimde temizlenir
+Atılan oda kaybolmaz; mesajlar vector store'da durur, oda tekrar
+kullanıldığında oradan yüklenir.
+Token sayısı tokenizer'sız, karakter sayısından tahmin edilir (~4 karakter /
+token); pencere ve bütçe sınırları için yeterince yakındır.
+"""
+import time
+from collections import OrderedDict, deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+from langchain.schema import BaseMessage
+
+# Mesaj nesnesi + deque / sözlük kayıtlarının yaklaşık sabit maliyeti
+MESSAGE_OVERHEAD_BYTES = 400
+ROOM_OVERHEAD_BYTES = 1000
+
+
+def estimate_tokens(text: str) -> int:
+    """Yaklaşık token sayısı (mesaj başına rol / ayraç token'ları dahil)"""
+    return len(text) // 4 + 4
+
+
+class RoomMemory:
+    """Bir odanın token penceresi içindeki son mesajları"""
+
+    def __init__(self, key: str, max_tokens: int):
+        self.key = key
+        self.max_tokens = max_tokens
+        # (mesaj, token, byte)
+        self._messages: Deque[Tuple[BaseMessage, int, int]] = deque()
+        self.tokens = 0
+        self.size_bytes = ROOM_OVERHEAD_BYTES
+        self.last_access = time.monotonic()
+
+    def _append(self, message: BaseMessage) -> None:
+        tokens = estimate_tokens(message.content)
+        size = len(message.content.encode()) + MESSAGE_OVERHEAD_BYTES
+        self._messages.append((message, tokens, size))
+        self.tokens += tokens
+        self.size_bytes += size
+
+        while self.tokens > self.max_tokens and self._messages:
+            _, tokens, size = self._messages.popleft()
+            self.tokens -= tokens
+            self.size_bytes -= size
+
+    @property
+    def messages(self) -> List[BaseMessage]:
+        return [message for message, _, _ in self._messages]
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+
+class ConversationMemoryStore:
+    """
+    Oda hafızaları (RoomMemory) için LRU + TTL önbelleği. max_rooms ve max_bytes
+    global bütçedir, idle_ttl saniye erişilmeyen oda süresi dolmuş sayılır,
+    room_max_tokens yeni odaların token penceresidir. Kilit yoktur; tek event
+    loop içinden kullanılmak içindir.
+    """
+
+    def __init__(
+        self,
+        max_rooms: int,
+        max_bytes: int,
+        idle_ttl: float,
+        room_max_tokens: int
+    ):
+        self.max_rooms = max_rooms
+        self.max_bytes = max_bytes
+        self.idle_ttl = idle_ttl
+        self.room_max_tokens = room_max_tokens
+        self._rooms: "OrderedDict[str, RoomMemory]" = OrderedDict()
+        self.size_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str) -> Optional[RoomMemory]:
+        """Odayı döndürür ve en son kullanılan yapar; yoksa / süresi dolduysa None"""
+        self._expire()
+        room = self._rooms.get(key)
+        if room is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        room.last_access = time.monotonic()
+        self._rooms.move_to_end(key)
+        return room
+
+    def setdefault(self, key: str, messages: Iterable[BaseMessage]) -> RoomMemory:
+        """
+        Vector store'dan yüklenen geçmişle odayı ekler. Yükleme sürerken aynı oda
+        başka istekle eklendiyse mevcut oda döner (onun eklediği mesajlar kaybolmasın).
+        """
+        room = self._rooms.get(key)
+        if room is not None:
+            return room
+
+        room = RoomMemory(key, self.room_max_tokens)
+        for message in messages:
+            room._append(message)
+        self._rooms[key] = room
+        self.size_bytes += room.size_bytes
+        self._evict()
+        return room
+
+    def append(self, room: RoomMemory, *messages: BaseMessage) -> None:
+        """
+        Odaya mesaj ekler. Oda bu arada atıldıysa sadece nesne güncellenir;
+        mesajlar vector store'a yazıldığı için sonraki yüklemede gelir.
+        """
+        tracked = self._rooms.get(room.key) is room
+        before = room.size_bytes
+        for message in messages:
+            room._append(message)
+        room.last_access = time.monotonic()
+
+        if tracked:
+            self.size_bytes += room.size_bytes - before
+            self._rooms.move_to_end(room.key)
+            self._evict()
+
+    def pop(self, key: str) -> None:
+        room = self._rooms.pop(key, None)
+        if room is not None:
+            self.size_bytes -= room.size_bytes
+
+    def _expire(self) -> None:
+        """LRU sırası = son erişim sırası; süresi dolanlar hep baştadır"""
+        deadline = time.monotonic() - self.idle_ttl
+        while self._rooms:
+            room = next(iter(self._rooms.values()))
+            if room.last_access > deadline:
+                break
+            self._rooms.popitem(last=False)
+            self.size_bytes -= room.size_bytes
+            self.expirations += 1
+
+    def _evict(self) -> None:
+        self._expire()
+        while self._rooms and (len(self._rooms) > self.max_rooms or self.size_bytes > self.max_bytes):
+            _, room = self._rooms.popitem(last=False)
+            self.size_bytes -= room.size_bytes
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._rooms)
+
+    def metrics(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "rooms": len(self._rooms),
+            "max_rooms": self.max_rooms,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "room_max_tokens": self.room_max_tokens,
+            "idle_ttl": self.idle_ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations
+        }
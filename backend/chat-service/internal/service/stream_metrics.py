@@ -0,0 +1,49 @@
+"""
+Streaming chat metrikleri
+time-to-first-token (TTFT): istek gelişinden ilk token event'ine kadar geçen
+süre (memory yükleme + RAG + LLM'in ilk token'ı). Son N stream'in
+örneklerinden yüzdelik hesaplanır.
+"""
+from collections import deque
+from typing import Dict, Optional
+
+
+class StreamMetrics:
+
+    def __init__(self, window: int = 1000):
+        self.ttft = deque(maxlen=window)
+        self.durations = deque(maxlen=window)
+        self.started = 0
+        self.completed = 0
+        self.cancelled = 0
+        self.errors = 0
+
+    def record_ttft(self, seconds: float):
+        self.ttft.append(seconds)
+
+    def record_completed(self, seconds: float):
+        self.completed += 1
+        self.durations.append(seconds)
+
+    @staticmethod
+    def _percentile(samples, quantile: float) -> Optional[float]:
+        if not samples:
+            return None
+        ordered = sorted(samples)
+        return round(ordered[min(len(ordered) - 1, int(quantile * len(ordered)))], 4)
+
+    def metrics(self) -> Dict:
+        return {
+            "started": self.started,
+            "completed": self.completed,
+            "cancelled": self.cancelled,
+            "errors": self.errors,
+            "ttft_p50": self._percentile(self.ttft, 0.5),
+            "ttft_p95": self._percentile(self.ttft, 0.95),
+            "ttft_p99": self._percentile(self.ttft, 0.99),
+            "duration_p50": self._percentile(self.durations, 0.5),
+            "duration_p95": self._percentile(self.durations, 0.95)
+        }
+
+
+stream_metrics = StreamMetrics()
@@ -1,49 +1,94 @@
-from qdrant_client import QdrantClient
-from qdrant_client.models import Distance, VectorParams, PointStruct
-from typing import List, Dict
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.models import (
+    Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, FilterSelector,
+    IsEmptyCondition, PayloadField, PayloadSchemaType, Range
+)
+from typing import List, Dict, Optional, Sequence, Tuple
+import asyncio
 import hashlib
+import heapq
 import json
+import time
+import uuid
 from datetime import datetime
-from config import settings
+from internal.config.config import settings
+from internal.embeddings.base import Embedder
+from internal.embeddings.factory import get_embedder
+
+def _match_filter(**conditions) -> Filter:
+    """Payload alanlarında eşitlik filtresi (must)"""
+    return Filter(must=[
+        FieldCondition(key=key, match=MatchValue(value=value))
+        for key, value in conditions.items()
+    ])
+
+# Filtrelenen / aralık sorgulanan payload alanları (scroll tüm collection'ı taramasın)
+PAYLOAD_INDEXES = {
+    "user_id": PayloadSchemaType.INTEGER,
+    "room_id": PayloadSchemaType.KEYWORD,
+    "ts": PayloadSchemaType.FLOAT
+}
+
+# Son mesajlar önce dar bir zaman penceresinde aranır, yetmezse pencere genişler
+REHYDRATE_WINDOWS = (3600, 24 * 3600)
 
 class VectorStore:
-    """Qdrant Vector Store Manager"""
+    """
+    Qdrant Vector Store Manager (async)
+    Tüm çağrılar AsyncQdrantClient ile yapılır, event loop bloklanmaz.
+    Collection kontrolü ilk kullanımda bir kez yapılır (__init__ await edemez).
+    """
     
-    def __init__(self):
-        self.client = QdrantClient(
+    def __init__(self, embedder: Optional[Embedder] = None):
+        self.client = AsyncQdrantClient(
             host=settings.QDRANT_HOST,
             port=settings.QDRANT_PORT
         )
         self.collection_name = settings.QDRANT_COLLECTION_NAME
-        self._ensure_collection()
+        self.embedder = embedder or get_embedder()
+        self._collection_ready = False
+        self._collection_lock = asyncio.Lock()
+    
+    async def _ensure_collection(self):
+        """Collection yoksa oluştur; varsa vektör boyutu embedder ile aynı olmalı"""
+        if self._collection_ready:
+            return
+        async with self._collection_lock:
+            if not self._collection_ready:
+                await self._create_or_check_collection()
+                self._collection_ready = True
     
-    def _ensure_collection(self):
-        """Collection yoksa oluştur"""
-        collections = self.client.get_collections().collections
+    async def _create_or_check_collection(self):
+        collections = (await self.client.get_collections()).collections
         collection_names = [c.name for c in collections]
         
         if self.collection_name not in collection_names:
-            self.client.create_collection(
+            await self.client.create_collection(
+                collection_name=self.collection_name,
+                vectors_config=VectorParams(size=self.embedder.dim, distance=Distance.COSINE)
+            )
+        else:
+            size = (await self.client.get_collection(self.collection_name)).config.params.vectors.size
+            if size != self.embedder.dim:
+                raise ValueError(
+                    f"'{self.collection_name}' collection'ı {size} boyutlu, embedder {self.embedder.dim} "
+                    f"boyutlu; EMBEDDING_DIM ya da QDRANT_COLLECTION_NAME ayarlanmalı"
+                )
+        
+        # Mevcut collection'larda da eksik index'ler eklenir (var olan index'e tekrar istek zararsız)
+        for field_name, schema in PAYLOAD_INDEXES.items():
+            await self.client.create_payload_index(
                 collection_name=self.collection_name,
-                vectors_config=VectorParams(size=1536, distance=Distance.COSINE)
+                field_name=field_name,
+                field_schema=schema
             )
     
     def _generate_id(self, user_id: int, room_id: str, message: str) -> str:
-        """Unique ID oluştur"""
+        """Unique ID oluştur (Qdrant point id'si int ya da UUID olmalı)"""
         content = f"{user_id}:{room_id}:{message}:{datetime.utcnow().isoformat()}"
-        return hashlib.sha256(content.encode()).hexdigest()
+        return str(uuid.UUID(hashlib.sha256(content.encode()).hexdigest()[:32]))
     
-    def _create_embedding(self, text: str) -> List[float]:
-        """
-        Basit embedding oluştur (production'da OpenAI embedding kullanılmalı)
-        Bu örnek için dummy embedding
-        """
-        # TODO: OpenAI/OpenRouter embedding API kullan
-        import random
-        random.seed(hash(text))
-        return [random.random() for _ in range(1536)]
-    
-    def add_message(
+    async def add_message(
         self,
         user_id: int,
         room_id: str,
@@ -52,31 +97,47 @@ class VectorStore:
         metadata: Dict = None
     ):
         """Mesajı vector store'a ekle"""
+        await self.add_messages(user_id, room_id, [(role, content)], metadata)
+    
+    async def add_messages(
+        self,
+        user_id: int,
+        room_id: str,
+        messages: Sequence[Tuple[str, str]],
+        metadata: Dict = None
+    ):
+        """(role, content) mesajlarını tek embedding batch'i ve tek upsert ile ekle"""
         
-        point_id = self._generate_id(user_id, room_id, content)
-        embedding = self._create_embedding(content)
-        
-        payload = {
-            "user_id": user_id,
-            "room_id": room_id,
-            "role": role,
-            "content": content,
-            "timestamp": datetime.utcnow().isoformat(),
-            "metadata": metadata or {}
-        }
+        await self._ensure_collection()
+        embeddings = await self.embedder.aembed([content for _, content in messages])
+        now = datetime.utcnow()
+        timestamp = now.isoformat()
+        ts = time.time()
         
-        point = PointStruct(
-            id=point_id,
-            vector=embedding,
-            payload=payload
-        )
+        points = [
+            PointStruct(
+                id=self._generate_id(user_id, room_id, f"{role}:{content}"),
+                vector=embedding.tolist(),
+                payload={
+                    "user_id": user_id,
+                    "room_id": room_id,
+                    "role": role,
+                    "content": content,
+                    "timestamp": timestamp,
+                    "ts": ts,  # aralık filtresi için sayısal zaman (epoch)
+                    "embedder": self.embedder.name,
+                    "metadata": metadata or {}
+                }
+            )
+            for (role, content), embedding in zip(messages, embeddings)
+        ]
         
-        self.client.upsert(
+        await self.client.upsert(
             collection_name=self.collection_name,
-            points=[point]
+            points=points
         )
     
-    def get_chat_history(
+    async def get_chat_history(
         self,
         user_id: int,
         room_id: str,
@@ -84,14 +145,10 @@ class VectorStore:
     ) -> List[Dict]:
         """Chat geçmişini getir"""
         
-        results = self.client.scroll(
+        await self._ensure_collection()
+        results = await self.client.scroll(
             collection_name=self.collection_name,
-            scroll_filter={
-                "must": [
-                    {"key": "user_id", "match": {"value": user_id}},
-                    {"key": "room_id", "match": {"value": room_id}}
-                ]
-            },
+            scroll_filter=_match_filter(user_id=user_id, room_id=room_id),
             limit=limit,
             with_payload=True,
             with_vectors=False
@@ -110,26 +167,114 @@ class VectorStore:
         messages.sort(key=lambda x: x["timestamp"])
         return messages
     
-    def search_similar(
+    async def get_recent_messages(
+        self,
+        user_id: int,
+        room_id: str,
+        limit: int = 10
+    ) -> List[Dict]:
+        """
+        Odanın en yeni limit mesajı (eskiden yeniye). Qdrant 1.7 scroll'u
+        sıralayamaz (order_by yok), id sırasıyla döner; bu yüzden oda geçmişinin
+        tamamı taranmaz: ts aralık filtresiyle önce son bir saat, yetmezse son
+        gün, sonra MEMORY_REHYDRATE_WINDOW taranır. Toplam taranan nokta
+        MEMORY_REHYDRATE_MAX_SCAN ile sınırlıdır (sınıra takılırsa dönen mesajlar
+        pencerenin en yenileri olmayabilir). Önce sadece timestamp'ler okunur,
+        sonra en yeni noktaların içeriği tek retrieve ile alınır.
+        """
+        
+        await self._ensure_collection()
+        now = time.time()
+        windows = [w for w in REHYDRATE_WINDOWS if w < settings.MEMORY_REHYDRATE_WINDOW]
+        windows.append(settings.MEMORY_REHYDRATE_WINDOW)
+        stamps = []
+        until = None
+        for number, window in enumerate(windows):
+            # Pencereler ayrıktır: her adım sadece bir öncekinin gerisine bakar
+            widest = number == len(windows) - 1
+            found, complete = await self._scan_stamps(
+                user_id, room_id, now - window, until, widest, settings.MEMORY_REHYDRATE_MAX_SCAN - len(stamps)
+            )
+            stamps.extend(found)
+            if len(stamps) >= limit or not complete:
+                break
+            until = now - window
+        
+        newest = sorted(heapq.nlargest(limit, stamps))
+        if not newest:
+            return []
+        points = await self.client.retrieve(
+            collection_name=self.collection_name,
+            ids=[point_id for _, _, point_id in newest],
+            with_payload=["role", "content", "timestamp"],
+            with_vectors=False
+        )
+        by_id = {str(point.id): point.payload for point in points}
+        return [
+            {
+                "role": by_id[point_id]["role"],
+                "content": by_id[point_id]["content"],
+                "timestamp": by_id[point_id]["timestamp"]
+            }
+            for _, _, point_id in newest
+            if point_id in by_id
+        ]
+    
+    async def _scan_stamps(
+        self,
+        user_id: int,
+        room_id: str,
+        since: float,
+        until: Optional[float],
+        include_legacy: bool,
+        max_points: int
+    ) -> Tuple[List[Tuple[str, bool, str]], bool]:
+        """
+        [since, until) aralığındaki noktaların (timestamp, user değil mi, id) üçlüleri
+        ve taramanın bitip bitmediği. include_legacy: ts alanı olmayan eski noktalar da dahil.
+        """
+        recent = [FieldCondition(key="ts", range=Range(gte=since, lt=until))]
+        if include_legacy:
+            recent.append(IsEmptyCondition(is_empty=PayloadField(key="ts")))
+        scroll_filter = _match_filter(user_id=user_id, room_id=room_id)
+        scroll_filter.should = recent
+        
+        stamps = []
+        offset = None
+        while len(stamps) < max_points:
+            points, offset = await self.client.scroll(
+                collection_name=self.collection_name,
+                scroll_filter=scroll_filter,
+                limit=min(256, max_points - len(stamps)),
+                offset=offset,
+                with_payload=["timestamp", "role"],
+                with_vectors=False
+            )
+            # Aynı batch'teki user + assistant mesajları aynı timestamp'i taşır; user önce
+            stamps.extend(
+                (point.payload["timestamp"], point.payload["role"] != "user", str(point.id))
+                for point in points
+            )
+            if offset is None:
+                return stamps, True
+        return stamps, False
+    
+    async def search_similar(
         self,
         user_id: int,
         room_id: str,
         query: str,
         limit: int = 5
     ) -> List[Dict]:
-        """Benzer mesajları ara (RAG için)"""
+        """Benzer mesajları ara (RAG için) - sadece aynı embedder'ın vektörleri karşılaştırılır"""
         
-        query_vector = self._create_embedding(query)
+        await self._ensure_collection()
+        query_vector = (await self.embedder.aembed_one(query)).tolist()
         
-        results = self.client.search(
+        results = await self.client.search(
             collection_name=self.collection_name,
             query_vector=query_vector,
-            query_filter={
-                "must": [
-                    {"key": "user_id", "match": {"value": user_id}},
-                    {"key": "room_id", "match": {"value": room_id}}
-                ]
-            },
+            query_filter=_match_filter(user_id=user_id, room_id=room_id, embedder=self.embedder.name),
             limit=limit
         )
         
@@ -143,17 +288,11 @@ class VectorStore:
             for hit in results
         ]
     
-    def clear_room_history(self, user_id: int, room_id: str):
+    async def clear_room_history(self, user_id: int, room_id: str):
         """Oda geçmişini temizle"""
         
-        self.client.delete(
+        await self._ensure_collection()
+        await self.client.delete(
             collection_name=self.collection_name,
-            points_selector={
-                "filter": {
-                    "must": [
-                        {"key": "user_id", "match": {"value": user_id}},
-                        {"key": "room_id", "match": {"value": room_id}}
-                    ]
-                }
-            }
+            points_selector=FilterSelector(filter=_match_filter(user_id=user_id, room_id=room_id))
         )
\ No newline at end of file
@@ -4,11 +4,21 @@ import sys
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Servisler arası paylaşılan modüller (backend/shared)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from internal.routers import note_router, auth_router
-from internal.database.database import engine, Base
+from internal.database.database import engine, Base, ensure_indexes
+from internal.repository.note_search_repository import init_search_index
+from internal.repository.note_change_repository import init_change_feed
+from internal.repository.note_tag_repository import init_tag_index
+from shared.compression import CompressionMiddleware
 
 Base.metadata.create_all(bind=engine)
+ensure_indexes()
+init_search_index(engine)
+init_change_feed(engine)
+init_tag_index(engine)
 
 app = FastAPI(
     title="Note Service",
@@ -16,6 +26,16 @@ app = FastAPI(
     version="1.0.0"
 )
 
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+    gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+    brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4")),
+    zstd_level=int(os.getenv("COMPRESSION_ZSTD_LEVEL", "3")),
+    # Açılmış request body sınırı (toplu import body'leri büyük olabilir)
+    max_request_size=int(os.getenv("COMPRESSION_MAX_REQUEST_SIZE", str(64 * 1024 * 1024)))
+)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
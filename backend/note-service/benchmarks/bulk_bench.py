@@ -0,0 +1,71 @@
+"""
+Toplu API'ye karşı tek tek işlemler: aynı N not önce tek tek (istek başına
+bir transaction / commit), sonra toplu endpoint'lerin servis fonksiyonlarıyla
+(tek transaction, chunk'lı executemany) oluşturulur, güncellenir, silinir
+
+    python -m benchmarks.bulk_bench [--notes 2000] [--chunk-size 500]
+
+HTTP katmanı ölçülmez; fark transaction / commit ve round trip sayısındandır.
+"""
+import argparse
+
+from benchmarks.common import database_label, reset_schema, timed
+from internal.database.database import SessionLocal
+from internal.schemas.note_schemas import NoteBulkCreate, NoteBulkDelete, NoteBulkUpdate, NoteCreate, NoteUpdate
+from internal.services import note_services
+
+USER_ID = 1
+
+
+def _payload(count: int, prefix: str):
+    return [{"title": f"{prefix} {number}", "content": "içerik " * 50} for number in range(count)]
+
+
+def run(args) -> None:
+    reset_schema()
+    single, bulk = {}, {}
+    db = SessionLocal()
+    try:
+        single["create"], ids = timed(lambda: [
+            note_services.create_note(db, NoteCreate(**note), USER_ID).id
+            for note in _payload(args.notes, "tek")
+        ])
+        single["update"], _ = timed(lambda: [
+            note_services.update_note(db, note_id, NoteUpdate(title=f"güncel {note_id}"), USER_ID)
+            for note_id in ids
+        ])
+        single["delete"], _ = timed(lambda: [note_services.delete_note(db, note_id, USER_ID) for note_id in ids])
+
+        bulk["create"], created = timed(lambda: note_services.bulk_create_notes(
+            db, NoteBulkCreate(notes=_payload(args.notes, "toplu")), USER_ID, args.chunk_size
+        ))
+        ids = [result["id"] for result in created["results"]]
+        bulk["update"], _ = timed(lambda: note_services.bulk_update_notes(
+            db,
+            NoteBulkUpdate(notes=[{"id": note_id, "title": f"güncel {note_id}"} for note_id in ids]),
+            USER_ID,
+            args.chunk_size
+        ))
+        bulk["delete"], _ = timed(lambda: note_services.bulk_delete_notes(
+            db, NoteBulkDelete(ids=ids), USER_ID, args.chunk_size
+        ))
+    finally:
+        db.close()
+
+    print(f"{database_label()}, {args.notes} not, chunk {args.chunk_size}")
+    print(f"{'işlem':>8} {'tek tek not/sn':>16} {'toplu not/sn':>14} {'hızlanma':>9}")
+    for operation in ("create", "update", "delete"):
+        single_rate = args.notes / single[operation]
+        bulk_rate = args.notes / bulk[operation]
+        print(f"{operation:>8} {single_rate:>16.0f} {bulk_rate:>14.0f} {bulk_rate / single_rate:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=2000)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
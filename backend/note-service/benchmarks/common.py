@@ -0,0 +1,69 @@
+"""
+Benchmark ortamı
+Benchmark'lar servis veritabanına dokunmaz: BENCH_DATABASE_URL (verilmezse
+geçici bir SQLite dosyası) DATABASE_URL olarak ayarlanır ve şema her
+çalıştırmada sıfırdan kurulur. Bu modül internal.database'den önce import
+edilmelidir (DATABASE_URL import sırasında okunur).
+"""
+import os
+import sys
+import tempfile
+import time
+from typing import Callable, List, Tuple, TypeVar
+
+T = TypeVar("T")
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [SERVICE_DIR, os.path.join(SERVICE_DIR, "internal")]
+
+os.environ["DATABASE_URL"] = os.getenv("BENCH_DATABASE_URL") or (
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='note-service-bench-'), 'notes.db')}"
+)
+
+
+def reset_schema() -> None:
+    """Tabloları silip api/main.py'deki kurulum adımlarıyla yeniden oluşturur"""
+    from internal.database.database import Base, engine, ensure_indexes
+    from internal.repository.note_search_repository import init_search_index
+    from internal.repository.note_change_repository import init_change_feed
+    from internal.repository.note_tag_repository import init_tag_index
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes()
+    init_search_index(engine)
+    init_change_feed(engine)
+    init_tag_index(engine)
+
+
+def seed_notes(db, user_id: int, count: int, content_words: int = 50, chunk_size: int = 500) -> List[int]:
+    """Toplu INSERT ile örnek notlar (kategori ve etiketler dönüşümlü)"""
+    from internal.repository.note_repository import bulk_create_notes
+
+    notes = [
+        {
+            "title": f"Toplantı notu {number}",
+            "content": " ".join(f"kelime{(number + word) % 997}" for word in range(content_words)),
+            "category": ["iş", "kişisel", "proje"][number % 3],
+            "tags": ["planlama", f"sprint-{number % 12}"]
+        }
+        for number in range(count)
+    ]
+    return bulk_create_notes(db, user_id, notes, chunk_size)
+
+
+def timed(operation: Callable[[], T]) -> Tuple[float, T]:
+    """(geçen saniye, sonuç)"""
+    start = time.perf_counter()
+    result = operation()
+    return time.perf_counter() - start, result
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))] if ordered else 0.0
+
+
+def database_label() -> str:
+    url = os.environ["DATABASE_URL"]
+    return url.split("://", 1)[0] + ("" if url.startswith("sqlite") else " (BENCH_DATABASE_URL)")
@@ -0,0 +1,102 @@
+"""
+Not listesi: ORM + Pydantic ile kolon projeksiyonu + doğrudan JSON karşılaştırması
+
+    python -m benchmarks.list_bench [--notes 1000] [--content-words 12000] [--limits 100,1000]
+
+Büyük content'li (~10 byte / kelime) notlar eklenir, her limit için:
+- ORM + Pydantic: tam Note nesneleri (content dahil) + NoteListResponse JSON'u
+  (eski liste yolu)
+- projeksiyon: liste ETag'i (get_notes_etag) + get_notes_by_user (sadece
+  NOTE_LIST_COLUMNS) + RowJSONResponse; GET /notes'un her istekte yaptığı iş
+ETag sorgusunun tek başına süresi ayrıca raporlanır.
+Süre tracemalloc kapalıyken --repeat ölçümün medyanıdır; bellek ayrı bir
+çalıştırmada tracemalloc tepe değeridir. Her ölçüm yeni session'la yapılır.
+"""
+import argparse
+import statistics
+import tracemalloc
+
+from benchmarks.common import database_label, reset_schema, seed_notes, timed
+from internal.database.database import SessionLocal
+from internal.models.note_models import Note
+from internal.repository.note_repository import get_notes_by_user
+from internal.schemas.note_schemas import NoteListItem, NoteListResponse
+from internal.services.note_services import get_notes_etag
+from internal.utils.json_utils import RowJSONResponse
+
+USER_ID = 1
+
+
+def orm_pydantic(limit: int) -> bytes:
+    db = SessionLocal()
+    try:
+        notes = db.query(Note).filter(Note.user_id == USER_ID).order_by(
+            Note.created_at.desc(), Note.id.desc()
+        ).limit(limit).all()
+        items = [NoteListItem.model_validate(note) for note in notes]
+        return NoteListResponse(items=items).model_dump_json().encode()
+    finally:
+        db.close()
+
+
+def list_etag(limit: int) -> str:
+    db = SessionLocal()
+    try:
+        return get_notes_etag(db, USER_ID, limit=limit)
+    finally:
+        db.close()
+
+
+def projection(limit: int) -> bytes:
+    db = SessionLocal()
+    try:
+        etag = get_notes_etag(db, USER_ID, limit=limit)
+        rows = get_notes_by_user(db, USER_ID, limit=limit)
+        return RowJSONResponse(content={"items": rows, "next_cursor": None}, headers={"ETag": etag}).body
+    finally:
+        db.close()
+
+
+def _peak_mib(operation) -> float:
+    tracemalloc.start()
+    try:
+        operation()
+        return tracemalloc.get_traced_memory()[1] / 2**20
+    finally:
+        tracemalloc.stop()
+
+
+def run(args) -> None:
+    reset_schema()
+    db = SessionLocal()
+    try:
+        seed_notes(db, USER_ID, args.notes, content_words=args.content_words, chunk_size=100)
+    finally:
+        db.close()
+
+    print(f"{database_label()}, {args.notes} not, content ~{args.content_words * 10 // 1024} KB")
+    print(f"{'limit':>6} {'yöntem':<16} {'ms':>9} {'tepe MiB':>9} {'JSON KB':>8}")
+    for limit in args.limits:
+        etag_millis = statistics.median(timed(lambda: list_etag(limit))[0] for _ in range(args.repeat)) * 1000
+        print(f"{limit:>6} {'ETag sorgusu':<16} {etag_millis:>9.2f}")
+        for name, operation in (("ORM + Pydantic", orm_pydantic), ("projeksiyon", projection)):
+            samples = [timed(lambda: operation(limit)) for _ in range(args.repeat)]
+            millis = statistics.median(seconds for seconds, _ in samples) * 1000
+            peak = _peak_mib(lambda: operation(limit))
+            size = len(samples[0][1]) / 1024
+            print(f"{limit:>6} {name:<16} {millis:>9.1f} {peak:>9.1f} {size:>8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=1000)
+    parser.add_argument("--content-words", type=int, default=12000)
+    parser.add_argument("--limits", default="100,1000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    args.limits = [int(value) for value in args.limits.split(",")]
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+DB_MODE=sync ile DB_MODE=async karşılaştırması (HTTP yük testi)
+
+    python -m benchmarks.load_bench [--concurrency 10,50,200] [--requests 2000] [--notes 500]
+
+Aynı veritabanı bir kez doldurulur; her mod için servis ayrı bir uvicorn
+sürecinde başlatılır ve GET /api/v1/notes/{id} istekleri --concurrency kadar
+eşzamanlı gönderilir. İstek/saniye, gecikme yüzdelikleri ve başarısız
+(bağlantı hatası / 2xx dışı) istek sayısı raporlanır. BENCH_MODES ile
+sadece bir mod ölçülebilir (ör. BENCH_MODES=async).
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+
+from benchmarks.common import SERVICE_DIR, database_label, percentile, reset_schema, seed_notes
+from internal.database.database import SessionLocal
+from internal.utils.auth_utils import create_access_token
+
+USER_ID = 1
+MODES = tuple(os.getenv("BENCH_MODES", "sync,async").split(","))
+
+
+def _wait_for_port(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def _start_service(mode: str, port: int) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "api.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVICE_DIR,
+        # Servis modülleri internal/ altındaki paketleri kök seviyeden de import eder
+        env={**os.environ, "DB_MODE": mode, "PYTHONPATH": os.pathsep.join([SERVICE_DIR, os.path.join(SERVICE_DIR, "internal")])}
+    )
+    _wait_for_port(port)
+    return process
+
+
+async def _load(base_url: str, note_ids, concurrency: int, total: int):
+    headers = {"Authorization": f"Bearer {create_access_token({'user_id': USER_ID})}"}
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        headers=headers,
+        limits=httpx.Limits(max_connections=concurrency),
+        timeout=120.0
+    ) as client:
+        (await client.get("/api/v1/notes?limit=1")).raise_for_status()
+
+        async def worker():
+            nonlocal errors
+            for number in counter:
+                start = time.perf_counter()
+                try:
+                    response = await client.get(f"/api/v1/notes/{note_ids[number % len(note_ids)]}")
+                    response.raise_for_status()
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return len(latencies) / elapsed, percentile(latencies, 0.5) * 1000, percentile(latencies, 0.99) * 1000, errors
+
+
+def run(args) -> None:
+    reset_schema()
+    db = SessionLocal()
+    try:
+        note_ids = seed_notes(db, USER_ID, args.notes)
+    finally:
+        db.close()
+
+    print(f"{database_label()}, {args.notes} not, {args.requests} istek / ölçüm")
+    print(f"{'mod':>6} {'eşzamanlı':>10} {'istek/sn':>9} {'p50 ms':>9} {'p99 ms':>9} {'hata':>5}")
+    for mode in MODES:
+        process = _start_service(mode, args.port)
+        try:
+            for concurrency in args.concurrency:
+                rps, p50, p99, errors = asyncio.run(_load(
+                    f"http://127.0.0.1:{args.port}", note_ids, concurrency, args.requests
+                ))
+                print(f"{mode:>6} {concurrency:>10} {rps:>9.0f} {p50:>9.1f} {p99:>9.1f} {errors:>5}")
+        finally:
+            process.terminate()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", default="10,50,200")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--notes", type=int, default=500)
+    parser.add_argument("--port", type=int, default=5055)
+    args = parser.parse_args()
+    args.concurrency = [int(value) for value in args.concurrency.split(",")]
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Tam metin arama (GET /notes/search) ile ilike taraması karşılaştırması
+
+    python -m benchmarks.search_bench [--notes 100000] [--repeat 20]
+
+Tek kullanıcıya --notes kadar not eklenir, her sorgu --repeat kez çalıştırılır:
+- search_notes: FTS5 / tsvector indeksi, sıralama + snippet, ilk 20 sonuç
+- ilike (title): mevcut GET /notes?title= yolu, ilk 20 sonuç
+- ilike (title + content): content'i de arayan ilike; tüm notları tarar
+"""
+import argparse
+
+from sqlalchemy import or_
+
+from benchmarks.common import database_label, percentile, reset_schema, seed_notes, timed
+from internal.database.database import SessionLocal
+from internal.models.note_models import Note
+from internal.repository.note_repository import get_notes_by_user
+from internal.repository.note_search_repository import search_notes
+
+USER_ID = 1
+PAGE = 20
+
+QUERIES = [
+    ("nadir (başlık)", "notu 4242"),
+    ("yaygın kelime", "kelime42"),
+    ("önek", "kelime99"),
+    ("sonuçsuz", "bulunmayan"),
+]
+
+
+def _ilike_title_content(db, query: str):
+    pattern = f"%{query}%"
+    return db.query(Note.id).filter(
+        Note.user_id == USER_ID,
+        or_(Note.title.ilike(pattern), Note.content.ilike(pattern))
+    ).order_by(Note.created_at.desc(), Note.id.desc()).limit(PAGE).all()
+
+
+def _measure(operation, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        seconds, result = timed(operation)
+        samples.append(seconds * 1000)
+    return percentile(samples, 0.5), percentile(samples, 0.99), len(result)
+
+
+def run(args) -> None:
+    reset_schema()
+    db = SessionLocal()
+    try:
+        seconds, _ = timed(lambda: seed_notes(db, USER_ID, args.notes))
+        print(f"{database_label()}, {args.notes} not ({seconds:.1f} sn'de eklendi), {args.repeat} tekrar")
+        print(f"{'sorgu':<16} {'yöntem':<26} {'p50 ms':>9} {'p99 ms':>9} {'sonuç':>6}")
+        for label, query in QUERIES:
+            methods = [
+                ("search_notes", lambda: search_notes(db, USER_ID, query, limit=PAGE)),
+                ("ilike (title)", lambda: get_notes_by_user(db, USER_ID, title_filter=query, limit=PAGE)),
+                ("ilike (title + content)", lambda: _ilike_title_content(db, query)),
+            ]
+            for name, operation in methods:
+                p50, p99, count = _measure(operation, args.repeat)
+                print(f"{label:<16} {name:<26} {p50:>9.2f} {p99:>9.2f} {count:>6}")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
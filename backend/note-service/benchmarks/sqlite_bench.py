@@ -0,0 +1,111 @@
+"""
+SQLite profili (SQLITE_PROFILE=default / performance) altında karışık okuma / yazma
+
+    python -m benchmarks.sqlite_bench [--mixes 0:4,4:2,16:4] [--seconds 5] [--notes 5000]
+
+Her karışım (okuyucu:yazıcı thread sayısı) ve profil için ayrı bir süreç
+yeni bir SQLite dosyasıyla başlar (profil ve havuzlar import sırasında
+kurulur). Okuyucular get_notes_by_user (50 not), yazıcılar create_note
+çağırır; her işlem kendi session'ı ve transaction'ıyla yapılır.
+Saniyedeki işlem, p99 gecikme ve hata (ör. database is locked) sayısı raporlanır.
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+PROFILES = ("default", "performance")
+
+
+def _worker(args) -> None:
+    """Tek profil + karışım ölçümü (alt süreçte çalışır), sonucu tek satır yazar"""
+    from benchmarks.common import percentile, reset_schema, seed_notes
+    from internal.database.database import SessionLocal
+    from internal.repository import note_repository
+
+    reset_schema()
+    db = SessionLocal()
+    try:
+        seed_notes(db, 1, args.notes)
+    finally:
+        db.close()
+
+    readers, writers = (int(value) for value in args.worker.split(":"))
+    stop = time.monotonic() + args.seconds
+    latencies = {"read": [], "write": []}
+    errors = [0]
+    lock = threading.Lock()
+
+    def loop(kind, operation):
+        while time.monotonic() < stop:
+            db = SessionLocal()
+            start = time.perf_counter()
+            try:
+                operation(db)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                continue
+            finally:
+                db.close()
+            with lock:
+                latencies[kind].append(time.perf_counter() - start)
+
+    threads = [
+        threading.Thread(target=loop, args=("read", lambda db: note_repository.get_notes_by_user(db, 1, limit=50)))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=loop, args=("write", lambda db: note_repository.create_note(db, "yeni", "içerik " * 50, 1)))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reads, writes = latencies["read"], latencies["write"]
+    print(
+        f"{len(reads) / args.seconds:.0f} {percentile(reads, 0.99) * 1000:.1f} "
+        f"{len(writes) / args.seconds:.0f} {percentile(writes, 0.99) * 1000:.1f} {errors[0]}"
+    )
+
+
+def run(args) -> None:
+    if not os.getenv("BENCH_DATABASE_URL", "sqlite").startswith("sqlite"):
+        sys.exit("sqlite_bench sadece SQLite için anlamlıdır (BENCH_DATABASE_URL'i kaldırın)")
+
+    print(f"{args.seconds} sn / ölçüm, {args.notes} not")
+    print(f"{'okuyucu:yazıcı':>14} {'profil':>12} {'okuma/sn':>9} {'p99 ms':>8} {'yazma/sn':>9} {'p99 ms':>8} {'hata':>5}")
+    for mix in args.mixes.split(","):
+        for profile in PROFILES:
+            output = subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.sqlite_bench",
+                    "--worker", mix, "--seconds", str(args.seconds), "--notes", str(args.notes)
+                ],
+                env={**os.environ, "SQLITE_PROFILE": profile},
+                capture_output=True,
+                text=True,
+                check=True
+            ).stdout.split()
+            reads, read_p99, writes, write_p99, errors = output[-5:]
+            print(f"{mix:>14} {profile:>12} {reads:>9} {read_p99:>8} {writes:>9} {write_p99:>8} {errors:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mixes", default="0:4,4:2,16:4")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--notes", type=int, default=5000)
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.worker:
+        _worker(args)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
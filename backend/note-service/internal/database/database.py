@@ -1,20 +1,197 @@
+import os
+import random
+from functools import partial
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.sql.elements import TextClause
+from starlette.concurrency import run_in_threadpool
+
+from internal.database.sqlite_profile import apply_profile, reader_pool_args, writer_pool_args
+from internal.database import postgres_profile
+
+# SQLite - PostgreSQL olmadan çalışır; PostgreSQL URL'leri psycopg (3) driver'ına çevrilir
+DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./notes.db")
+
+# "sync" (varsayılan): blocking Session, istekler threadpool'da çalışır
+# "async" (opt-in): AsyncSession (aiosqlite / asyncpg), istekler event loop'ta bekler.
+# SQLite'ta async daha yavaştır: benchmarks/load_bench.py ile 50 ve 200 eşzamanlı
+# istekte sync'in yaklaşık yarısı istek/sn ve iki katı p99 ölçüldü (her sorgu event
+# loop ile aiosqlite thread'i arasında gidip gelir). Async sadece asyncpg ile ağ
+# üzerindeki bir PostgreSQL'e karşı ölçülüp daha iyi çıkarsa açılmalıdır.
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# Sync URL -> async driver'lı URL
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg"
+}
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+
+def to_async_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+# text() ile yazılan ham SQL'de is_dml her zaman False'tur; ilk kelimeye bakılır.
+# Şüpheli durumda (WITH ... UPDATE) yazma sayılır: okumanın primary'ye gitmesi
+# sadece yavaştır, yazmanın okuyucuya gitmesi hatadır.
+_TEXT_WRITE_KEYWORDS = {
+    "INSERT", "UPDATE", "DELETE", "REPLACE", "MERGE", "WITH",
+    "CREATE", "DROP", "ALTER", "TRUNCATE", "COPY"
+}
+
+
+def is_write_statement(clause) -> bool:
+    """Core / ORM DML (executemany dahil) is_dml ile, text() ilk kelimesiyle ayırt edilir"""
+    if clause is None:
+        return False
+    if getattr(clause, "is_dml", False):
+        return True
+    if isinstance(clause, TextClause):
+        words = clause.text.lstrip(" \t\r\n(").split(None, 1)
+        return bool(words) and words[0].upper() in _TEXT_WRITE_KEYWORDS
+    return False
+
 
-# SQLite - PostgreSQL olmadan çalışır
-DATABASE_URL = "sqlite:///./notes.db"
+class RoutingSession(Session):
+    """
+    Yazmalar (flush, INSERT / UPDATE / DELETE, text() DML) writer engine'e,
+    okumalar okuyucuya gider. writer verilmezse yazmalar session'ın bind'ine
+    (primary) gider.
+    - SQLite: bind okuyucu havuzu, writer tek bağlantılı yazıcı
+    - PostgreSQL: bind primary; readers verilirse (replikalar) session başına biri
+      seçilir ve okumalar ona gider
+    Session bir kez yazdıktan sonraki tüm okumalar ve bind_arguments={"primary": True}
+    ile yapılan okumalar (ör. yazmaya karar veren sahiplik kontrolü) yazmalarla
+    aynı bağlantıya gider: read-your-writes, ne replika gecikmesi ne de başka
+    bağlantıdan commit edilmemiş veri görünür.
+    """
+
+    def __init__(self, *args, writer=None, readers=(), **kwargs):
+        super().__init__(*args, **kwargs)
+        self.writer = writer
+        self.reader = random.choice(readers) if readers else None
+        self._wrote = False
+
+    def get_bind(self, mapper=None, clause=None, primary=False, **kwargs):
+        if self._flushing or is_write_statement(clause):
+            self._wrote = True
+        if self._wrote or primary:
+            if self.writer is not None:
+                return self.writer
+        elif self.reader is not None:
+            return self.reader
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+if IS_SQLITE:
+    # Okuyucu havuzu + tek bağlantılı yazıcı, PRAGMA profili her bağlantıda
+    _connect_args = {"check_same_thread": False}
+    engine = create_engine(DATABASE_URL, connect_args=_connect_args, **reader_pool_args())
+    writer_engine = create_engine(DATABASE_URL, connect_args=_connect_args, **writer_pool_args())
+    apply_profile(engine)
+    apply_profile(writer_engine)
+    reader_engines = ()
+else:
+    # Primary hem yazar hem (replika yoksa) okur; replikalar sadece okur
+    DATABASE_URL = postgres_profile.to_sync_url(DATABASE_URL)
+    engine = create_engine(
+        DATABASE_URL, connect_args=postgres_profile.connect_args(), **postgres_profile.pool_args()
+    )
+    writer_engine = None
+    reader_engines = tuple(
+        create_engine(
+            postgres_profile.to_sync_url(url),
+            connect_args=postgres_profile.connect_args(),
+            **postgres_profile.pool_args()
+        )
+        for url in postgres_profile.REPLICA_URLS
+    )
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 SessionLocal = sessionmaker(
+    class_=RoutingSession,
     autocommit=False,
     autoflush=False,
-    bind=engine
+    bind=engine,
+    writer=writer_engine,
+    readers=reader_engines
 )
 Base = declarative_base()
 
-def get_db():
+# Async mod: tablo / index oluşturma yine sync engine ile yapılır.
+# aiosqlite varsayılan olarak NullPool kullanır (her oturumda yeni bağlantı + thread);
+# bağlantılar havuzda tutulur.
+async_engine = None
+async_writer_engine = None
+async_reader_engines = ()
+if DB_MODE == "async":
+    if IS_SQLITE:
+        async_engine = create_async_engine(
+            to_async_url(DATABASE_URL), poolclass=AsyncAdaptedQueuePool, **reader_pool_args()
+        )
+        async_writer_engine = create_async_engine(
+            to_async_url(DATABASE_URL), poolclass=AsyncAdaptedQueuePool, **writer_pool_args()
+        )
+        apply_profile(async_engine.sync_engine)
+        apply_profile(async_writer_engine.sync_engine)
+    else:
+        async_engine = create_async_engine(
+            to_async_url(DATABASE_URL),
+            connect_args=postgres_profile.async_connect_args(),
+            **postgres_profile.pool_args()
+        )
+        async_reader_engines = tuple(
+            create_async_engine(
+                to_async_url(url),
+                connect_args=postgres_profile.async_connect_args(),
+                **postgres_profile.pool_args()
+            )
+            for url in postgres_profile.REPLICA_URLS
+        )
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    sync_session_class=RoutingSession,
+    writer=async_writer_engine.sync_engine if async_writer_engine is not None else None,
+    readers=tuple(reader.sync_engine for reader in async_reader_engines),
+    autoflush=False,
+    expire_on_commit=False  # commit sonrası lazy load (MissingGreenlet) olmasın
+)
+
+def ensure_indexes():
+    """Tablo zaten varsa create_all yeni index'leri eklemez; eksik olanları oluşturur"""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+def _get_sync_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def _get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+get_db = _get_async_db if DB_MODE == "async" else _get_sync_db
+
+async def run_db(db, fn, **kwargs):
+    """
+    Sync repository / handler fonksiyonunu DB_MODE'a göre bloklamadan çalıştırır.
+    - sync: threadpool'da (FastAPI'nin def endpoint'leri için yaptığı gibi)
+    - async: AsyncSession.run_sync ile event loop'ta; sorgular async driver'a gider,
+      thread tutulmaz
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: fn(db=session, **kwargs))
+    return await run_in_threadpool(partial(fn, db=db, **kwargs))
@@ -0,0 +1,57 @@
+"""
+PostgreSQL profili
+- Bağlantı havuzu env ile ayarlanır (pool_size / max_overflow / pool_pre_ping / recycle)
+- Server-side prepared statement: psycopg (3) prepare_threshold kez çalışan sorguyu
+  sunucuda hazırlar, asyncpg hazırlanmış statement'ları bağlantı başına cache'ler
+- DATABASE_REPLICA_URLS verilirse okumalar replikalara, yazmalar primary'ye gider
+postgresql:// ve postgresql+psycopg2:// URL'leri psycopg (3) driver'ına çevrilir.
+"""
+import os
+from typing import Dict, List
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # sn; -1: kapalı
+POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+# psycopg: aynı sorgu bu kadar çalıştıktan sonra sunucuda PREPARE edilir (0: hemen)
+PREPARE_THRESHOLD = int(os.getenv("DB_PREPARE_THRESHOLD", "5"))
+# asyncpg: bağlantı başına cache'lenen prepared statement sayısı (0: kapalı, PgBouncer için)
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+# Virgülle ayrılmış replika URL'leri (boşsa tüm sorgular primary'ye gider)
+REPLICA_URLS: List[str] = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+SYNC_DRIVERS = {
+    "postgres": "postgresql+psycopg",
+    "postgresql": "postgresql+psycopg",
+    "postgresql+psycopg2": "postgresql+psycopg"
+}
+
+
+def to_sync_url(url: str) -> str:
+    scheme, rest = url.split("://", 1)
+    return f"{SYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def pool_args() -> Dict:
+    return {
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT,
+        "pool_recycle": POOL_RECYCLE,
+        "pool_pre_ping": POOL_PRE_PING
+    }
+
+
+def connect_args() -> Dict:
+    """psycopg bağlantı argümanları"""
+    return {"prepare_threshold": PREPARE_THRESHOLD}
+
+
+def async_connect_args() -> Dict:
+    """asyncpg bağlantı argümanları"""
+    return {"prepared_statement_cache_size": STATEMENT_CACHE_SIZE}
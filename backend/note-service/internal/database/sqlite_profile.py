@@ -0,0 +1,60 @@
+"""
+SQLite performans profili
+- Her yeni bağlantıda PRAGMA'lar uygulanır: WAL (okuyucular yazıcıyı beklemez),
+  synchronous=NORMAL (WAL'da her commit'te fsync yok), mmap, page cache,
+  geçici tablolar bellekte, kilitli veritabanında busy_timeout kadar bekleme
+- Okumalar çok bağlantılı bir havuzdan, yazmalar tek bağlantılı writer
+  engine'den yapılır (SQLite aynı anda tek yazıcıya izin verir)
+SQLITE_PROFILE=default ile PRAGMA'lar uygulanmaz (SQLite varsayılanları).
+"""
+import os
+from typing import Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance")
+
+PERFORMANCE_PRAGMAS: Dict[str, object] = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-65536")),  # negatif: KiB (64 MiB)
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT", "5000"))  # ms
+}
+
+# Okuyucu havuzu eşzamanlı okumalar için; toplamı (size + overflow) threadpool'un
+# 40 thread'ini karşılar ki yazıcılar commit sonrası okuma için bağlantı beklemesin.
+# Yazıcı havuzu tek bağlantıdır, yazmalar SQLite kilidinde değil havuz kuyruğunda sıraya girer
+READ_POOL_SIZE = int(os.getenv("SQLITE_READ_POOL_SIZE", "16"))
+READ_MAX_OVERFLOW = int(os.getenv("SQLITE_READ_MAX_OVERFLOW", "24"))
+WRITE_POOL_TIMEOUT = float(os.getenv("SQLITE_WRITE_POOL_TIMEOUT", "30"))
+
+
+def profile_pragmas() -> Dict[str, object]:
+    return PERFORMANCE_PRAGMAS if SQLITE_PROFILE == "performance" else {}
+
+
+def reader_pool_args() -> Dict:
+    return {"pool_size": READ_POOL_SIZE, "max_overflow": READ_MAX_OVERFLOW}
+
+
+def writer_pool_args() -> Dict:
+    return {"pool_size": 1, "max_overflow": 0, "pool_timeout": WRITE_POOL_TIMEOUT}
+
+
+def apply_profile(engine: Engine) -> None:
+    """Engine'in açtığı her DBAPI bağlantısına profil PRAGMA'larını uygular"""
+    pragmas = profile_pragmas()
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
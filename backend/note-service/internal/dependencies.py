@@ -2,19 +2,37 @@
 Authentication dependencies
 JWT Token'dan user bilgilerini alır ve doğrular
 """
-from fastapi import HTTPException, status, Depends
+from fastapi import HTTPException, Request, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
-from internal.utils.auth_utils import verify_token
+from internal.utils.auth_utils import verify_token, get_trusted_user
 
-security = HTTPBearer()
+security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+def _require_credentials(
+    credentials: Optional[HTTPAuthorizationCredentials]
+) -> HTTPAuthorizationCredentials:
+    """Gateway header'ı yoksa Bearer token zorunludur"""
+    if credentials is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return credentials
+
+
+async def get_current_user(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> dict:
-    """JWT token'dan current user bilgilerini alır"""
-    token = credentials.credentials
+    """Gateway kimlik header'larından ya da JWT token'dan current user bilgilerini alır"""
+    trusted_user = get_trusted_user(request)
+    if trusted_user:
+        return trusted_user
+    
+    token = _require_credentials(credentials).credentials
     payload = verify_token(token)
     
     user_id = payload.get("user_id")
@@ -32,11 +50,16 @@ def get_current_user(
     }
 
 
-def get_current_user_id(
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+async def get_current_user_id(
+    request: Request,
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)
 ) -> int:
     """Sadece user_id döndürür"""
-    token = credentials.credentials
+    trusted_user = get_trusted_user(request)
+    if trusted_user:
+        return trusted_user["user_id"]
+    
+    token = _require_credentials(credentials).credentials
     payload = verify_token(token)
     
     user_id = payload.get("user_id")
@@ -1,14 +1,27 @@
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
-from internal.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
+from internal.schemas.note_schemas import (
+    NoteCreate, NoteUpdate, NoteResponse, NoteListResponse, NoteSearchResult,
+    NoteBulkCreate, NoteBulkUpdate, NoteBulkDelete, BulkResponse, NoteImportResponse,
+    NoteChangesResponse, NoteFacetsResponse
+)
 from internal.services.note_services import (
     create_note as service_create_note,
     get_all_notes as service_get_all_notes,
+    search_notes as service_search_notes,
+    get_note_changes as service_get_note_changes,
+    get_note_facets as service_get_note_facets,
     get_note_by_id as service_get_note_by_id,
+    get_notes_etag as service_get_notes_etag,
+    get_note_with_etag as service_get_note_with_etag,
     update_note as service_update_note,
-    delete_note as service_delete_note
+    delete_note as service_delete_note,
+    bulk_create_notes as service_bulk_create_notes,
+    import_notes as service_import_notes,
+    bulk_update_notes as service_bulk_update_notes,
+    bulk_delete_notes as service_bulk_delete_notes
 )
 
 
@@ -39,22 +52,127 @@ class NoteHandler:
     def get_notes(
         user_id: int,
         db: Session,
-        title: Optional[str] = None
-    ) -> List[NoteListResponse]:
-        """Kullanıcının notlarını listeler"""
+        title: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> NoteListResponse:
+        """Kullanıcının notlarını sayfalı listeler"""
         try:
             notes = service_get_all_notes(
                 db=db,
                 user_id=user_id,
-                title_filter=title
+                title_filter=title,
+                limit=limit,
+                cursor=cursor,
+                tag=tag,
+                category=category
             )
             return notes
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Notlar getirilirken hata: {str(e)}"
             )
     
+    @staticmethod
+    def get_note_facets(
+        user_id: int,
+        db: Session,
+        limit: int = 50
+    ) -> NoteFacetsResponse:
+        """Etiket ve kategori bazında not sayılarını getirir"""
+        try:
+            return service_get_note_facets(db=db, user_id=user_id, limit=limit)
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Facet'ler getirilirken hata: {str(e)}"
+            )
+    
+    @staticmethod
+    def get_note_changes(
+        user_id: int,
+        db: Session,
+        since: Optional[str] = None,
+        limit: int = 100
+    ) -> NoteChangesResponse:
+        """since cursor'ından sonraki not değişikliklerini getirir (delta sync)"""
+        try:
+            return service_get_note_changes(
+                db=db,
+                user_id=user_id,
+                since=since,
+                limit=limit
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Değişiklikler getirilirken hata: {str(e)}"
+            )
+    
+    @staticmethod
+    def search_notes(
+        user_id: int,
+        db: Session,
+        query: str,
+        limit: int = 20,
+        offset: int = 0
+    ) -> List[NoteSearchResult]:
+        """Notlarda full-text arama yapar"""
+        try:
+            return service_search_notes(
+                db=db,
+                user_id=user_id,
+                query=query,
+                limit=limit,
+                offset=offset
+            )
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Arama yapılırken hata: {str(e)}"
+            )
+    
+    @staticmethod
+    def get_notes_etag(
+        user_id: int,
+        db: Session,
+        title: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> str:
+        """Not listesi sayfasının ETag'ini döndürür"""
+        return service_get_notes_etag(
+            db=db,
+            user_id=user_id,
+            title_filter=title,
+            limit=limit,
+            cursor=cursor,
+            tag=tag,
+            category=category
+        )
+    
+    @staticmethod
+    def get_note_with_etag(
+        note_id: int,
+        user_id: int,
+        db: Session
+    ) -> Tuple[NoteResponse, str]:
+        """Notu ve ETag'ini tek sorguda döndürür"""
+        return service_get_note_with_etag(
+            db=db,
+            note_id=note_id,
+            user_id=user_id
+        )
+    
     @staticmethod
     def get_note(
         note_id: int,
@@ -81,18 +199,7 @@ class NoteHandler:
         user_id: int,
         db: Session
     ) -> NoteResponse:
-        """Notu günceller"""
-        note = service_get_note_by_id(
-            db=db,
-            note_id=note_id,
-            user_id=user_id
-        )
-        if not note:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Not bulunamadı"
-            )
-        
+        """Notu günceller (sahiplik kontrolü güncelleme sorgusunun içinde)"""
         try:
             updated_note = service_update_note(
                 db=db,
@@ -101,6 +208,8 @@ class NoteHandler:
                 user_id=user_id
             )
             return updated_note
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -113,26 +222,109 @@ class NoteHandler:
         user_id: int,
         db: Session
     ) -> None:
-        """Notu siler"""
-        note = service_get_note_by_id(
-            db=db,
-            note_id=note_id,
-            user_id=user_id
-        )
-        if not note:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Not bulunamadı"
-            )
-        
+        """Notu siler (sahiplik kontrolü silme sorgusunun içinde)"""
         try:
             service_delete_note(
                 db=db,
                 note_id=note_id,
                 user_id=user_id
             )
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Not silinirken hata: {str(e)}"
-            )
\ No newline at end of file
+            )
+    
+    @staticmethod
+    def bulk_create_notes(
+        notes_data: NoteBulkCreate,
+        user_id: int,
+        db: Session,
+        chunk_size: Optional[int] = None
+    ) -> BulkResponse:
+        """Notları toplu oluşturur (tek transaction)"""
+        try:
+            return service_bulk_create_notes(
+                db=db,
+                notes_data=notes_data,
+                user_id=user_id,
+                chunk_size=chunk_size
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Notlar toplu oluşturulurken hata: {str(e)}"
+            )
+    
+    @staticmethod
+    def import_notes(
+        notes_data: NoteBulkCreate,
+        user_id: int,
+        db: Session,
+        chunk_size: Optional[int] = None
+    ) -> NoteImportResponse:
+        """Notları toplu import eder (PostgreSQL'de COPY)"""
+        try:
+            return service_import_notes(
+                db=db,
+                notes_data=notes_data,
+                user_id=user_id,
+                chunk_size=chunk_size
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Notlar import edilirken hata: {str(e)}"
+            )
+    
+    @staticmethod
+    def bulk_update_notes(
+        notes_data: NoteBulkUpdate,
+        user_id: int,
+        db: Session,
+        chunk_size: Optional[int] = None
+    ) -> BulkResponse:
+        """Notları toplu günceller (tek transaction)"""
+        try:
+            return service_bulk_update_notes(
+                db=db,
+                notes_data=notes_data,
+                user_id=user_id,
+                chunk_size=chunk_size
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Notlar toplu güncellenirken hata: {str(e)}"
+            )
+    
+    @staticmethod
+    def bulk_delete_notes(
+        notes_data: NoteBulkDelete,
+        user_id: int,
+        db: Session,
+        chunk_size: Optional[int] = None
+    ) -> BulkResponse:
+        """Notları toplu siler (tek transaction)"""
+        try:
+            return service_bulk_delete_notes(
+                db=db,
+                notes_data=notes_data,
+                user_id=user_id,
+                chunk_size=chunk_size
+            )
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Notlar toplu silinirken hata: {str(e)}"
+            )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime
+from sqlalchemy import BigInteger, Boolean, Column, ForeignKey, Integer, String, Text, DateTime, Index
 from sqlalchemy.sql import func
 from internal.database.database import Base
 
@@ -11,6 +11,53 @@ class Note(Base):
     content = Column(Text, nullable=False)
     category = Column(String(100))
     summary = Column(Text)
-    tags = Column(String)  # ARRAY yerine String (JSON olarak saklanabilir)
+    tags = Column(String)  # JSON dizi (ör. ["a", "b"]); sorgular note_tags üzerinden
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        # Keyset pagination: WHERE user_id = ? AND (created_at, id) < (?, ?) ORDER BY created_at DESC, id DESC
+        Index("ix_notes_user_created_id", user_id, created_at.desc(), id.desc()),
+        # ?category= filtresi ve kategori facet sayımı
+        Index("ix_notes_user_category", user_id, category),
+    )
+
+
+class NoteChange(Base):
+    """
+    Notun son değişikliği (delta sync): not + kullanıcı başına tek satır.
+    seq her yazmada artan global sıra numarasıdır; silinen notlar deleted=True
+    olarak kalır (tombstone). Satırlar trigger'larla tutulur (note_change_repository).
+    Anahtarda user_id de var: SQLite silinen en büyük id'yi yeniden kullanır,
+    başka kullanıcının yeni notu ilk kullanıcının tombstone'unu ezmemeli.
+    """
+    __tablename__ = "note_changes"
+    
+    note_id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, primary_key=True, autoincrement=False)
+    seq = Column(BigInteger, nullable=False)
+    deleted = Column(Boolean, nullable=False, default=False)
+    
+    __table_args__ = (
+        # WHERE user_id = ? AND seq > ? ORDER BY seq
+        Index("ix_note_changes_user_seq", user_id, seq),
+    )
+
+
+class NoteTag(Base):
+    """
+    Not - etiket ilişkisi (notes.tags'in normalize hali), trigger'larla tutulur
+    (note_tag_repository). user_id ve created_at (değişmez) notes'tan kopyalanır:
+    etiket filtreli liste sayfası notes'u taramadan bu index'ten okunur.
+    """
+    __tablename__ = "note_tags"
+    
+    note_id = Column(Integer, ForeignKey("notes.id", ondelete="CASCADE"), primary_key=True)
+    tag = Column(String(50), primary_key=True)
+    user_id = Column(Integer, nullable=False)
+    created_at = Column(DateTime)
+    
+    __table_args__ = (
+        # WHERE user_id = ? AND tag = ? ORDER BY created_at DESC, note_id DESC / GROUP BY tag
+        Index("ix_note_tags_user_tag", user_id, tag, created_at.desc(), note_id.desc()),
+    )
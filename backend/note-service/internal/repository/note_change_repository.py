@@ -0,0 +1,213 @@
+"""
+Not değişiklik akışı (delta sync)
+note_changes tablosunda not başına son değişikliğin sıra numarası (seq) tutulur;
+istemci son gördüğü seq'ten sonrasını ister, maliyet not sayısına değil
+değişiklik sayısına bağlıdır. Silinen notlar tombstone (deleted) olarak kalır.
+Satırlar notes üzerindeki trigger'larla yazılır; ORM, toplu işlemler, RETURNING
+ve COPY yolları aynı transaction içinde akışa düşer.
+Satırlar (note_id, user_id) ile anahtarlanır: SQLite'ta silinen notun id'si
+başka kullanıcının yeni notuna verilebilir, tombstone yine de kaybolmaz.
+- SQLite: seq tek satırlık sayaç tablosundan (yazmalar zaten tek yazıcıda sıralı)
+- PostgreSQL: seq bir SEQUENCE'ten; kullanıcı başına transaction advisory lock
+  ile seq'ler commit sırasında verilir (geç commit eden küçük seq atlanmaz)
+"""
+from typing import List, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from internal.models.note_models import Note, NoteChange
+
+_SQLITE_UPSERT = """
+    UPDATE note_change_counter SET value = value + 1 WHERE id = 1;
+    INSERT INTO note_changes (note_id, user_id, seq, deleted)
+    VALUES ({row}.id, {row}.user_id, (SELECT value FROM note_change_counter WHERE id = 1), {deleted})
+    ON CONFLICT(note_id, user_id) DO UPDATE SET
+        seq = excluded.seq, deleted = excluded.deleted;
+"""
+
+_SQLITE_SETUP = [
+    "CREATE TABLE IF NOT EXISTS note_change_counter (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO note_change_counter (id, value) VALUES (1, 0)",
+    "CREATE TRIGGER IF NOT EXISTS notes_changes_ai AFTER INSERT ON notes BEGIN"
+    + _SQLITE_UPSERT.format(row="new", deleted=0) + "END",
+    "CREATE TRIGGER IF NOT EXISTS notes_changes_au AFTER UPDATE ON notes BEGIN"
+    + _SQLITE_UPSERT.format(row="new", deleted=0) + "END",
+    "CREATE TRIGGER IF NOT EXISTS notes_changes_ad AFTER DELETE ON notes BEGIN"
+    + _SQLITE_UPSERT.format(row="old", deleted=1) + "END"
+]
+
+# Mevcut notlar akışa eklenir (id sırasıyla, sayaçtan sonra)
+_SQLITE_BACKFILL = [
+    """
+    INSERT OR REPLACE INTO note_changes (note_id, user_id, seq, deleted)
+    SELECT id, user_id, (SELECT value FROM note_change_counter WHERE id = 1) + row_number() OVER (ORDER BY id), 0
+    FROM notes
+    """,
+    "UPDATE note_change_counter SET value = (SELECT coalesce(max(seq), value) FROM note_changes) WHERE id = 1"
+]
+
+# pg_advisory_xact_lock(sınıf, anahtar): sınıf sabiti başka advisory lock'larla çakışmasın diye
+_POSTGRES_SETUP = [
+    "CREATE SEQUENCE IF NOT EXISTS note_change_seq",
+    """
+    CREATE OR REPLACE FUNCTION notes_track_change() RETURNS trigger AS $$
+    DECLARE
+        changed_id integer;
+        changed_user integer;
+    BEGIN
+        IF TG_OP = 'DELETE' THEN
+            changed_id := OLD.id;
+            changed_user := OLD.user_id;
+        ELSE
+            changed_id := NEW.id;
+            changed_user := NEW.user_id;
+        END IF;
+        PERFORM pg_advisory_xact_lock(7301, changed_user);
+        INSERT INTO note_changes (note_id, user_id, seq, deleted)
+        VALUES (changed_id, changed_user, nextval('note_change_seq'), TG_OP = 'DELETE')
+        ON CONFLICT (note_id, user_id) DO UPDATE SET
+            seq = EXCLUDED.seq, deleted = EXCLUDED.deleted;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    # CREATE OR REPLACE TRIGGER PostgreSQL 14+; compose'daki 13 için drop + create
+    "DROP TRIGGER IF EXISTS notes_track_change ON notes",
+    """
+    CREATE TRIGGER notes_track_change AFTER INSERT OR UPDATE OR DELETE ON notes
+    FOR EACH ROW EXECUTE FUNCTION notes_track_change()
+    """
+]
+
+_POSTGRES_BACKFILL = [
+    """
+    INSERT INTO note_changes (note_id, user_id, seq, deleted)
+    SELECT id, user_id, nextval('note_change_seq'), false FROM notes ORDER BY id
+    ON CONFLICT (note_id, user_id) DO UPDATE SET
+        seq = EXCLUDED.seq, deleted = EXCLUDED.deleted
+    """
+]
+
+# Eski şema: note_changes sadece note_id ile anahtarlı. Mevcut satırlar (seq'ler ve
+# tombstone'lar) korunarak (note_id, user_id) anahtarına taşınır.
+_POSTGRES_MIGRATE_KEY = [
+    "ALTER TABLE note_changes DROP CONSTRAINT note_changes_pkey",
+    "ALTER TABLE note_changes ADD PRIMARY KEY (note_id, user_id)"
+]
+
+# SQLite'ta birincil anahtar değiştirilemez: tablo yeniden oluşturulup kopyalanır.
+# Eski trigger'lar tabloyla birlikte yeniden adlandırılmasın diye önce silinir.
+_SQLITE_MIGRATE_KEY_BEFORE = [
+    "DROP TRIGGER IF EXISTS notes_changes_ai",
+    "DROP TRIGGER IF EXISTS notes_changes_au",
+    "DROP TRIGGER IF EXISTS notes_changes_ad",
+    "DROP INDEX IF EXISTS ix_note_changes_user_seq",
+    "ALTER TABLE note_changes RENAME TO note_changes_legacy"
+]
+_SQLITE_MIGRATE_KEY_AFTER = [
+    """
+    INSERT INTO note_changes (note_id, user_id, seq, deleted)
+    SELECT note_id, user_id, seq, deleted FROM note_changes_legacy
+    """,
+    "DROP TABLE note_changes_legacy"
+]
+
+
+def _has_legacy_key(conn, dialect: str) -> bool:
+    """note_changes birincil anahtarı tek kolonsa (note_id) eski şemadır"""
+    if dialect == "postgresql":
+        pk_columns = conn.execute(text(
+            """
+            SELECT count(*) FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+            WHERE i.indrelid = 'note_changes'::regclass AND i.indisprimary
+            """
+        )).scalar()
+    else:
+        pk_columns = conn.execute(
+            text("SELECT count(*) FROM pragma_table_info('note_changes') WHERE pk > 0")
+        ).scalar()
+    return pk_columns == 1
+
+
+def _migrate_legacy_key(conn, dialect: str) -> None:
+    if dialect == "postgresql":
+        for statement in _POSTGRES_MIGRATE_KEY:
+            conn.execute(text(statement))
+        return
+    for statement in _SQLITE_MIGRATE_KEY_BEFORE:
+        conn.execute(text(statement))
+    NoteChange.__table__.create(conn)
+    for statement in _SQLITE_MIGRATE_KEY_AFTER:
+        conn.execute(text(statement))
+
+
+def init_change_feed(engine: Engine) -> None:
+    """
+    Değişiklik trigger'larını (yoksa) kurar; ilk kurulumda mevcut notlar akışa eklenir.
+    Eski (sadece note_id anahtarlı) tablo satırları korunarak taşınır.
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            maintained = conn.execute(
+                text("SELECT 1 FROM pg_trigger WHERE tgname = 'notes_track_change'")
+            ).first()
+            setup, backfill = _POSTGRES_SETUP, _POSTGRES_BACKFILL
+        else:
+            # Trigger yoksa akış tutulmamıştır (ilk kurulum / tablo yeniden oluşturuldu)
+            maintained = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'notes_changes_ai'")
+            ).first()
+            setup, backfill = _SQLITE_SETUP, _SQLITE_BACKFILL
+
+        # Taşıma trigger'ları yeniden kurdurur; maintained önceden okunduğu için
+        # mevcut seq'ler geçerli kalır, backfill tekrar çalışmaz
+        if _has_legacy_key(conn, engine.dialect.name):
+            _migrate_legacy_key(conn, engine.dialect.name)
+        for statement in setup:
+            conn.execute(text(statement))
+        if not maintained:
+            for statement in backfill:
+                conn.execute(text(statement))
+
+
+def get_change_version(db: Session, user_id: int) -> int:
+    """
+    Kullanıcının notlarındaki son değişikliğin seq'i (hiç yoksa 0). Her oluşturma,
+    güncelleme ve silme bu değeri büyütür; ix_note_changes_user_seq üzerinden
+    tek index okumasıdır (not sayısından bağımsız).
+    """
+    return db.execute(
+        select(func.coalesce(func.max(NoteChange.seq), 0)).where(NoteChange.user_id == user_id)
+    ).scalar()
+
+
+def get_changes_since(
+    db: Session,
+    user_id: int,
+    since: int,
+    limit: int
+) -> List[Tuple]:
+    """
+    seq > since olan değişiklikler seq sırasıyla: (seq, note_id, deleted, note | None).
+    Not satırı silinmişse (tombstone) note None döner; seçilen not kolonları
+    ORM nesnesi oluşturmadan dict olarak döner.
+    """
+    rows = db.execute(
+        select(NoteChange.seq, NoteChange.note_id, NoteChange.deleted, *Note.__table__.columns)
+        .select_from(NoteChange)
+        # id yeniden kullanıldıysa not artık başka kullanıcınındır: eşleşmez, tombstone kalır
+        .outerjoin(Note, (Note.id == NoteChange.note_id) & (Note.user_id == NoteChange.user_id))
+        .where(NoteChange.user_id == user_id, NoteChange.seq > since)
+        .order_by(NoteChange.seq)
+        .limit(limit)
+    )
+    changes = []
+    for row in rows:
+        values = row._asdict()
+        seq, note_id, deleted = values.pop("seq"), values.pop("note_id"), values.pop("deleted")
+        note = None if deleted or values["id"] is None else values
+        changes.append((seq, note_id, deleted or note is None, note))
+    return changes
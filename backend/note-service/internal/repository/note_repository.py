@@ -1,22 +1,46 @@
+from sqlalchemy import bindparam, delete, insert, select, text, tuple_, update
 from sqlalchemy.orm import Session
-from internal.models.note_models import Note
+from sqlalchemy.util import await_only
+from internal.models.note_models import Note, NoteTag
 from internal.schemas.note_schemas import NoteUpdate
-from typing import Optional, List
+from internal.utils.tag_utils import serialize_tags
+from typing import Dict, Iterable, Iterator, Optional, List, Set, Tuple
 from datetime import datetime
 
+# Liste görünümünde dönen kolonlar - content (büyük Text) hiç okunmaz
+NOTE_LIST_COLUMNS = (Note.id, Note.title, Note.category, Note.summary, Note.created_at)
+
+# UPDATE / DELETE ... RETURNING ile dönen tüm kolonlar
+NOTE_COLUMNS = tuple(Note.__table__.columns)
+
+# COPY ile import edilen kolonlar (id önceden sequence'ten alınır)
+NOTE_COPY_COLUMNS = ("id", "user_id", "title", "content", "category", "tags", "created_at", "updated_at")
+
+# Primary'de çalışmalı (replika gecikmesi sonucu değiştirmesin)
+PRIMARY = {"primary": True}
+
+
+def _db_values(values: Dict) -> Dict:
+    """Request alanları -> kolon değerleri (tags listesi JSON metne çevrilir)"""
+    if "tags" in values:
+        values = {**values, "tags": serialize_tags(values["tags"])}
+    return values
+
 
 def create_note(
     db: Session, 
     title: str, 
     content: str, 
     user_id: int, 
-    category: Optional[str] = None
+    category: Optional[str] = None,
+    tags: Optional[List[str]] = None
 ) -> Note:
     """Yeni not oluşturur"""
     note = Note(
         title=title,
         content=content,
         category=category,
+        tags=serialize_tags(tags),
         user_id=user_id,
         created_at=datetime.utcnow(),
         updated_at=datetime.utcnow()
@@ -27,18 +51,67 @@ def create_note(
     return note
 
 
+def _filter_notes(
+    query,
+    user_id: int,
+    title_filter: Optional[str] = None,
+    tag: Optional[str] = None,
+    category: Optional[str] = None
+):
+    """
+    Liste sorgularında ortak filtreler.
+    tag verilirse sorgu note_tags'ten başlar (ix_note_tags_user_tag); sayfa
+    sırası için note_tags.created_at / note_id kullanılmalı (bkz. _order_columns).
+    """
+    if tag is not None:
+        query = query.join(NoteTag, NoteTag.note_id == Note.id).filter(
+            NoteTag.user_id == user_id, NoteTag.tag == tag
+        )
+    query = query.filter(Note.user_id == user_id)
+    
+    if title_filter:
+        query = query.filter(Note.title.ilike(f"%{title_filter}%"))
+    
+    if category is not None:
+        query = query.filter(Note.category == category)
+    
+    return query
+
+
+def _order_columns(tag: Optional[str]) -> Tuple:
+    """(created_at, id) sırası; etiket filtresinde note_tags'teki kopyaları (aynı değerler)"""
+    if tag is not None:
+        return NoteTag.created_at, NoteTag.note_id
+    return Note.created_at, Note.id
+
+
 def get_notes_by_user(
     db: Session, 
     user_id: int, 
-    title_filter: Optional[str] = None
-) -> List[Note]:
-    """Kullanıcının notlarını getirir"""
-    query = db.query(Note).filter(Note.user_id == user_id)
+    title_filter: Optional[str] = None,
+    limit: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None,
+    tag: Optional[str] = None,
+    category: Optional[str] = None
+) -> List[dict]:
+    """
+    Kullanıcının notlarını (created_at, id) sırasıyla getirir.
+    after verilirse o konumdan sonraki sayfa döner (keyset pagination);
+    ix_notes_user_created_id sayesinde her sayfa ilk sayfa kadar ucuzdur.
+    Sadece NOTE_LIST_COLUMNS seçilir; ORM nesnesi / identity map oluşmaz,
+    satırlar düz dict olarak döner.
+    """
+    query = _filter_notes(db.query(*NOTE_LIST_COLUMNS), user_id, title_filter, tag, category)
+    created_at, note_id = _order_columns(tag)
     
-    if title_filter:
-        query = query.filter(Note.title.ilike(f"%{title_filter}%"))
+    if after is not None:
+        query = query.filter(tuple_(created_at, note_id) < tuple_(*after))
+    
+    query = query.order_by(created_at.desc(), note_id.desc())
+    if limit is not None:
+        query = query.limit(limit)
     
-    return query.order_by(Note.created_at.desc()).all()
+    return [row._asdict() for row in query]
 
 
 def get_note_by_id(
@@ -65,6 +138,8 @@ def update_note(
         note.content = note_update.content
     if note_update.category is not None:
         note.category = note_update.category
+    if note_update.tags is not None:
+        note.tags = serialize_tags(note_update.tags)
     
     note.updated_at = datetime.utcnow()
     
@@ -79,6 +154,211 @@ def delete_note(db: Session, note: Note) -> None:
     db.commit()
 
 
+def update_note_by_id(
+    db: Session,
+    note_id: int,
+    user_id: int,
+    note_update: NoteUpdate
+) -> Optional[Dict]:
+    """
+    Sahiplik kontrolü ve güncelleme tek sorguda:
+    UPDATE notes ... WHERE id = ? AND user_id = ? RETURNING *
+    Not yoksa ya da başka kullanıcınınsa None döner.
+    """
+    values = _db_values(note_update.model_dump(exclude_none=True))
+    values["updated_at"] = datetime.utcnow()
+    row = db.execute(
+        update(Note)
+        .where(Note.id == note_id, Note.user_id == user_id)
+        .values(**values)
+        .returning(*NOTE_COLUMNS),
+        execution_options={"synchronize_session": False}
+    ).first()
+    db.commit()
+    return row._asdict() if row else None
+
+
+def delete_note_by_id(db: Session, note_id: int, user_id: int) -> bool:
+    """DELETE ... WHERE id = ? AND user_id = ? RETURNING id - silindiyse True"""
+    row = db.execute(
+        delete(Note)
+        .where(Note.id == note_id, Note.user_id == user_id)
+        .returning(Note.id),
+        execution_options={"synchronize_session": False}
+    ).first()
+    db.commit()
+    return row is not None
+
+
+def _chunks(items: List, size: int) -> Iterator[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def get_owned_note_ids(
+    db: Session,
+    user_id: int,
+    note_ids: Iterable[int],
+    chunk_size: int
+) -> Set[int]:
+    """
+    Verilen id'lerden kullanıcıya ait olanlar (IN listesi parça parça).
+    Sonuç aynı transaction'daki yazmaya karar verdiği için primary'den okunur.
+    """
+    owned: Set[int] = set()
+    for chunk in _chunks(list(note_ids), chunk_size):
+        owned.update(db.scalars(
+            select(Note.id).where(Note.user_id == user_id, Note.id.in_(chunk)),
+            bind_arguments=PRIMARY
+        ))
+    return owned
+
+
+def bulk_create_notes(
+    db: Session,
+    user_id: int,
+    notes: List[Dict],
+    chunk_size: int
+) -> List[int]:
+    """
+    Notları tek transaction içinde chunk_size'lık executemany INSERT'lerle ekler.
+    Oluşan id'ler istek sırasıyla döner; tek commit (tek fsync) yapılır.
+    """
+    now = datetime.utcnow()
+    statement = insert(Note).returning(Note.id, sort_by_parameter_order=True)
+    ids: List[int] = []
+    try:
+        for chunk in _chunks(notes, chunk_size):
+            rows = [
+                {**_db_values(note), "user_id": user_id, "created_at": now, "updated_at": now}
+                for note in chunk
+            ]
+            ids.extend(db.scalars(statement, rows))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
+
+
+def copy_import_notes(
+    db: Session,
+    user_id: int,
+    notes: List[Dict],
+    chunk_size: int
+) -> List[int]:
+    """
+    PostgreSQL'de notları COPY ... FROM STDIN ile tek transaction içinde ekler
+    (INSERT'e göre satır başına parse / plan maliyeti yok).
+    id'ler önce sequence'ten tek sorguda ayrılır, istek sırasıyla döner.
+    Diğer veritabanlarında bulk_create_notes'a düşer.
+    """
+    connection = db.connection(bind_arguments=PRIMARY)
+    if connection.dialect.name != "postgresql":
+        return bulk_create_notes(db, user_id, notes, chunk_size)
+
+    now = datetime.utcnow()
+    try:
+        ids = list(connection.scalars(
+            text("SELECT nextval(pg_get_serial_sequence('notes', 'id')) FROM generate_series(1, :count)"),
+            {"count": len(notes)}
+        ))
+        records = [
+            (
+                note_id, user_id, note["title"], note["content"], note.get("category"),
+                serialize_tags(note.get("tags")), now, now
+            )
+            for note_id, note in zip(ids, notes)
+        ]
+        driver_connection = connection.connection.driver_connection
+        if connection.dialect.driver == "asyncpg":
+            # run_sync içindeyiz; asyncpg coroutine'i greenlet üzerinden beklenir
+            await_only(driver_connection.copy_records_to_table(
+                Note.__tablename__, records=records, columns=NOTE_COPY_COLUMNS
+            ))
+        else:
+            statement = f"COPY {Note.__tablename__} ({', '.join(NOTE_COPY_COLUMNS)}) FROM STDIN"
+            with driver_connection.cursor() as cursor, cursor.copy(statement) as copy:
+                for record in records:
+                    copy.write_row(record)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return ids
+
+
+def _bulk_update_groups(updates: List[Dict], now: datetime) -> Dict[Tuple[str, ...], List[Dict]]:
+    """
+    Değişen kolon kümesine göre gruplar: her grup tek bir executemany UPDATE olur.
+    Bind parametreleri kolon adlarıyla çakışmasın diye 'b_' önekli.
+    """
+    groups: Dict[Tuple[str, ...], List[Dict]] = {}
+    for values in updates:
+        values = {**_db_values(values), "updated_at": now}
+        note_id = values.pop("id")
+        row = {f"b_{column}": value for column, value in values.items()}
+        row["b_id"] = note_id
+        groups.setdefault(tuple(sorted(values)), []).append(row)
+    return groups
+
+
+def bulk_update_notes(
+    db: Session,
+    user_id: int,
+    updates: List[Dict],
+    chunk_size: int
+) -> Set[int]:
+    """
+    Toplu UPDATE ... WHERE id = ? AND user_id = ? (executemany); her dict 'id' ve
+    değişen kolonları içerir. Sahiplik kontrolünden sonra silinen / başka kullanıcıya
+    geçen notlar güncellenmez: etkilenen satır sayısı eksikse bu notlar aynı
+    transaction içinde bulunur ve id'leri döner.
+    """
+    now = datetime.utcnow()
+    table = Note.__table__
+    skipped: Set[int] = set()
+    try:
+        for chunk in _chunks(updates, chunk_size):
+            updated = 0
+            for columns, rows in _bulk_update_groups(chunk, now).items():
+                statement = (
+                    update(table)
+                    .where(table.c.id == bindparam("b_id"), table.c.user_id == user_id)
+                    .values({column: bindparam(f"b_{column}") for column in columns})
+                )
+                updated += db.execute(statement, rows).rowcount
+            
+            # rowcount executemany'de güvenilir değilse (sürücüye bağlı) her zaman kontrol edilir
+            if updated != len(chunk) or not db.get_bind().dialect.supports_sane_multi_rowcount:
+                ids = [values["id"] for values in chunk]
+                skipped.update(set(ids) - get_owned_note_ids(db, user_id, ids, chunk_size))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return skipped
+
+
+def bulk_delete_notes(
+    db: Session,
+    user_id: int,
+    note_ids: List[int],
+    chunk_size: int
+) -> None:
+    """Notları tek transaction içinde chunk_size'lık DELETE ... WHERE id IN (...) ile siler"""
+    try:
+        for chunk in _chunks(note_ids, chunk_size):
+            db.execute(
+                delete(Note).where(Note.user_id == user_id, Note.id.in_(chunk)),
+                execution_options={"synchronize_session": False}
+            )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
 def update_note_summary(db: Session, note: Note, summary: str) -> Note:
     """Not özetini günceller"""
     note.summary = summary
@@ -89,8 +369,8 @@ def update_note_summary(db: Session, note: Note, summary: str) -> Note:
 
 
 def update_note_tags(db: Session, note: Note, tags: List[str]) -> Note:
-    """Not etiketlerini günceller"""
-    note.tags = tags
+    """Not etiketlerini günceller (note_tags trigger ile güncellenir)"""
+    note.tags = serialize_tags(tags)
     note.updated_at = datetime.utcnow()
     db.commit()
     db.refresh(note)
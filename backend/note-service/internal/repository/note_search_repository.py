@@ -0,0 +1,158 @@
+"""
+Not arama indeksi (full-text search)
+- SQLite: notes tablosuna bağlı (external content) FTS5 tablosu, bm25 ile sıralama
+- PostgreSQL: generated tsvector kolonu + GIN index, ts_rank_cd ile sıralama
+İndeks trigger / generated kolon ile tutulur; repository'deki create, update ve
+delete işlemleri aynı transaction içinde indeksi artımlı olarak günceller.
+"""
+import re
+from typing import List
+
+from sqlalchemy import DateTime, Float, Integer, String, Text, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+# Aranan kelime sayısı sınırı (çok uzun sorgular planı şişirmesin)
+MAX_QUERY_TERMS = 16
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+
+_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+_SQLITE_SETUP = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS notes_fts USING fts5(
+        title, content, summary, tags,
+        content='notes', content_rowid='id',
+        tokenize="unicode61 remove_diacritics 2",
+        prefix='2 3'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_ai AFTER INSERT ON notes BEGIN
+        INSERT INTO notes_fts(rowid, title, content, summary, tags)
+        VALUES (new.id, new.title, new.content, new.summary, new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_ad AFTER DELETE ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content, summary, tags)
+        VALUES ('delete', old.id, old.title, old.content, old.summary, old.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_fts_au AFTER UPDATE OF title, content, summary, tags ON notes BEGIN
+        INSERT INTO notes_fts(notes_fts, rowid, title, content, summary, tags)
+        VALUES ('delete', old.id, old.title, old.content, old.summary, old.tags);
+        INSERT INTO notes_fts(rowid, title, content, summary, tags)
+        VALUES (new.id, new.title, new.content, new.summary, new.tags);
+    END
+    """
+]
+
+_POSTGRES_SETUP = [
+    """
+    ALTER TABLE notes ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(tags, '')), 'B') ||
+        setweight(to_tsvector('simple', coalesce(summary, '')), 'C') ||
+        setweight(to_tsvector('simple', coalesce(content, '')), 'D')
+    ) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_notes_search_vector ON notes USING GIN (search_vector)"
+]
+
+# bm25 ağırlıkları: title, content, summary, tags
+_SQLITE_SEARCH = """
+    SELECT n.id, n.title, n.category, n.summary, n.created_at,
+           -bm25(notes_fts, 10.0, 1.0, 3.0, 5.0) AS rank,
+           snippet(notes_fts, -1, :start, :end, '…', 16) AS snippet
+    FROM notes_fts
+    JOIN notes n ON n.id = notes_fts.rowid
+    WHERE notes_fts MATCH :query AND n.user_id = :user_id
+    ORDER BY rank DESC, n.id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+_POSTGRES_SEARCH = """
+    SELECT n.id, n.title, n.category, n.summary, n.created_at,
+           ts_rank_cd(n.search_vector, q) AS rank,
+           ts_headline(
+               'simple', coalesce(n.summary, '') || ' ' || n.content, q,
+               'StartSel=' || :start || ', StopSel=' || :end || ', MaxWords=24, MinWords=8'
+           ) AS snippet
+    FROM notes n, to_tsquery('simple', :query) q
+    WHERE n.user_id = :user_id AND n.search_vector @@ q
+    ORDER BY rank DESC, n.id DESC
+    LIMIT :limit OFFSET :offset
+"""
+
+_RESULT_COLUMNS = {
+    "id": Integer,
+    "title": String,
+    "category": String,
+    "summary": Text,
+    "created_at": DateTime,
+    "rank": Float,
+    "snippet": Text
+}
+
+
+def init_search_index(engine: Engine) -> None:
+    """Arama indeksini (yoksa) oluşturur; mevcut notlar gerektiğinde yeniden indekslenir"""
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            for statement in _POSTGRES_SETUP:
+                conn.execute(text(statement))
+            return
+
+        # Trigger yoksa indeks güncel tutulmamıştır (ilk kurulum / tablo yeniden oluşturuldu)
+        maintained = conn.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'notes_fts_ai'")
+        ).first()
+        for statement in _SQLITE_SETUP:
+            conn.execute(text(statement))
+        if not maintained:
+            conn.execute(text("INSERT INTO notes_fts(notes_fts) VALUES ('rebuild')"))
+
+
+def parse_terms(query: str) -> List[str]:
+    """Kullanıcı girdisinden arama terimlerini çıkarır (operatör / tırnak enjeksiyonu olmaz)"""
+    return _TERM_PATTERN.findall(query.lower())[:MAX_QUERY_TERMS]
+
+
+def _match_expression(dialect: str, terms: List[str]) -> str:
+    """Her terim önek (prefix) olarak aranır, terimler AND ile bağlanır"""
+    if dialect == "postgresql":
+        return " & ".join(f"{term}:*" for term in terms)
+    return " AND ".join(f'"{term}"*' for term in terms)
+
+
+def search_notes(
+    db: Session,
+    user_id: int,
+    query: str,
+    limit: int = 20,
+    offset: int = 0
+) -> List[dict]:
+    """Kullanıcının notlarında title, content, summary ve tags üzerinde sıralı arama"""
+    terms = parse_terms(query)
+    if not terms:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    statement = text(_POSTGRES_SEARCH if dialect == "postgresql" else _SQLITE_SEARCH)
+    rows = db.execute(
+        statement.columns(**_RESULT_COLUMNS),
+        {
+            "query": _match_expression(dialect, terms),
+            "user_id": user_id,
+            "start": SNIPPET_START,
+            "end": SNIPPET_END,
+            "limit": limit,
+            "offset": offset
+        }
+    ).mappings().all()
+    return [dict(row) for row in rows]
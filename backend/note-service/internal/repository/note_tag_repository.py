@@ -0,0 +1,161 @@
+"""
+Normalize etiketler (note_tags) ve facet sayımları
+notes.tags JSON dizisinden note_tags satırları trigger'larla üretilir; create,
+update, toplu işlemler ve COPY aynı transaction içinde tabloyu günceller.
+Etiket filtresi ve facet'ler (user_id, tag, created_at, note_id) index'i
+üzerinden, notes'u taramadan çalışır.
+"""
+import logging
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import bindparam, func, insert, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from internal.models.note_models import Note, NoteTag
+from internal.utils.tag_utils import MAX_TAG_LENGTH, normalize_tags, parse_tags, serialize_tags
+
+logger = logging.getLogger("note-service-tags")
+
+_SQLITE_SETUP = [
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_tags_ai AFTER INSERT ON notes
+    WHEN new.tags IS NOT NULL AND json_valid(new.tags) BEGIN
+        INSERT OR IGNORE INTO note_tags (note_id, tag, user_id, created_at)
+        SELECT new.id, value, new.user_id, new.created_at FROM json_each(new.tags);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_tags_au AFTER UPDATE OF tags ON notes BEGIN
+        DELETE FROM note_tags WHERE note_id = new.id;
+        INSERT OR IGNORE INTO note_tags (note_id, tag, user_id, created_at)
+        SELECT new.id, value, new.user_id, new.created_at FROM json_each(new.tags)
+        WHERE new.tags IS NOT NULL AND json_valid(new.tags);
+    END
+    """,
+    # SQLite'ta foreign_keys kapalı; ON DELETE CASCADE yerine
+    """
+    CREATE TRIGGER IF NOT EXISTS notes_tags_ad AFTER DELETE ON notes BEGIN
+        DELETE FROM note_tags WHERE note_id = old.id;
+    END
+    """
+]
+
+# Silme note_tags.note_id foreign key'inin ON DELETE CASCADE'i ile yapılır
+_POSTGRES_SETUP = [
+    """
+    CREATE OR REPLACE FUNCTION notes_sync_tags() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' THEN
+            DELETE FROM note_tags WHERE note_id = NEW.id;
+        END IF;
+        IF NEW.tags IS NOT NULL THEN
+            INSERT INTO note_tags (note_id, tag, user_id, created_at)
+            SELECT NEW.id, tag, NEW.user_id, NEW.created_at FROM json_array_elements_text(NEW.tags::json) AS tag
+            ON CONFLICT DO NOTHING;
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS notes_sync_tags ON notes",
+    """
+    CREATE TRIGGER notes_sync_tags AFTER INSERT OR UPDATE OF tags ON notes
+    FOR EACH ROW EXECUTE FUNCTION notes_sync_tags()
+    """
+]
+
+
+def _legacy_tags(value: str) -> List[str]:
+    """Eski tags değeri -> etiketler; MAX_TAG_LENGTH'i aşanlar kırpılır (note_tags.tag VARCHAR(50))"""
+    return normalize_tags(tag[:MAX_TAG_LENGTH] for tag in parse_tags(value))
+
+
+def _migrate_legacy_tags(conn) -> None:
+    """
+    İlk kurulumda mevcut notları note_tags'e aktarır.
+    - tags değeri zaten normalize JSON dizi olan notlara dokunulmaz; note_tags
+      satırları doğrudan eklenir (updated_at ve değişiklik akışı değişmez,
+      istemciler bu notları yeniden indirmez)
+    - Değeri değişen notlar (virgüllü metin, büyük harf, tekrar, 50 karakteri
+      aşan etiket) UPDATE edilir ve updated_at ilerletilir; liste ETag'leri ve
+      değişiklik akışı bu notları görür, trigger'lar note_tags'i doldurur
+    """
+    rows = conn.execute(
+        select(Note.id, Note.user_id, Note.created_at, Note.tags).where(Note.tags.is_not(None))
+    ).all()
+    unchanged, changed, truncated = [], [], 0
+    for note_id, user_id, created_at, value in rows:
+        tags = _legacy_tags(value)
+        truncated += any(len(tag) > MAX_TAG_LENGTH for tag in parse_tags(value))
+        migrated = serialize_tags(tags)
+        if migrated == value:
+            unchanged.extend(
+                {"note_id": note_id, "tag": tag, "user_id": user_id, "created_at": created_at} for tag in tags
+            )
+        else:
+            changed.append({"b_id": note_id, "b_tags": migrated})
+
+    # Trigger'lar bu transaction'da kuruldu; note_tags henüz boş, çakışma olmaz
+    if unchanged:
+        conn.execute(insert(NoteTag), unchanged)
+    if changed:
+        notes = Note.__table__
+        conn.execute(
+            update(notes)
+            .where(notes.c.id == bindparam("b_id"))
+            .values(tags=bindparam("b_tags"), updated_at=datetime.utcnow()),
+            changed
+        )
+    if truncated:
+        logger.warning(f"{truncated} notta {MAX_TAG_LENGTH} karakteri aşan etiketler kırpıldı")
+
+
+def init_tag_index(engine: Engine) -> None:
+    """
+    Etiket trigger'larını (yoksa) kurar. İlk kurulumda mevcut notların etiketleri
+    note_tags'e aktarılır (bkz. _migrate_legacy_tags).
+    """
+    with engine.begin() as conn:
+        if engine.dialect.name == "postgresql":
+            maintained = conn.execute(
+                text("SELECT 1 FROM pg_trigger WHERE tgname = 'notes_sync_tags'")
+            ).first()
+            setup = _POSTGRES_SETUP
+        else:
+            maintained = conn.execute(
+                text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'notes_tags_ai'")
+            ).first()
+            setup = _SQLITE_SETUP
+
+        for statement in setup:
+            conn.execute(text(statement))
+        if not maintained:
+            _migrate_legacy_tags(conn)
+
+
+def get_tag_counts(db: Session, user_id: int, limit: int) -> List[Dict]:
+    """Kullanıcının etiketleri ve not sayıları (çoktan aza)"""
+    count = func.count().label("count")
+    rows = db.execute(
+        select(NoteTag.tag.label("value"), count)
+        .where(NoteTag.user_id == user_id)
+        .group_by(NoteTag.tag)
+        .order_by(count.desc(), NoteTag.tag)
+        .limit(limit)
+    )
+    return [row._asdict() for row in rows]
+
+
+def get_category_counts(db: Session, user_id: int, limit: int) -> List[Dict]:
+    """Kullanıcının kategorileri ve not sayıları (çoktan aza)"""
+    count = func.count().label("count")
+    rows = db.execute(
+        select(Note.category.label("value"), count)
+        .where(Note.user_id == user_id, Note.category.is_not(None))
+        .group_by(Note.category)
+        .order_by(count.desc(), Note.category)
+        .limit(limit)
+    )
+    return [row._asdict() for row in rows]
@@ -1,80 +1,249 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, Request, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
-from internal.schemas.note_schemas import NoteCreate, NoteUpdate, NoteResponse, NoteListResponse
-from internal.database.database import get_db
+from internal.schemas.note_schemas import (
+    NoteCreate, NoteUpdate, NoteResponse, NoteListResponse, NoteSearchResult,
+    NoteBulkCreate, NoteBulkUpdate, NoteBulkDelete, BulkResponse, NoteImportResponse,
+    NoteChangesResponse, NoteFacetsResponse
+)
+from internal.database.database import get_db, run_db
 from internal.handler.note_handler import NoteHandler
 from internal.dependencies import get_current_user_id
+from internal.utils.etag_utils import etag_matches
+from internal.utils.json_utils import RowJSONResponse
 
 router = APIRouter(prefix="/notes", tags=["Notlar"])
 
-@router.post("")
-def create_note(
+# Endpoint'ler async'tir; DB işleri run_db ile DB_MODE'a göre threadpool'da
+# ya da async engine üzerinde çalışır (NoteHandler API'si iki modda da aynı)
+
+@router.post("", response_model=NoteResponse)
+async def create_note(
     note: NoteCreate, 
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
-    return NoteHandler.create_note(
+    return await run_db(
+        db,
+        NoteHandler.create_note,
         note_data=note,
-        user_id=user_id,
-        db=db
+        user_id=user_id
     )
 
 
-@router.get("", response_model=List[NoteListResponse])
-def get_notes(
+@router.get("", response_model=NoteListResponse)
+async def get_notes(
+    request: Request,
     title: Optional[str] = None,
+    tag: Optional[str] = Query(None, min_length=1, max_length=50),
+    category: Optional[str] = Query(None, min_length=1, max_length=100),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Kullanıcının tüm notlarını listeler"""
-    return NoteHandler.get_notes(
+    """
+    Kullanıcının notlarını sayfalı listeler (cursor + limit, ETag / If-None-Match destekli).
+    tag / category ile filtrelenebilir (index'li, tablo taranmaz).
+    Satırlar response_model üzerinden tek tek doğrulanmadan doğrudan JSON'a yazılır.
+    """
+    etag = await run_db(
+        db,
+        NoteHandler.get_notes_etag,
+        user_id=user_id,
+        title=title,
+        limit=limit,
+        cursor=cursor,
+        tag=tag,
+        category=category
+    )
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    page = await run_db(
+        db,
+        NoteHandler.get_notes,
         user_id=user_id,
-        db=db,
-        title=title
+        title=title,
+        limit=limit,
+        cursor=cursor,
+        tag=tag,
+        category=category
+    )
+    return RowJSONResponse(
+        content=page,
+        headers={"ETag": etag, "Cache-Control": "private, no-cache"}
     )
 
-@router.get("/{note_id}", response_model=NoteResponse)
-def get_note(
-    note_id: int,
+@router.post("/bulk", response_model=BulkResponse, status_code=status.HTTP_201_CREATED)
+async def bulk_create_notes(
+    notes: NoteBulkCreate,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
-    """Belirli bir notu getirir"""
-    return NoteHandler.get_note(
-        note_id=note_id,
+    """Notları tek transaction içinde toplu oluşturur"""
+    return await run_db(
+        db,
+        NoteHandler.bulk_create_notes,
+        notes_data=notes,
+        user_id=user_id,
+        chunk_size=chunk_size
+    )
+
+
+@router.post("/import", response_model=NoteImportResponse, status_code=status.HTTP_201_CREATED)
+async def import_notes(
+    notes: NoteBulkCreate,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Notları toplu import eder - PostgreSQL'de COPY, SQLite'ta toplu INSERT"""
+    return await run_db(
+        db,
+        NoteHandler.import_notes,
+        notes_data=notes,
+        user_id=user_id,
+        chunk_size=chunk_size
+    )
+
+
+@router.patch("/bulk", response_model=BulkResponse)
+async def bulk_update_notes(
+    notes: NoteBulkUpdate,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Notları tek transaction içinde toplu günceller (eleman bazında sonuç)"""
+    return await run_db(
+        db,
+        NoteHandler.bulk_update_notes,
+        notes_data=notes,
+        user_id=user_id,
+        chunk_size=chunk_size
+    )
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def bulk_delete_notes(
+    notes: NoteBulkDelete,
+    chunk_size: Optional[int] = Query(None, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Notları tek transaction içinde toplu siler (eleman bazında sonuç)"""
+    return await run_db(
+        db,
+        NoteHandler.bulk_delete_notes,
+        notes_data=notes,
         user_id=user_id,
-        db=db
+        chunk_size=chunk_size
     )
 
 
+@router.get("/facets", response_model=NoteFacetsResponse)
+async def get_note_facets(
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Etiket ve kategori bazında not sayıları (en çok kullanılan limit kadar)"""
+    return await run_db(db, NoteHandler.get_note_facets, user_id=user_id, limit=limit)
+
+
+@router.get("/changes", response_model=NoteChangesResponse)
+async def get_note_changes(
+    since: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Delta sync: since cursor'ından sonra oluşturulan, güncellenen ve silinen notlar.
+    İlk senkronizasyonda since verilmez; sonraki isteklerde önceki cevabın
+    next_cursor'ı gönderilir, has_more False olana kadar sayfalar okunur.
+    """
+    page = await run_db(
+        db,
+        NoteHandler.get_note_changes,
+        user_id=user_id,
+        since=since,
+        limit=limit
+    )
+    return RowJSONResponse(content=page, headers={"Cache-Control": "private, no-store"})
+
+
+@router.get("/search", response_model=List[NoteSearchResult])
+async def search_notes(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """Notlarda arama (title, content, summary, tags) - önek eşleşme, alaka sıralı, snippet'li"""
+    return await run_db(
+        db,
+        NoteHandler.search_notes,
+        user_id=user_id,
+        query=q,
+        limit=limit,
+        offset=offset
+    )
+
+
+@router.get("/{note_id}", response_model=NoteResponse)
+async def get_note(
+    note_id: int,
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id)
+):
+    """
+    Belirli bir notu getirir (ETag / If-None-Match destekli).
+    ETag okunan satırdan hesaplanır: not tek sorguda gelir, 304'te body gönderilmez.
+    """
+    note, etag = await run_db(db, NoteHandler.get_note_with_etag, note_id=note_id, user_id=user_id)
+    if etag_matches(request.headers.get("If-None-Match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+    return note
+
+
 @router.put("/{note_id}", response_model=NoteResponse)
-def update_note(
+async def update_note(
     note_id: int,
     note_update: NoteUpdate,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """Notu günceller"""
-    return NoteHandler.update_note(
+    return await run_db(
+        db,
+        NoteHandler.update_note,
         note_id=note_id,
         note_update=note_update,
-        user_id=user_id,
-        db=db
+        user_id=user_id
     )
 
 
 @router.delete("/{note_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_note(
+async def delete_note(
     note_id: int,
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id)
 ):
     """Notu siler"""
-    NoteHandler.delete_note(
+    await run_db(
+        db,
+        NoteHandler.delete_note,
         note_id=note_id,
-        user_id=user_id,
-        db=db
+        user_id=user_id
     )
     return None
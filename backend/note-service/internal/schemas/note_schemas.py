@@ -1,20 +1,78 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
 from typing import Optional, List
 from datetime import datetime
 
+from internal.utils.tag_utils import MAX_TAG_LENGTH, MAX_TAGS_PER_NOTE, normalize_tags, parse_tags
+
+
+def _validate_tags(tags: Optional[List[str]]) -> Optional[List[str]]:
+    if tags is None:
+        return None
+    tags = normalize_tags(tags)
+    if any(len(tag) > MAX_TAG_LENGTH for tag in tags):
+        raise ValueError(f"Etiket en fazla {MAX_TAG_LENGTH} karakter olabilir")
+    return tags
+
 
 class NoteCreate(BaseModel):
     """Not oluşturma request"""
     title: str = Field(..., min_length=1, max_length=200)
     content: str = Field(..., min_length=1)
     category: Optional[str] = Field(None, max_length=100)
+    tags: Optional[List[str]] = Field(None, max_length=MAX_TAGS_PER_NOTE)
+
+    _normalize_tags = field_validator("tags")(_validate_tags)
 
 
 class NoteUpdate(BaseModel):
-    """Not güncelleme request"""
+    """Not güncelleme request (tags: [] etiketleri temizler)"""
     title: Optional[str] = Field(None, min_length=1, max_length=200)
     content: Optional[str] = Field(None, min_length=1)
     category: Optional[str] = Field(None, max_length=100)
+    tags: Optional[List[str]] = Field(None, max_length=MAX_TAGS_PER_NOTE)
+
+    _normalize_tags = field_validator("tags")(_validate_tags)
+
+
+class NoteBulkUpdateItem(NoteUpdate):
+    """Toplu güncellemede tek not"""
+    id: int
+
+
+class NoteBulkCreate(BaseModel):
+    """Toplu not oluşturma request"""
+    notes: List[NoteCreate] = Field(..., min_length=1)
+
+
+class NoteBulkUpdate(BaseModel):
+    """Toplu not güncelleme request"""
+    notes: List[NoteBulkUpdateItem] = Field(..., min_length=1)
+
+
+class NoteBulkDelete(BaseModel):
+    """Toplu not silme request"""
+    ids: List[int] = Field(..., min_length=1)
+
+
+class BulkItemResult(BaseModel):
+    """Toplu işlemde tek elemanın sonucu (index: request'teki sırası)"""
+    index: int
+    id: Optional[int] = None
+    status: int
+    error: Optional[str] = None
+
+
+class BulkResponse(BaseModel):
+    """Toplu işlem response"""
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult]
+
+
+class NoteImportResponse(BaseModel):
+    """Not import response (ids: request sırasıyla)"""
+    imported: int
+    ids: List[int]
 
 
 class NoteResponse(BaseModel):
@@ -24,7 +82,7 @@ class NoteResponse(BaseModel):
     content: str
     category: Optional[str] = None
     summary: Optional[str] = None
-    tags: Optional[str] = None  # String olarak (model'de String)
+    tags: List[str] = []
     user_id: int
     created_at: datetime
     updated_at: datetime
@@ -32,9 +90,26 @@ class NoteResponse(BaseModel):
     class Config:
         from_attributes = True
 
+    @field_validator("tags", mode="before")
+    @classmethod
+    def _parse_tags(cls, value):
+        """notes.tags kolonu JSON metin olarak gelir"""
+        return parse_tags(value) if value is None or isinstance(value, str) else value
 
-class NoteListResponse(BaseModel):
-    """Not liste response"""
+
+class NoteSearchResult(BaseModel):
+    """Not arama sonucu (rank: yüksek olan daha alakalı)"""
+    id: int
+    title: str
+    category: Optional[str] = None
+    summary: Optional[str] = None
+    created_at: datetime
+    rank: float
+    snippet: Optional[str] = None
+
+
+class NoteListItem(BaseModel):
+    """Not liste elemanı"""
     id: int
     title: str
     category: Optional[str] = None
@@ -43,3 +118,35 @@ class NoteListResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class NoteListResponse(BaseModel):
+    """Not liste response (sayfalı) - next_cursor None ise son sayfa"""
+    items: List[NoteListItem]
+    next_cursor: Optional[str] = None
+
+
+
+class NoteChangesResponse(BaseModel):
+    """
+    Delta sync sayfası: since'ten sonra oluşturulan / güncellenen (upserted) ve
+    silinen (deleted) notlar. next_cursor sonraki istekte since olarak gönderilir;
+    has_more False ise istemci günceldir.
+    """
+    upserted: List[NoteResponse]
+    deleted: List[int]
+    next_cursor: str
+    has_more: bool
+
+
+
+class FacetCount(BaseModel):
+    """Bir etiket / kategori ve not sayısı"""
+    value: str
+    count: int
+
+
+class NoteFacetsResponse(BaseModel):
+    """Etiket ve kategori bazında not sayıları (çoktan aza)"""
+    tags: List[FacetCount]
+    categories: List[FacetCount]
@@ -1,15 +1,37 @@
+import os
 from fastapi import HTTPException
-from typing import Optional
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
 
 from repository.note_repository import (
     create_note as repo_create_note,
     get_notes_by_user,
     get_note_by_id as repo_get_note,
-    update_note as repo_update_note,
-    delete_note as repo_delete_note
+    update_note_by_id as repo_update_note_by_id,
+    delete_note_by_id as repo_delete_note_by_id,
+    get_owned_note_ids,
+    bulk_create_notes as repo_bulk_create_notes,
+    copy_import_notes as repo_copy_import_notes,
+    bulk_update_notes as repo_bulk_update_notes,
+    bulk_delete_notes as repo_bulk_delete_notes
 )
-from schemas.note_schemas import NoteCreate, NoteUpdate
+from repository.note_search_repository import search_notes as repo_search_notes
+from repository.note_change_repository import get_change_version, get_changes_since
+from repository.note_tag_repository import get_tag_counts, get_category_counts
+from schemas.note_schemas import NoteCreate, NoteUpdate, NoteBulkCreate, NoteBulkUpdate, NoteBulkDelete
+from utils.etag_utils import make_etag
+from utils.tag_utils import normalize_tags, parse_tags
+from utils.cursor_utils import (
+    encode_cursor, decode_cursor, encode_change_cursor, decode_change_cursor, InvalidCursorError
+)
+
+# Toplu işlemler: varsayılan chunk boyutu (executemany / IN listesi başına satır)
+# ve istek başına en fazla eleman
+BULK_CHUNK_SIZE = int(os.getenv("NOTE_BULK_CHUNK_SIZE", "500"))
+BULK_MAX_ITEMS = int(os.getenv("NOTE_BULK_MAX_ITEMS", "5000"))
+
+# Import (PostgreSQL'de COPY) istek başına en fazla not
+IMPORT_MAX_ITEMS = int(os.getenv("NOTE_IMPORT_MAX_ITEMS", "50000"))
 
 
 def create_note(db: Session, note_data: NoteCreate, user_id: int):
@@ -19,17 +41,127 @@ def create_note(db: Session, note_data: NoteCreate, user_id: int):
         title=note_data.title,
         content=note_data.content,
         category=note_data.category,
+        tags=note_data.tags,
         user_id=user_id
     )
 
 
+def _tag_filter(tag: Optional[str]) -> Optional[str]:
+    """?tag= değeri kayıtlı etiketlerle aynı biçime getirilir"""
+    tags = normalize_tags([tag] if tag else None)
+    return tags[0] if tags else None
+
+
 def get_all_notes(
     db: Session,
     user_id: int,
-    title_filter: Optional[str] = None
+    title_filter: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    category: Optional[str] = None
+):
+    """Kullanıcının notlarını sayfa sayfa getirir (cursor: önceki sayfanın next_cursor'ı)"""
+    try:
+        after = decode_cursor(cursor)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+    
+    # Bir fazlası okunur: varsa sonraki sayfa vardır
+    notes = get_notes_by_user(
+        db, user_id, title_filter, limit=limit + 1, after=after, tag=_tag_filter(tag), category=category
+    )
+    next_cursor = None
+    if len(notes) > limit:
+        notes = notes[:limit]
+        next_cursor = encode_cursor(notes[-1]["created_at"], notes[-1]["id"])
+    
+    return {"items": notes, "next_cursor": next_cursor}
+
+
+def get_note_changes(
+    db: Session,
+    user_id: int,
+    since: Optional[str] = None,
+    limit: int = 100
+):
+    """
+    since cursor'ından sonraki değişiklikler (since yoksa baştan, tam senkronizasyon).
+    Not başına son durum döner: oluşturulan / güncellenen notlar upserted'da,
+    silinenler deleted'da.
+    """
+    try:
+        after = decode_change_cursor(since)
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Geçersiz cursor")
+    
+    # Bir fazlası okunur: varsa sonraki sayfa vardır
+    changes = get_changes_since(db, user_id, after, limit + 1)
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+    
+    upserted, deleted = [], []
+    for seq, note_id, is_deleted, note in changes:
+        if is_deleted:
+            deleted.append(note_id)
+        else:
+            upserted.append({**note, "tags": parse_tags(note["tags"])})
+    
+    last_seq = changes[-1][0] if changes else after
+    return {
+        "upserted": upserted,
+        "deleted": deleted,
+        "next_cursor": encode_change_cursor(last_seq),
+        "has_more": has_more
+    }
+
+
+def search_notes(
+    db: Session,
+    user_id: int,
+    query: str,
+    limit: int = 20,
+    offset: int = 0
 ):
-    """Kullanıcının tüm notlarını getirir"""
-    return get_notes_by_user(db, user_id, title_filter)
+    """Full-text arama (title, content, summary, tags)"""
+    return repo_search_notes(db, user_id, query, limit, offset)
+
+
+def get_notes_etag(
+    db: Session,
+    user_id: int,
+    title_filter: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    category: Optional[str] = None
+) -> str:
+    """
+    Not listesi sayfası için ETag (kullanıcının son değişiklik seq'i + sayfa konumu +
+    filtreler). Notlar taranmaz: herhangi bir notun değişmesi tüm sayfaların
+    ETag'ini değiştirir, sayfa başına ek maliyet tek index okumasıdır.
+    """
+    tag = _tag_filter(tag)
+    version = get_change_version(db, user_id)
+    return make_etag("notes", user_id, title_filter, tag, category, limit, cursor, version)
+
+
+def get_note_facets(db: Session, user_id: int, limit: int = 50):
+    """Etiket ve kategori bazında not sayıları (GROUP BY, index üzerinden)"""
+    return {
+        "tags": get_tag_counts(db, user_id, limit),
+        "categories": get_category_counts(db, user_id, limit)
+    }
+
+
+def get_note_with_etag(
+    db: Session,
+    note_id: int,
+    user_id: int
+):
+    """(not, ETag) - ETag okunan satırın updated_at'inden, tek sorguda"""
+    note = get_note_by_id(db, note_id, user_id)
+    return note, make_etag("note", note.id, note.updated_at)
 
 
 def get_note_by_id(
@@ -50,9 +182,11 @@ def update_note(
     note_data: NoteUpdate,
     user_id: int
 ):
-    """Not günceller"""
-    note = get_note_by_id(db, note_id, user_id)
-    return repo_update_note(db, note, note_data)
+    """Not günceller (tek UPDATE ... RETURNING; not yoksa / başkasınınsa 404)"""
+    note = repo_update_note_by_id(db, note_id, user_id, note_data)
+    if note is None:
+        raise HTTPException(status_code=404, detail="Not bulunamadı")
+    return note
 
 
 def delete_note(
@@ -60,7 +194,125 @@ def delete_note(
     note_id: int,
     user_id: int
 ):
-    """Not siler"""
-    note = get_note_by_id(db, note_id, user_id)
-    repo_delete_note(db, note)
-    return {"message": "Not başarıyla silindi"}
\ No newline at end of file
+    """Not siler (tek DELETE ... RETURNING; not yoksa / başkasınınsa 404)"""
+    if not repo_delete_note_by_id(db, note_id, user_id):
+        raise HTTPException(status_code=404, detail="Not bulunamadı")
+    return {"message": "Not başarıyla silindi"}
+
+
+def _check_bulk_size(count: int):
+    if count > BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tek istekte en fazla {BULK_MAX_ITEMS} not işlenebilir"
+        )
+
+
+def _bulk_response(results: List[Dict]) -> Dict:
+    failed = sum(1 for result in results if result["status"] >= 400)
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+def bulk_create_notes(
+    db: Session,
+    notes_data: NoteBulkCreate,
+    user_id: int,
+    chunk_size: Optional[int] = None
+):
+    """Notları tek transaction içinde toplu oluşturur"""
+    _check_bulk_size(len(notes_data.notes))
+    ids = repo_bulk_create_notes(
+        db,
+        user_id,
+        [note.model_dump() for note in notes_data.notes],
+        chunk_size or BULK_CHUNK_SIZE
+    )
+    return _bulk_response([
+        {"index": index, "id": note_id, "status": 201}
+        for index, note_id in enumerate(ids)
+    ])
+
+
+def import_notes(
+    db: Session,
+    notes_data: NoteBulkCreate,
+    user_id: int,
+    chunk_size: Optional[int] = None
+):
+    """Notları toplu import eder (PostgreSQL'de COPY, diğerlerinde toplu INSERT)"""
+    if len(notes_data.notes) > IMPORT_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Tek istekte en fazla {IMPORT_MAX_ITEMS} not import edilebilir"
+        )
+    ids = repo_copy_import_notes(
+        db,
+        user_id,
+        [note.model_dump() for note in notes_data.notes],
+        chunk_size or BULK_CHUNK_SIZE
+    )
+    return {"imported": len(ids), "ids": ids}
+
+
+def bulk_update_notes(
+    db: Session,
+    notes_data: NoteBulkUpdate,
+    user_id: int,
+    chunk_size: Optional[int] = None
+):
+    """
+    Notları tek transaction içinde toplu günceller.
+    Kullanıcıya ait olmayan / olmayan notlar 404, tekrar eden id'ler 409 olarak raporlanır.
+    """
+    _check_bulk_size(len(notes_data.notes))
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    owned = get_owned_note_ids(db, user_id, {item.id for item in notes_data.notes}, chunk_size)
+    
+    results, updates, seen = [], [], set()
+    for index, item in enumerate(notes_data.notes):
+        if item.id in seen:
+            results.append({"index": index, "id": item.id, "status": 409, "error": "Not istekte birden fazla kez var"})
+            continue
+        seen.add(item.id)
+        if item.id not in owned:
+            results.append({"index": index, "id": item.id, "status": 404, "error": "Not bulunamadı"})
+            continue
+        # update_note ile aynı anlam: None olan alanlar değişmez
+        updates.append(item.model_dump(exclude_none=True))
+        results.append({"index": index, "id": item.id, "status": 200})
+    
+    if updates:
+        # Kontrol ile UPDATE arasında silinen / taşınan notlar da 404
+        skipped = repo_bulk_update_notes(db, user_id, updates, chunk_size)
+        for result in results:
+            if result["status"] == 200 and result["id"] in skipped:
+                result.update(status=404, error="Not bulunamadı")
+    return _bulk_response(results)
+
+
+def bulk_delete_notes(
+    db: Session,
+    notes_data: NoteBulkDelete,
+    user_id: int,
+    chunk_size: Optional[int] = None
+):
+    """Notları tek transaction içinde toplu siler"""
+    _check_bulk_size(len(notes_data.ids))
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    owned = get_owned_note_ids(db, user_id, notes_data.ids, chunk_size)
+    
+    results, deletes, seen = [], [], set()
+    for index, note_id in enumerate(notes_data.ids):
+        if note_id in seen:
+            results.append({"index": index, "id": note_id, "status": 409, "error": "Not istekte birden fazla kez var"})
+            continue
+        seen.add(note_id)
+        if note_id not in owned:
+            results.append({"index": index, "id": note_id, "status": 404, "error": "Not bulunamadı"})
+            continue
+        deletes.append(note_id)
+        results.append({"index": index, "id": note_id, "status": 204})
+    
+    if deletes:
+        repo_bulk_delete_notes(db, user_id, deletes, chunk_size)
+    return _bulk_response(results)
@@ -4,13 +4,18 @@ Token oluşturma, doğrulama ve user bilgilerini çözme
 """
 from datetime import datetime, timedelta
 from typing import Optional
+import hmac
+import os
 import jwt
-from fastapi import HTTPException, status
+from fastapi import HTTPException, Request, status
 
 SECRET_KEY = "your-secret-key-change-this-in-production-min-32-characters"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Gateway ile paylaşılan iç anahtar; boşsa kimlik header'larına güvenilmez
+INTERNAL_TOKEN = os.getenv("INTERNAL_TOKEN", "")
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """JWT access token oluşturur"""
@@ -44,3 +49,27 @@ def verify_token(token: str) -> dict:
             detail="Invalid token. Please login again.",
             headers={"WWW-Authenticate": "Bearer"}
         )
+
+
+def get_trusted_user(request: Request) -> Optional[dict]:
+    """
+    API Gateway token'ı zaten doğruladıysa kimliği header'lardan okur.
+    Sadece X-Internal-Token ortak anahtarla eşleşirse güvenilir,
+    böylece her istekte jwt.decode çalışmaz.
+    """
+    if not INTERNAL_TOKEN:
+        return None
+    
+    internal_token = request.headers.get("X-Internal-Token", "")
+    user_id = request.headers.get("X-User-ID")
+    if not user_id or not hmac.compare_digest(internal_token, INTERNAL_TOKEN):
+        return None
+    
+    try:
+        return {
+            "user_id": int(user_id),
+            "email": request.headers.get("X-Email"),
+            "username": request.headers.get("X-Username")
+        }
+    except ValueError:
+        return None
@@ -0,0 +1,57 @@
+"""
+Cursor yardımcıları
+Keyset pagination için (created_at, id) konumunu, değişiklik akışı için de
+son görülen sıra numarasını (seq) istemciye opak bir token olarak verir ve geri çözer.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Cursor token'ı çözülemedi"""
+
+
+def _encode(value) -> str:
+    raw = json.dumps(value, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode()))
+
+
+def encode_cursor(created_at: datetime, note_id: int) -> str:
+    """(created_at, id) -> URL-safe opak token"""
+    return _encode([created_at.isoformat(), note_id])
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """Token -> (created_at, id); token yoksa None"""
+    if not cursor:
+        return None
+    try:
+        created_at, note_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(note_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError("Geçersiz cursor") from e
+
+
+def encode_change_cursor(seq: int) -> str:
+    """Değişiklik akışında son görülen seq -> opak token"""
+    return _encode({"seq": seq})
+
+
+def decode_change_cursor(cursor: Optional[str]) -> int:
+    """Token -> seq; token yoksa 0 (baştan, tam senkronizasyon)"""
+    if not cursor:
+        return 0
+    try:
+        seq = int(_decode(cursor)["seq"])
+    except (ValueError, TypeError, KeyError) as e:
+        raise InvalidCursorError("Geçersiz cursor") from e
+    if seq < 0:
+        raise InvalidCursorError("Geçersiz cursor")
+    return seq
@@ -0,0 +1,23 @@
+"""
+ETag yardımcıları
+Not cevapları için updated_at'ten türetilen strong ETag'ler üretir
+ve If-None-Match header'ı ile karşılaştırır.
+"""
+import hashlib
+from typing import Optional
+
+
+def make_etag(*parts) -> str:
+    """Verilen parçalardan strong ETag üretir"""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match header'ı ETag ile eşleşiyor mu (weak karşılaştırma)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
@@ -0,0 +1,28 @@
+"""
+JSON yardımcıları
+Liste endpoint'lerinde satırlar Pydantic modeline dönüştürülmeden
+doğrudan JSON'a yazılır.
+"""
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+
+def _default(value: Any):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+class RowJSONResponse(JSONResponse):
+    """dict / list içindeki datetime'ları ISO formatında yazan hafif JSON response"""
+
+    def render(self, content: Any) -> bytes:
+        return json.dumps(
+            content,
+            ensure_ascii=False,
+            separators=(",", ":"),
+            default=_default
+        ).encode("utf-8")
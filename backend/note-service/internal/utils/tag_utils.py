@@ -0,0 +1,41 @@
+"""
+Etiket yardımcıları
+Etiketler küçük harfe çevrilir, boşluklar kırpılır ve tekrarlar atılır.
+notes.tags kolonunda JSON dizi olarak saklanır (ör. ["python", "fastapi"]);
+note_tags tablosu bu kolondan trigger'larla doldurulur.
+Eski kayıtlardaki virgülle ayrılmış değerler de okunabilir.
+"""
+import json
+from typing import Iterable, List, Optional
+
+MAX_TAG_LENGTH = 50
+MAX_TAGS_PER_NOTE = 20
+
+
+def normalize_tags(tags: Optional[Iterable[str]]) -> List[str]:
+    """Küçük harf, kırpılmış, boşsuz ve tekrarsız (ilk görülme sırasıyla)"""
+    normalized: List[str] = []
+    for tag in tags or ():
+        tag = tag.strip().lower()
+        if tag and tag not in normalized:
+            normalized.append(tag)
+    return normalized
+
+
+def serialize_tags(tags: Optional[Iterable[str]]) -> Optional[str]:
+    """Etiket listesi -> notes.tags değeri; etiket yoksa NULL"""
+    normalized = normalize_tags(tags)
+    return json.dumps(normalized, ensure_ascii=False) if normalized else None
+
+
+def parse_tags(value: Optional[str]) -> List[str]:
+    """notes.tags değeri (JSON dizi ya da eski virgüllü metin) -> etiket listesi"""
+    if not value:
+        return []
+    try:
+        parsed = json.loads(value)
+    except ValueError:
+        parsed = None
+    if isinstance(parsed, list):
+        return normalize_tags(str(tag) for tag in parsed)
+    return normalize_tags(tag.strip().strip("'\"") for tag in value.strip("[]{}").split(","))
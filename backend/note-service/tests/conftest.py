@@ -0,0 +1,36 @@
+"""
+Test ortamı: servis geçici bir SQLite dosyasıyla ayağa kalkar
+(database modülü DATABASE_URL'i import sırasında okur)
+"""
+import os
+import sys
+import tempfile
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [SERVICE_DIR, os.path.join(SERVICE_DIR, "internal")]
+
+_db_dir = tempfile.mkdtemp(prefix="note-service-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'notes.db')}"
+
+import pytest
+
+from internal.database.database import Base, SessionLocal, engine, ensure_indexes
+from internal.repository.note_search_repository import init_search_index
+from internal.repository.note_change_repository import init_change_feed
+from internal.repository.note_tag_repository import init_tag_index
+
+
+@pytest.fixture
+def db():
+    """Her test boş şemayla başlar (api/main.py ile aynı kurulum adımları)"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    ensure_indexes()
+    init_search_index(engine)
+    init_change_feed(engine)
+    init_tag_index(engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,40 @@
+from internal.schemas.note_schemas import NoteBulkUpdate, NoteCreate
+from internal.services import note_services
+from internal.services.note_services import bulk_update_notes, create_note, delete_note, get_note_by_id
+from internal.repository.note_repository import bulk_update_notes as repo_bulk_update_notes
+
+
+def _note(db, title: str, user_id: int):
+    return create_note(db, NoteCreate(title=title, content=f"{title} içeriği"), user_id=user_id)
+
+
+def test_bulk_update_reports_note_deleted_after_ownership_check(db, monkeypatch):
+    """Sahiplik okunduktan sonra silinen not 200 değil 404 döner"""
+    kept, deleted = _note(db, "kalan", 1).id, _note(db, "silinen", 1).id
+    monkeypatch.setattr(note_services, "get_owned_note_ids", lambda *args: {kept, deleted})
+    delete_note(db, deleted, user_id=1)
+
+    response = bulk_update_notes(
+        db,
+        NoteBulkUpdate(notes=[{"id": kept, "title": "yeni"}, {"id": deleted, "title": "yeni"}]),
+        user_id=1
+    )
+
+    assert [(result["id"], result["status"]) for result in response["results"]] == [
+        (kept, 200), (deleted, 404)
+    ]
+    assert response["succeeded"] == 1
+    assert get_note_by_id(db, kept, user_id=1).title == "yeni"
+
+
+def test_bulk_update_never_touches_other_users_notes(db):
+    mine, theirs = _note(db, "benim", 1).id, _note(db, "onun", 2).id
+
+    skipped = repo_bulk_update_notes(
+        db, 1, [{"id": mine, "title": "a"}, {"id": theirs, "content": "b"}], chunk_size=500
+    )
+
+    assert skipped == {theirs}
+    db.expire_all()
+    assert get_note_by_id(db, theirs, user_id=2).content == "onun içeriği"
+    assert get_note_by_id(db, mine, user_id=1).title == "a"
@@ -0,0 +1,34 @@
+from sqlalchemy import insert, select, text, update
+
+from internal.database.database import engine, is_write_statement, writer_engine
+from internal.models.note_models import Note
+from internal.repository.note_repository import PRIMARY
+
+
+def test_write_statements_are_detected():
+    assert is_write_statement(update(Note).values(title="x"))
+    assert is_write_statement(insert(Note))
+    assert is_write_statement(text("UPDATE notes SET tags = :tags WHERE id = :id"))
+    assert is_write_statement(text("  insert into notes_fts(notes_fts) values ('rebuild')"))
+    assert not is_write_statement(select(Note))
+    assert not is_write_statement(text("SELECT id FROM notes"))
+
+
+def test_reads_move_to_writer_after_write(db):
+    """Okuma okuyucu havuzunda başlar; yazmadan sonra yazıcı bağlantısında kalır"""
+    assert db.get_bind(clause=select(Note)) is engine
+    assert db.get_bind(clause=text("UPDATE notes SET title = 'x' WHERE id = 0")) is writer_engine
+    assert db.get_bind(clause=select(Note)) is writer_engine
+
+
+def test_primary_read_uses_writer(db):
+    assert db.get_bind(clause=select(Note), **PRIMARY) is writer_engine
+    assert db.get_bind(clause=select(Note)) is engine
+
+
+def test_read_your_writes_before_commit(db):
+    """Flush edilmiş ama commit edilmemiş not aynı session'da okunabilir"""
+    db.add(Note(title="taslak", content="içerik", user_id=1))
+    db.flush()
+    assert db.execute(select(Note.title).where(Note.user_id == 1)).scalar_one() == "taslak"
+    db.rollback()
@@ -0,0 +1,27 @@
+from internal.schemas.note_schemas import NoteCreate
+from internal.services.note_services import create_note, delete_note, get_note_changes
+
+
+def _note(title: str) -> NoteCreate:
+    return NoteCreate(title=title, content=f"{title} içeriği")
+
+
+def test_tombstone_survives_id_reuse_by_other_user(db):
+    """SQLite silinen en büyük id'yi yeniden verir; A'nın tombstone'u ezilmemeli"""
+    note_id = create_note(db, _note("A notu"), user_id=1).id
+    cursor = get_note_changes(db, user_id=1)["next_cursor"]
+    delete_note(db, note_id, user_id=1)
+    # Silinen not identity map'te kalmasın: session sıfırlanır, id'yi yeniden
+    # kullanan not ve akış veritabanındaki gerçek durumdan okunur
+    db.close()
+
+    reused = create_note(db, _note("B notu"), user_id=2)
+    assert reused.id == note_id
+
+    changes = get_note_changes(db, user_id=1, since=cursor)
+    assert changes["deleted"] == [note_id]
+    assert changes["upserted"] == []
+
+    other = get_note_changes(db, user_id=2)
+    assert [item["id"] for item in other["upserted"]] == [note_id]
+    assert other["deleted"] == []
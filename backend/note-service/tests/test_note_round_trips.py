@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from internal.database.database import engine, writer_engine
+from internal.schemas.note_schemas import NoteCreate, NoteUpdate
+from internal.services.note_services import (
+    create_note, delete_note, get_note_with_etag, get_notes_etag, update_note
+)
+
+
+@contextmanager
+def count_statements():
+    """Veritabanına giden SQL ifadeleri (okuyucu + yazıcı engine)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engines = {engine, writer_engine or engine}
+    for target in engines:
+        event.listen(target, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        for target in engines:
+            event.remove(target, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def note_id(db):
+    return create_note(db, NoteCreate(title="başlık", content="içerik"), user_id=1).id
+
+
+def test_update_is_single_round_trip(db, note_id):
+    with count_statements() as statements:
+        note = update_note(db, note_id, NoteUpdate(title="yeni"), user_id=1)
+    assert note["title"] == "yeni"
+    assert len(statements) == 1 and "RETURNING" in statements[0]
+
+
+def test_update_of_other_users_note_is_single_round_trip(db, note_id):
+    with count_statements() as statements, pytest.raises(HTTPException) as error:
+        update_note(db, note_id, NoteUpdate(title="yeni"), user_id=2)
+    assert error.value.status_code == 404
+    assert len(statements) == 1
+
+
+def test_delete_is_single_round_trip(db, note_id):
+    with count_statements() as statements:
+        delete_note(db, note_id, user_id=1)
+    assert len(statements) == 1 and "RETURNING" in statements[0]
+
+    with count_statements() as statements, pytest.raises(HTTPException):
+        delete_note(db, note_id, user_id=1)
+    assert len(statements) == 1
+
+
+def test_get_with_etag_is_single_round_trip(db, note_id):
+    with count_statements() as statements:
+        note, etag = get_note_with_etag(db, note_id, user_id=1)
+    assert note.title == "başlık" and etag
+    assert len(statements) == 1
+
+    updated = update_note(db, note_id, NoteUpdate(title="yeni"), user_id=1)
+    db.expire_all()
+    assert updated["title"] == "yeni"
+    assert get_note_with_etag(db, note_id, user_id=1)[1] != etag
+
+
+def test_list_etag_reads_change_feed_only(db, note_id):
+    with count_statements() as statements:
+        etag = get_notes_etag(db, user_id=1)
+    assert len(statements) == 1
+    assert "note_changes" in statements[0] and "notes." not in statements[0]
+
+    # Başka kullanıcının yazması ETag'i değiştirmez; kendi oluşturma / güncelleme / silme değiştirir
+    create_note(db, NoteCreate(title="başka", content="içerik"), user_id=2)
+    assert get_notes_etag(db, user_id=1) == etag
+
+    etags = {etag}
+    update_note(db, note_id, NoteUpdate(title="yeni"), user_id=1)
+    etags.add(get_notes_etag(db, user_id=1))
+    other_id = create_note(db, NoteCreate(title="ikinci", content="içerik"), user_id=1).id
+    etags.add(get_notes_etag(db, user_id=1))
+    delete_note(db, other_id, user_id=1)
+    etags.add(get_notes_etag(db, user_id=1))
+    assert len(etags) == 4
@@ -0,0 +1,47 @@
+from sqlalchemy import text
+
+from internal.database.database import engine
+from internal.models.note_models import Note, NoteChange, NoteTag
+from internal.repository.note_tag_repository import init_tag_index
+
+LONG_TAG = "x" * 60
+
+
+def _legacy_schema(db):
+    """Etiket trigger'ları kurulmadan önceki durum: note_tags boş, tags eski biçimlerde"""
+    for trigger in ("notes_tags_ai", "notes_tags_au", "notes_tags_ad"):
+        db.execute(text(f"DROP TRIGGER {trigger}"))
+    db.execute(text(
+        "INSERT INTO notes (id, user_id, title, content, tags, created_at, updated_at) VALUES "
+        "(1, 1, 'a', 'a', '[\"python\", \"sql\"]', '2024-01-01 00:00:00', '2024-01-01 00:00:00'), "
+        "(2, 1, 'b', 'b', 'Python, FastAPI', '2024-01-01 00:00:00', '2024-01-01 00:00:00'), "
+        f"(3, 1, 'c', 'c', '[\"{LONG_TAG}\", \"{LONG_TAG}y\"]', '2024-01-01 00:00:00', '2024-01-01 00:00:00')"
+    ))
+    db.commit()
+
+
+def _state(db):
+    notes = {note.id: (note.tags, note.updated_at) for note in db.query(Note)}
+    seqs = {change.note_id: change.seq for change in db.query(NoteChange)}
+    tags = sorted((row.note_id, row.tag) for row in db.query(NoteTag))
+    return notes, seqs, tags
+
+
+def test_migration_only_touches_changed_notes(db):
+    _legacy_schema(db)
+    before, seqs_before, _ = _state(db)
+
+    init_tag_index(engine)
+    db.expire_all()
+    after, seqs_after, tags = _state(db)
+
+    assert after[1] == before[1]
+    assert seqs_after[1] == seqs_before[1]
+
+    assert after[2][0] == '["python", "fastapi"]'
+    assert after[2][1] > before[2][1]
+    assert seqs_after[2] > seqs_before[2]
+
+    # Kırpılan iki etiket aynı değere düşer
+    assert after[3][0] == f'["{LONG_TAG[:50]}"]'
+    assert tags == [(1, "python"), (1, "sql"), (2, "fastapi"), (2, "python"), (3, LONG_TAG[:50])]
@@ -0,0 +1,118 @@
+"""
+Sıkıştırma öncesi / sonrası: aynı JSON cevabı identity (önce) ve her codec ile
+(sonra) CompressionMiddleware'den geçirir
+
+    cd backend && python -m shared.benchmarks.compression_bench [--notes 10,100,1000] [--mbps 10] [--repeat 50]
+
+Her boyut için: tel üzerindeki byte, middleware'in istek başına CPU süresi
+ve --mbps hızındaki bir bağlantıda toplam süre (CPU + aktarım). Tek parça
+(Content-Length'li) ve 64KB'lık parçalarla akan (streaming) cevap ayrı ölçülür.
+Son satırda sıkıştırılmış request body'sinin sınırlı açılma hızı vardır.
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import time
+
+from shared.compression import CompressionMiddleware, _Decompressor, available_encodings
+
+STREAM_CHUNK = 64 * 1024
+
+
+def _notes_payload(count: int) -> bytes:
+    """Liste cevabına benzeyen JSON (başlık, kategori, özet, etiketler)"""
+    return json.dumps({
+        "items": [
+            {
+                "id": number,
+                "title": f"Toplantı notu {number}",
+                "category": ["iş", "kişisel", "proje"][number % 3],
+                "summary": f"Sprint {number % 12} planlaması: görevler, riskler ve takvim " * 3,
+                "tags": ["planlama", f"sprint-{number % 12}", "ekip"],
+                "created_at": f"2024-01-{number % 28 + 1:02d}T10:00:00"
+            }
+            for number in range(count)
+        ],
+        "next_cursor": None
+    }).encode()
+
+
+def _app(body: bytes, streaming: bool):
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", b"application/json"), (b"etag", b'"bench"')]
+            + ([] if streaming else [(b"content-length", str(len(body)).encode())])
+        })
+        if not streaming:
+            await send({"type": "http.response.body", "body": body})
+            return
+        for start in range(0, len(body), STREAM_CHUNK):
+            end = start + STREAM_CHUNK
+            await send({"type": "http.response.body", "body": body[start:end], "more_body": end < len(body)})
+    return app
+
+
+async def _measure(middleware, accept_encoding: str, repeat: int):
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/notes",
+        "headers": [(b"accept-encoding", accept_encoding.encode())]
+    }
+    sent = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal sent
+        if message["type"] == "http.response.body":
+            sent += len(message.get("body", b""))
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        await middleware(scope, receive, send)
+    return sent // repeat, (time.perf_counter() - start) / repeat
+
+
+async def run(args) -> None:
+    encodings = ["identity"] + available_encodings()
+    bytes_per_second = args.mbps * 1_000_000 / 8
+    print(f"{'notlar':>7} {'mod':>9} {'codec':>8} {'byte':>10} {'oran':>6} {'cpu ms':>8} {'toplam ms':>10}")
+    for count in args.notes:
+        body = _notes_payload(count)
+        for streaming in (False, True):
+            middleware = CompressionMiddleware(_app(body, streaming))
+            for encoding in encodings:
+                size, cpu = await _measure(middleware, encoding, args.repeat)
+                total = cpu + size / bytes_per_second
+                print(
+                    f"{count:>7} {'stream' if streaming else 'tek':>9} {encoding:>8} {size:>10} "
+                    f"{len(body) / size:>6.1f} {cpu * 1000:>8.2f} {total * 1000:>10.2f}"
+                )
+
+    compressed = gzip.compress(_notes_payload(max(args.notes)))
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        decompressor = _Decompressor("gzip", 64 * 1024 * 1024)
+        inflated = sum(
+            len(decompressor.decompress(compressed[offset:offset + STREAM_CHUNK]))
+            for offset in range(0, len(compressed), STREAM_CHUNK)
+        )
+    elapsed = (time.perf_counter() - start) / args.repeat
+    print(f"request gzip açma (sınırlı): {inflated} byte, {elapsed * 1000:.2f} ms, {inflated / elapsed / 1e6:.0f} MB/sn")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--notes", type=lambda value: [int(part) for part in value.split(",")], default=[10, 100, 1000])
+    parser.add_argument("--mbps", type=float, default=10.0, help="bağlantı hızı (aktarım süresi tahmini)")
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+"""
+Response sıkıştırma middleware'i (gzip / brotli / zstd) - gateway, note-service
+ve chat-service aynı modülü kullanır (backend/shared)
+- Accept-Encoding ile codec seçilir (zstd > br > gzip), minimum boyutun altı sıkıştırılmaz
+- Zaten Content-Encoding'i olan cevaplar (ör. upstream'den sıkıştırılmış gelen) olduğu gibi geçer
+- Sıkıştırılan cevabın ETag'i weak yapılır: byte'lar codec'e göre değişir, içerik aynıdır
+- Content-Encoding'li request body'leri açılarak uygulamaya verilir; açılmış boyut
+  max_request_size'ı aşarsa 413 döner (decompression bomb). passthrough_request_paths
+  altındaki istekler açılmadan olduğu gibi geçer (gateway: upstream açar)
+brotli ve zstandard paketleri opsiyoneldir; kurulu değilse o codec kullanılmaz.
+"""
+import zlib
+from typing import Dict, List, Optional, Sequence
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.exceptions import HTTPException
+from starlette.responses import JSONResponse
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - opsiyonel bağımlılık
+    zstandard = None
+
+# Sunucu tarafı tercih sırası
+PREFERRED_ENCODINGS = ["zstd", "br", "gzip"]
+
+# Token token akan cevaplar tamponlanmamalı (SSE)
+EXCLUDED_CONTENT_TYPES = ("text/event-stream",)
+
+# Açılmış request body'si için varsayılan üst sınır
+DEFAULT_MAX_REQUEST_SIZE = 32 * 1024 * 1024
+
+# zstd çıktısı bu boyutta parçalar halinde yazılır: sınır en fazla bu kadar aşılır
+_ZSTD_WRITE_SIZE = 64 * 1024
+
+
+class RequestBodyTooLarge(HTTPException):
+    """Açılmış request body'si sınırı aştı (uygulamada 413'e dönüşür)"""
+
+    def __init__(self, limit: int):
+        super().__init__(status_code=413, detail=f"Request body açıldığında {limit} byte sınırını aşıyor")
+
+
+def available_encodings() -> List[str]:
+    encodings = []
+    if zstandard is not None:
+        encodings.append("zstd")
+    if brotli is not None:
+        encodings.append("br")
+    encodings.append("gzip")
+    return encodings
+
+
+def negotiate_encoding(accept_encoding: str, allowed: List[str]) -> Optional[str]:
+    """Accept-Encoding (q-değerleri ile) ve sunucu tercihine göre codec seçer"""
+    accepted: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[token] = quality
+
+    for encoding in PREFERRED_ENCODINGS:
+        if encoding not in allowed:
+            continue
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > 0:
+            return encoding
+    return None
+
+
+class _Compressor:
+    """Codec'ten bağımsız, parça parça sıkıştırma"""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._obj = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._obj = brotli.Compressor(quality=level)
+        else:
+            self._obj = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._obj.process(data)
+        return self._obj.compress(data)
+
+    def flush(self) -> bytes:
+        """Şu ana kadarki veriyi gönderilebilir hale getirir (stream için)"""
+        if self.encoding == "gzip":
+            return self._obj.flush(zlib.Z_SYNC_FLUSH)
+        if self.encoding == "br":
+            return self._obj.flush()
+        return self._obj.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        if self.encoding == "br":
+            return self._obj.finish()
+        return self._obj.flush()
+
+
+class _LimitedSink:
+    """zstd stream_writer çıktısı; sınır aşılınca yazmayı keser"""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.size = 0
+        self.parts: List[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self.size += len(data)
+        if self.size > self.limit:
+            raise RequestBodyTooLarge(self.limit)
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def take(self) -> bytes:
+        data = b"".join(self.parts)
+        self.parts.clear()
+        return data
+
+
+class _Decompressor:
+    """
+    Sınırlı açma: çıktı hiçbir codec'te limit'in (zstd'de bir yazma parçası
+    kadar fazlasının) üstünde bellekte tutulmaz
+    """
+
+    def __init__(self, encoding: str, limit: int):
+        self.encoding = encoding
+        self.limit = limit
+        self.size = 0
+        if encoding in ("gzip", "deflate"):
+            self._obj = zlib.decompressobj(47)
+        elif encoding == "br":
+            self._obj = brotli.Decompressor()
+        else:
+            self._sink = _LimitedSink(limit)
+            self._obj = zstandard.ZstdDecompressor().stream_writer(
+                self._sink, write_size=_ZSTD_WRITE_SIZE, write_return_read=True
+            )
+
+    def decompress(self, data: bytes) -> bytes:
+        # Bir byte fazlası istenir: gelirse sınır aşılmıştır
+        remaining = self.limit - self.size + 1
+        if self.encoding == "br":
+            chunk = self._obj.process(data, output_buffer_limit=remaining)
+        elif self.encoding == "zstd":
+            self._obj.write(data)
+            chunk = self._sink.take()
+        else:
+            chunk = self._obj.decompress(data, remaining)
+        self.size += len(chunk)
+        if self.size > self.limit:
+            raise RequestBodyTooLarge(self.limit)
+        return chunk
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        zstd_level: int = 3,
+        max_request_size: int = DEFAULT_MAX_REQUEST_SIZE,
+        passthrough_request_paths: Sequence[str] = ()
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.levels = {"gzip": gzip_level, "br": brotli_quality, "zstd": zstd_level}
+        self.allowed = available_encodings()
+        self.max_request_size = max_request_size
+        self.passthrough_request_paths = tuple(passthrough_request_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        request_encoding = headers.get("content-encoding", "").strip().lower()
+        if (
+            (request_encoding in self.allowed or request_encoding == "deflate")
+            and not scope["path"].startswith(self.passthrough_request_paths)
+        ):
+            scope, receive = self._decompress_request(scope, receive, request_encoding)
+
+        encoding = negotiate_encoding(headers.get("accept-encoding", ""), self.allowed)
+        if encoding is None:
+            app = self.app
+        else:
+            app = _CompressionResponder(self.app, encoding, self.levels[encoding], self.minimum_size)
+
+        # Body'yi middleware dışında (ör. saf ASGI uygulaması) okuyanlar için de 413
+        response_started = False
+
+        async def send_tracked(message):
+            nonlocal response_started
+            response_started = True
+            await send(message)
+
+        try:
+            await app(scope, receive, send_tracked)
+        except RequestBodyTooLarge as exc:
+            if response_started:
+                raise
+            await JSONResponse({"detail": exc.detail}, status_code=exc.status_code)(scope, receive, send)
+
+    def _decompress_request(self, scope, receive, encoding: str):
+        """Sıkıştırılmış request body'sini parça parça, boyut sınırıyla açar"""
+        decompressor = _Decompressor(encoding, self.max_request_size)
+        scope = dict(scope)
+        scope["headers"] = [
+            (key, value) for key, value in scope["headers"]
+            if key not in (b"content-encoding", b"content-length")
+        ]
+
+        async def receive_decompressed():
+            message = await receive()
+            if message["type"] == "http.request":
+                message = dict(message)
+                message["body"] = decompressor.decompress(message.get("body", b""))
+            return message
+
+        return scope, receive_decompressed
+
+
+class _CompressionResponder:
+    def __init__(self, app, encoding: str, level: int, minimum_size: int):
+        self.app = app
+        self.encoding = encoding
+        self.level = level
+        self.minimum_size = minimum_size
+        self.send = None
+        self.start_message = None
+        self.started = False
+        self.passthrough = False
+        self.compressor: Optional[_Compressor] = None
+
+    async def __call__(self, scope, receive, send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message):
+        message_type = message["type"]
+        if message_type == "http.response.start":
+            self.start_message = message
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            return
+
+        if message_type != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if not self.started:
+            self.started = True
+            headers = MutableHeaders(raw=self.start_message["headers"])
+            if self.passthrough or (not more_body and len(body) < self.minimum_size):
+                await self.send(self.start_message)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding, self.level)
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                headers["ETag"] = "W/" + etag
+            if not more_body:
+                body = self.compressor.compress(body) + self.compressor.finish()
+                headers["Content-Length"] = str(len(body))
+                await self.send(self.start_message)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+
+            del headers["Content-Length"]
+            await self.send(self.start_message)
+
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        chunk = self.compressor.compress(body)
+        chunk += self.compressor.flush() if more_body else self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})